@@ -0,0 +1,295 @@
+"""Benchmarks for the framework's hot paths, run against the local stand-in site.
+
+    python -m benchmarks.bench run --browser chrome --repeat 5 --output reports/benchmarks/latest.json
+    python -m benchmarks.bench compare benchmarks/baseline.json reports/benchmarks/latest.json --threshold 0.2
+
+`compare` exits with 1 when a benchmark's median got slower than the baseline by more than the
+threshold (and by more than --min-ms, so sub-millisecond noise never fails a build).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from utilities.command_timer import percentile
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95 = percentile(ordered, 95)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 2),
+        "median_ms": round(statistics.median(ordered), 2),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p95_ms": round(p95, 2),
+        "max_ms": round(ordered[-1], 2),
+        "stdev_ms": round(statistics.stdev(ordered), 2) if len(ordered) > 1 else 0.0,
+        "samples_ms": [round(s, 2) for s in samples],
+    }
+
+
+class Context:
+    """What every benchmark gets: the local site, a seeder for it, a warm browser and a screenshot service."""
+
+    USER = ("Ramya Hunagund", "ramya123")
+
+    def __init__(self, browser_name, headless):
+        from drivers.driver_factory import DriverFactory
+        from utilities.api_seeder import ApiSeeder
+        from utilities.local_site import LocalSite
+        from utilities.screenshot_service import ScreenshotService
+
+        self.browser_name = browser_name
+        self.headless = headless
+        self.site = LocalSite("demoblaze").start()
+        self.seeder = ApiSeeder(api_url=self.site.url)
+        self.driver = DriverFactory.get_driver(browser_name=browser_name, headless=headless)
+        # Same settings as the tests' shared service, but the frames land outside reports/
+        self.screenshots = ScreenshotService(directory=tempfile.mkdtemp(prefix="capstone-bench-"))
+
+    def url(self, path=""):
+        return self.site.url + path
+
+    def login(self):
+        from pages.login_page import LoginPage
+        page = LoginPage(self.driver)
+        page.open(self.url())
+        page.open_login_modal()
+        page.enter_credentials(*self.USER)
+        page.click_login()
+        return page
+
+    def reset(self):
+        self.driver.delete_all_cookies()
+        self.driver.get("about:blank")
+
+    def close(self):
+        try:
+            self.driver.quit()
+        finally:
+            self.screenshots.close()
+            self.seeder.close()
+            self.site.stop()
+
+
+# --------------------------- Benchmarks ---------------------------
+@benchmark("driver_cold_start")
+def cold_start(ctx):
+    from drivers.driver_factory import DriverFactory
+    start = time.perf_counter()
+    driver = DriverFactory.get_driver(browser_name=ctx.browser_name, headless=ctx.headless)
+    elapsed = time.perf_counter() - start
+    driver.quit()
+    return elapsed
+
+
+@benchmark("driver_warm_start")
+def warm_start(ctx):
+    # What DriverPool does between two tests instead of launching a browser
+    from drivers.driver_pool import DriverPool
+    ctx.driver.get(ctx.url())
+    start = time.perf_counter()
+    DriverPool.reset(ctx.driver)
+    DriverPool.is_healthy(ctx.driver)
+    return time.perf_counter() - start
+
+
+@benchmark("login_flow")
+def login_flow(ctx):
+    ctx.reset()
+    start = time.perf_counter()
+    page = ctx.login()
+    assert page.is_logged_in(), "login did not succeed"
+    return time.perf_counter() - start
+
+
+@benchmark("add_to_cart")
+def add_to_cart(ctx):
+    from pages.product_page import ProductPage
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    page = ProductPage(ctx.driver)
+    start = time.perf_counter()
+    page.open(ctx.url())
+    page.open_product()
+    page.add_to_cart()
+    WebDriverWait(ctx.driver, 10).until(EC.alert_is_present()).accept()
+    return time.perf_counter() - start
+
+
+def _seed_cart(ctx, count):
+    ctx.reset()
+    ctx.login()
+    token = ctx.driver.get_cookie("tokenp_")["value"]
+    ctx.seeder.clear_cart(token)
+    ctx.seeder.add_to_cart(token, prod_id=1, count=count)
+
+
+@benchmark("cart_read")
+def cart_read(ctx):
+    from selenium.webdriver.common.by import By
+    from pages.place_order_page import PlaceOrderPage
+    from utilities.js_utils import JSUtils
+    _seed_cart(ctx, 5)
+    start = time.perf_counter()
+    PlaceOrderPage(ctx.driver).open(ctx.url("/cart.html"))
+    rows = JSUtils.extract_rows(ctx.driver, (By.ID, "tbodyid"), min_rows=5, timeout=10)
+    assert len(rows) == 5, f"expected 5 cart rows, got {len(rows)}"
+    return time.perf_counter() - start
+
+
+@benchmark("checkout")
+def checkout(ctx):
+    from pages.place_order_page import PlaceOrderPage
+    _seed_cart(ctx, 1)
+    page = PlaceOrderPage(ctx.driver)
+    start = time.perf_counter()
+    page.open(ctx.url("/cart.html"))
+    page.open_place_order_modal()
+    page.fill_order_details("Bench", "India", "Pune", "4111111111111111", "10", "2030")
+    page.place_order()
+    return time.perf_counter() - start
+
+
+@benchmark("screenshot")
+def screenshot(ctx):
+    # What a test waits for in ScreenshotUtils.take_screenshot: grab and queue, the write is off-thread.
+    # A fresh timestamp on the page keeps the frame from being dropped as a repeat of the last one.
+    ctx.driver.get(ctx.url())
+    ctx.driver.execute_script("document.body.insertAdjacentText('afterbegin', Date.now() + ' ');")
+    start = time.perf_counter()
+    ctx.screenshots.capture(ctx.driver, "bench")
+    return time.perf_counter() - start
+
+
+# --------------------------- Commands ---------------------------
+def run(browser_name="chrome", headless=True, repeat=5, warmup=1, only=None):
+    names = only or list(BENCHMARKS)
+    ctx = Context(browser_name, headless)
+    results, errors = {}, {}
+    try:
+        for name in names:
+            samples = []
+            try:
+                for i in range(warmup + repeat):
+                    elapsed = BENCHMARKS[name](ctx)
+                    if i >= warmup:
+                        samples.append(elapsed * 1000)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+                print(f"[Bench] {name} failed: {errors[name]}")
+                continue
+            results[name] = summarize(samples)
+            print(f"[Bench] {name:<18} median {results[name]['median_ms']:9.1f} ms  "
+                  f"p95 {results[name]['p95_ms']:9.1f} ms")
+    finally:
+        ctx.close()
+
+    import selenium
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "browser": browser_name,
+            "headless": headless,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "selenium": selenium.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+        "errors": errors,
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_ms=5.0):
+    """Rows of (name, baseline median, current median, change, status); status is ok/regression/improved/new/missing."""
+    rows = []
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        before = baseline["results"].get(name)
+        after = current["results"].get(name)
+        if before is None:
+            rows.append((name, None, after["median_ms"], None, "new"))
+            continue
+        if after is None:
+            rows.append((name, before["median_ms"], None, None, "missing"))
+            continue
+        old, new = before["median_ms"], after["median_ms"]
+        change = (new - old) / old if old else 0.0
+        if change > threshold and new - old > min_ms:
+            status = "regression"
+        elif change < -threshold and old - new > min_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, old, new, change, status))
+    return rows
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a JSON result file")
+    run_parser.add_argument("--browser", default="chrome", choices=["chrome", "edge", "firefox"])
+    run_parser.add_argument("--headed", action="store_true", help="show the browser window")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    run_parser.add_argument("--output", default=os.path.join("reports", "benchmarks", "latest.json"))
+
+    compare_parser = commands.add_parser("compare", help="fail if results regressed against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    compare_parser.add_argument("--min-ms", type=float, default=5.0, help="ignore differences below this")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        data = run(args.browser, headless=not args.headed, repeat=args.repeat, warmup=args.warmup, only=args.only)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"[Bench] Results written to {args.output}")
+        return 1 if data["errors"] else 0
+
+    rows = compare(_load(args.baseline), _load(args.current), args.threshold, args.min_ms)
+    print(f"{'benchmark':<18} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    for name, old, new, change, status in rows:
+        pct = "-" if change is None else f"{change:+.0%}"
+        print(f"{name:<18} {_ms(old):>10} {_ms(new):>10} {pct:>8}  {status}")
+    regressions = [row[0] for row in rows if row[4] == "regression"]
+    missing = [row[0] for row in rows if row[4] == "missing"]
+    if regressions:
+        print(f"[Bench] Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+    if missing:
+        print(f"[Bench] No result (benchmark failed or was skipped): {', '.join(missing)}")
+    if regressions or missing:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from drivers.browser_profiles import BrowserProfiles
+from drivers.driver_resolver import DriverResolver
+from drivers.resource_monitor import ResourceMonitor
+from utilities.command_timer import CommandTimer
+from utilities.session_store import file_lock
+from utilities.wait_utils import WaitUtils
+
+DEBUGGER_CAPABILITY = {"chrome": "goog:chromeOptions", "edge": "ms:edgeOptions"}
+
+
+class _ContextMixin:
+    """A WebDriver session attached to the shared browser, seeing only its own browser context."""
+
+    contexts = None     # owning BrowserContexts
+    context_id = None
+
+    @property
+    def window_handles(self):
+        # The attached session sees every tab of the browser; keep other tests' tabs out of it
+        own = self.contexts.targets(self)
+        return [handle for handle in super().window_handles if handle in own]
+
+
+class ContextChrome(_ContextMixin, webdriver.Chrome):
+    pass
+
+
+class ContextEdge(_ContextMixin, webdriver.Edge):
+    pass
+
+
+class BrowserContexts:
+    """Many isolated tests inside one Chromium process.
+
+    One browser is launched per (browser, headless, profile). Each lease creates a CDP browser
+    context (own cookies, storage and cache, like an incognito profile) with one tab in it, and
+    hands out a WebDriver session attached to that browser (debuggerAddress) and switched to
+    that tab. Released sessions are kept and re-pointed at a fresh context next time, so a lease
+    costs two CDP calls instead of a browser launch. Edge works the same way; Firefox has no
+    equivalent and stays on the process pool.
+
+    Under pytest-xdist every worker is its own process, so the browser is shared across them
+    through BROWSER_CONTEXTS_DIR (default ~/.cache/capstone-contexts): the first worker of the
+    run launches it and publishes its debuggerAddress under a lock file, later workers attach to
+    it. The worker that launched it closes it last, once every other worker has shut down (or
+    after SHARED_BROWSER_WAIT seconds).
+    """
+
+    SUPPORTED = ("chrome", "edge")
+
+    def __init__(self, launch, directory=None):
+        self.launch = launch     # DriverFactory.get_driver
+        self.directory = directory or os.getenv(
+            "BROWSER_CONTEXTS_DIR", os.path.join(os.path.expanduser("~"), ".cache", "capstone-contexts")
+        )
+        self._browsers = {}      # key -> driver on the browser process (launched, or attached to another worker's)
+        self._shared = {}        # key -> path prefix of the files the browser is shared through
+        self._launched = set()   # keys whose browser this process launched
+        self._idle = {}          # (key, page load strategy) -> [attached sessions without a context]
+        self._leased = {}        # id(driver) -> attached session in use
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(browser_name):
+        return browser_name.lower() in BrowserContexts.SUPPORTED
+
+    def _share_path(self, key):
+        """Prefix of the files a browser is shared through, or None outside an xdist run."""
+        run = os.getenv("PYTEST_XDIST_TESTRUNUID")
+        if not run:
+            return None
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        name = hashlib.sha1(f"{run}|{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def _browser(self, key):
+        with self._lock:
+            browser = self._browsers.get(key)
+            if browser is None:
+                path = self._share_path(key)
+                browser = self._launch(key) if path is None else self._join(key, path)
+                self._browsers[key] = browser
+            return browser
+
+    def _launch(self, key):
+        browser_name, headless, profile = key
+        browser = self.launch(browser_name=browser_name, headless=headless, profile=profile)
+        self._launched.add(key)
+        print(f"[Contexts] Started shared {browser_name} process")
+        return browser
+
+    def _join(self, key, path):
+        """Attach to the browser another worker of this run published, or launch and publish it."""
+        os.makedirs(path + ".users", mode=0o700, exist_ok=True)
+        with file_lock(path + ".lock", waiting_for=f"another worker to start {key[0]}"):
+            try:
+                with open(path + ".json", encoding="utf-8") as f:
+                    published = json.load(f)
+            except (OSError, ValueError):
+                published = None
+            if published and ResourceMonitor.pid_alive(published["owner"]):
+                browser = self._attach(key, published["debuggerAddress"], "normal", shared=True)
+                print(f"[Contexts] Attached to the {key[0]} process of worker pid {published['owner']}")
+            else:
+                browser = self._launch(key)
+                published = {"debuggerAddress": self._address(key, browser), "owner": os.getpid()}
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+                    json.dump(published, f)
+                os.replace(tmp_path, path + ".json")
+            # Registered under the lock, so the owner never closes the browser under a joining worker
+            open(os.path.join(path + ".users", str(os.getpid())), "w").close()
+        self._shared[key] = path
+        return browser
+
+    @staticmethod
+    def _address(key, browser):
+        return browser.capabilities[DEBUGGER_CAPABILITY[key[0]]]["debuggerAddress"]
+
+    def _attach(self, key, address, page_load_strategy, shared=False):
+        """A session attached to the browser at `address`; `shared` gives a plain one for the CDP calls."""
+        browser_name = key[0]
+        options = ChromeOptions() if browser_name == "chrome" else EdgeOptions()
+        options.debugger_address = address
+        options.page_load_strategy = page_load_strategy
+        if browser_name == "chrome":
+            service_class, driver_class = ChromeService, webdriver.Chrome if shared else ContextChrome
+        else:
+            service_class, driver_class = EdgeService, webdriver.Edge if shared else ContextEdge
+        return driver_class(service=service_class(DriverResolver.resolve(browser_name)), options=options)
+
+    def acquire(self, browser_name="chrome", headless=False, profile=None, page_load_strategy=None):
+        """An attached session in a fresh context; page_load_strategy as for DriverFactory.get_driver."""
+        key = (browser_name.lower(), bool(headless), profile)
+        # Fixed per attached session, so idle sessions are kept per strategy
+        page_load_strategy = (page_load_strategy or os.getenv("PAGE_LOAD_STRATEGY") or "normal").lower()
+        browser = self._browser(key)
+
+        context_id = browser.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+        target_id = browser.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+        )["targetId"]
+
+        with self._lock:
+            idle = self._idle.get((key, page_load_strategy), [])
+            driver = idle.pop() if idle else None
+        try:
+            if driver is None:
+                driver = self._attach(key, self._address(key, browser), page_load_strategy)
+                driver.page_load_strategy = page_load_strategy
+                driver.contexts = self
+                if CommandTimer.enabled:
+                    CommandTimer.instrument(driver)
+            driver.key = key
+            driver.context_id = context_id
+            driver.switch_to.window(target_id)
+            # Per-tab setup, the tab is new on every lease
+            if profile:
+                BrowserProfiles.apply_driver(driver, profile)
+            WaitUtils.install_network_tracker(driver)
+        except Exception:
+            self._dispose(browser, context_id)
+            raise
+        with self._lock:
+            self._leased[id(driver)] = driver
+        return driver
+
+    def release(self, driver):
+        """Throw the context (and every tab in it) away; keep the attached session for the next lease."""
+        browser = self._browsers.get(driver.key)
+        if browser is not None:
+            self._dispose(browser, driver.context_id)
+        driver.context_id = None
+        with self._lock:
+            self._leased.pop(id(driver), None)
+            self._idle.setdefault((driver.key, driver.page_load_strategy), []).append(driver)
+
+    def targets(self, driver):
+        browser = self._browsers[driver.key]
+        infos = browser.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        return {t["targetId"] for t in infos if t.get("browserContextId") == driver.context_id and t["type"] == "page"}
+
+    @staticmethod
+    def owns(driver):
+        return isinstance(driver, _ContextMixin)
+
+    @staticmethod
+    def _dispose(browser, context_id):
+        try:
+            browser.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except WebDriverException as e:
+            print(f"[Contexts] Could not dispose context {context_id}: {e}")
+
+    def _other_users(self, path):
+        users = path + ".users"
+        try:
+            pids = [int(name) for name in os.listdir(users)]
+        except OSError:
+            return []
+        return [pid for pid in pids if pid != os.getpid() and ResourceMonitor.pid_alive(pid)]
+
+    def _leave(self, key, browser, timeout):
+        """Unregister from a shared browser; its owner closes it once the other workers are gone."""
+        path = self._shared[key]
+        deadline = time.time() + timeout
+        while True:
+            with file_lock(path + ".lock", waiting_for=f"the shared {key[0]} lock"):
+                others = self._other_users(path) if key in self._launched else []
+                if not others or time.time() > deadline:
+                    try:
+                        os.remove(os.path.join(path + ".users", str(os.getpid())))
+                    except OSError:
+                        pass
+                    if key in self._launched:
+                        if others:
+                            print(f"[Contexts] Closing shared {key[0]} process still used by pids {others}")
+                        # Unpublished under the lock: a worker joining later launches its own
+                        try:
+                            os.remove(path + ".json")
+                        except OSError:
+                            pass
+                        shutil.rmtree(path + ".users", ignore_errors=True)
+                    self._quit(browser)
+                    return
+            time.sleep(0.5)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def shutdown(self):
+        with self._lock:
+            sessions = [d for drivers in self._idle.values() for d in drivers] + list(self._leased.values())
+            browsers = dict(self._browsers)
+            self._idle.clear()
+            self._leased.clear()
+            self._browsers.clear()
+        # Attached sessions only stop their chromedriver; the launched driver closes the browser
+        for driver in sessions:
+            self._quit(driver)
+        timeout = float(os.getenv("SHARED_BROWSER_WAIT", "600"))
+        for key, browser in browsers.items():
+            if key in self._shared:
+                self._leave(key, browser, timeout)
+            else:
+                self._quit(browser)
+        self._shared.clear()
+        self._launched.clear()
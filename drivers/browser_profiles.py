@@ -0,0 +1,90 @@
+import json
+from selenium.common.exceptions import WebDriverException
+
+# Ad and tracker hosts seen on demoqa.com / demoblaze.com
+AD_PATTERNS = [
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+    "*safeframe.googlesyndication.com*", "*amazon-adsystem.com*", "*adsrvr.org*", "*pubmatic.com*",
+    "*rubiconproject.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*ezoic*",
+]
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*googletagservices.com*",
+    "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*", "*quantserve.com*",
+]
+IMAGE_PATTERNS = ["*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+                  "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"]
+FONT_PATTERNS = ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+                 "*.eot", "*.eot?*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+
+# name -> which resource groups are blocked
+PROFILES = {
+    "no-ads": {"ads", "trackers"},
+    "no-images": {"images"},
+    "minimal": {"ads", "trackers", "images", "fonts"},
+}
+
+PATTERNS = {"ads": AD_PATTERNS, "trackers": TRACKER_PATTERNS, "images": IMAGE_PATTERNS, "fonts": FONT_PATTERNS}
+
+
+class BrowserProfiles:
+    """Named performance profiles that stop images, fonts, ads and trackers at the network layer.
+
+    Chromium gets the URL patterns through CDP Network.setBlockedURLs (plus the image content
+    setting), and blocked requests can be read back from the performance log. Firefox has no
+    URL blocking, so it gets the nearest prefs: images and web fonts off, strict tracking protection.
+    """
+
+    @staticmethod
+    def groups(profile):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown browser profile: {profile} (choose from {', '.join(sorted(PROFILES))})")
+        return PROFILES[profile]
+
+    @staticmethod
+    def url_patterns(profile):
+        return [pattern for group in sorted(BrowserProfiles.groups(profile)) for pattern in PATTERNS[group]]
+
+    @staticmethod
+    def apply_options(options, browser_name, profile):
+        """Browser prefs; call before the driver is created."""
+        groups = BrowserProfiles.groups(profile)
+        if browser_name == "firefox":
+            if "images" in groups:
+                options.set_preference("permissions.default.image", 2)
+            if "fonts" in groups:
+                options.set_preference("gfx.downloadable_fonts.enabled", False)
+            if groups & {"ads", "trackers"}:
+                options.set_preference("browser.contentblocking.category", "strict")
+                options.set_preference("privacy.trackingprotection.enabled", True)
+            return
+
+        if "images" in groups:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # Needed to report what was blocked, see blocked_requests()
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    @staticmethod
+    def apply_driver(driver, profile):
+        """Network-level blocking; call once the driver is up. No-op outside Chromium."""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BrowserProfiles.url_patterns(profile)})
+
+    @staticmethod
+    def blocked_requests(driver):
+        """URLs blocked since the last call (Chromium only; reading drains the performance log)."""
+        try:
+            entries = driver.get_log("performance")
+        except (WebDriverException, AttributeError, ValueError):
+            return []
+
+        urls, blocked = {}, []
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message["method"] == "Network.requestWillBeSent":
+                urls[params["requestId"]] = params["request"]["url"]
+            elif message["method"] == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked.append(urls.get(params["requestId"], params["requestId"]))
+        return blocked
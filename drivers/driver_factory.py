@@ -5,17 +5,234 @@ from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+from drivers.browser_contexts import BrowserContexts
+from drivers.browser_profiles import BrowserProfiles
+from drivers.driver_pool import DriverPool
+from drivers.driver_resolver import DriverResolver
+from drivers.resource_monitor import ResourceMonitor
+from utilities.command_timer import CommandTimer
+from utilities.wait_utils import WaitUtils
+import atexit
 import os
+import shutil
 import tempfile  # <-- new import
+import time
+
+PROFILE_PREFIX = "capstone-profile-"
+OWNER_FILE = ".owner"
+
 
 class DriverFactory:
+    _pool = None
+    _contexts = None
+    _proxy = None
+    _grid = None
+    _profile_dirs = set()
+    _swept = False
+
+    @staticmethod
+    def worker_id():
+        """xdist worker name (gw0, gw1, ...) or 'main' when running without xdist."""
+        return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+    @staticmethod
+    def _new_profile_dir(browser_name):
+        if not DriverFactory._swept:
+            DriverFactory._swept = True
+            DriverFactory.sweep_stale_profiles()
+        path = tempfile.mkdtemp(prefix=f"{PROFILE_PREFIX}{browser_name}-{DriverFactory.worker_id()}-")
+        # Lets a later run tell whether the process that made this profile is still alive
+        with open(os.path.join(path, OWNER_FILE), "w") as f:
+            f.write(str(os.getpid()))
+        DriverFactory._profile_dirs.add(path)
+        return path
+
+    @staticmethod
+    def _remove_profile_dir(path, attempts=5):
+        # The browser may still hold files for a moment after quit (always on Windows)
+        for attempt in range(attempts):
+            shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                break
+            time.sleep(0.2 * (attempt + 1))
+        DriverFactory._profile_dirs.discard(path)
+
+    @staticmethod
+    def sweep_stale_profiles(directory=None):
+        """Remove profile dirs left behind by runs that crashed or were killed; returns the removed paths."""
+        directory = directory or tempfile.gettempdir()
+        removed = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if not name.startswith(PROFILE_PREFIX) or not os.path.isdir(path):
+                continue
+            try:
+                with open(os.path.join(path, OWNER_FILE)) as f:
+                    owner = int(f.read().strip())
+            except (OSError, ValueError):
+                owner = None
+            if owner is None:
+                if time.time() - os.path.getmtime(path) < 60:
+                    continue  # just created by another worker, owner file not written yet
+            elif owner == os.getpid() or ResourceMonitor.pid_alive(owner):
+                continue  # a live browser, ours or another worker's
+            DriverFactory._remove_profile_dir(path, attempts=1)
+            removed.append(path)
+        return removed
+
+    @staticmethod
+    def _cleanup_on_quit(driver, path=None):
+        original_quit = driver.quit
+
+        def quit():
+            try:
+                original_quit()
+            finally:
+                ResourceMonitor.detach(driver)
+                if path:
+                    DriverFactory._remove_profile_dir(path)
+
+        driver.quit = quit
+
+    @staticmethod
+    def _remove_leftover_profiles():
+        for path in list(DriverFactory._profile_dirs):
+            DriverFactory._remove_profile_dir(path)
+
+    @staticmethod
+    def pool():
+        if DriverFactory._pool is None:
+            DriverFactory._pool = DriverPool(DriverFactory.get_driver, retire=ResourceMonitor.over_limit)
+        return DriverFactory._pool
+
+    @staticmethod
+    def mode():
+        """DRIVER_MODE: "processes" (pooled browser per session) or "contexts" (isolated contexts in one Chromium)."""
+        return os.getenv("DRIVER_MODE", "processes").lower()
+
+    @staticmethod
+    def contexts():
+        if DriverFactory._contexts is None:
+            DriverFactory._contexts = BrowserContexts(DriverFactory.get_driver)
+        return DriverFactory._contexts
+
+    @staticmethod
+    def grid():
+        """Balancer over the SELENIUM_GRID_URLS hubs, or None to launch browsers on this machine."""
+        if DriverFactory._grid is None:
+            DriverFactory._grid = False
+            if os.getenv("SELENIUM_GRID_URLS", "").strip():
+                from drivers.grid_balancer import GridBalancer  # pulls in requests, only needed for a grid
+                DriverFactory._grid = GridBalancer.from_env()
+        return DriverFactory._grid or None
+
     @staticmethod
-    def get_driver(browser_name="chrome", headless=False):
+    def acquire(browser_name="chrome", headless=False, profile=None, page_load_strategy=None):
+        """Borrow a warm session from the pool, launching one if none is free.
+
+        page_load_strategy: as for get_driver; sessions with different strategies are never mixed up.
+
+        In contexts mode Chromium browsers hand out a fresh browser context in one process shared by all xdist workers instead
+        (local browsers only, the shared browser's debugger port is not reachable on a grid node).
+        """
+        if DriverFactory.mode() == "contexts" and BrowserContexts.supports(browser_name) and not DriverFactory.grid():
+            return DriverFactory.contexts().acquire(browser_name, headless, profile=profile,
+                                                    page_load_strategy=page_load_strategy)
+        return DriverFactory.pool().acquire(browser_name, headless, profile=profile, page_load_strategy=page_load_strategy)
+
+    @staticmethod
+    def release(driver):
+        """Reset the session and hand it back to the pool for the next test."""
+        if BrowserContexts.owns(driver):
+            DriverFactory.contexts().release(driver)
+            return
+        DriverFactory.pool().release(driver)
+
+    @staticmethod
+    def shutdown_pool():
+        if DriverFactory._pool is not None:
+            DriverFactory._pool.shutdown()
+            DriverFactory._pool = None
+        if DriverFactory._contexts is not None:
+            DriverFactory._contexts.shutdown()
+            DriverFactory._contexts = None
+
+    @staticmethod
+    def recycle(driver):
+        """Quit a bloated browser and return a fresh one started with the same arguments.
+
+        The holder swaps its reference to the returned driver (see the logged_in_session
+        fixture). `driver._after_recycle(fresh)`, if set, restores state such as a login and is
+        carried over to the fresh driver. Drivers this factory did not launch come back unchanged.
+        """
+        launch_args = getattr(driver, "launch_args", None)
+        if launch_args is None or BrowserContexts.owns(driver):
+            return driver
+        after_recycle = getattr(driver, "_after_recycle", None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[Monitor] Could not quit old session: {e}")
+        fresh = DriverFactory.get_driver(**launch_args)
+        print(f"[Monitor] Recycled {launch_args['browser_name']} session")
+        if after_recycle is not None:
+            fresh._after_recycle = after_recycle
+            after_recycle(fresh)
+        return fresh
+
+    @staticmethod
+    def caching_proxy():
+        """Process-wide record/replay proxy, started on first use when CACHING_PROXY=record|replay.
+
+        Only with --target=local (TEST_TARGET=local): the live sites are https-only, their traffic
+        could only be tunneled past the cache, so the proxy would add a hop and save nothing.
+        """
+        mode = os.getenv("CACHING_PROXY", "").lower()
+        if not mode:
+            return None
+        if DriverFactory._proxy is None:
+            if os.getenv("TEST_TARGET", "live").lower() != "local":
+                DriverFactory._proxy = False
+                print("[Proxy] CACHING_PROXY ignored: the live https sites cannot be cached, use --target=local")
+            else:
+                from utilities.caching_proxy import CachingProxy
+                cache_dir = os.getenv("CACHING_PROXY_DIR", os.path.join(os.getcwd(), "reports", "proxy-cache"))
+                DriverFactory._proxy = CachingProxy(cache_dir, mode=mode).start()
+        return DriverFactory._proxy or None
+
+    @staticmethod
+    def _apply_proxy(options, browser_name, address):
+        host, _, port = address.rpartition(":")
+        if browser_name == "firefox":
+            options.set_preference("network.proxy.type", 1)
+            for scheme in ("http", "ssl"):
+                options.set_preference(f"network.proxy.{scheme}", host)
+                options.set_preference(f"network.proxy.{scheme}_port", int(port))
+            options.set_preference("network.proxy.no_proxies_on", "")
+            options.set_preference("network.proxy.allow_hijacking_localhost", True)
+        else:
+            options.add_argument(f"--proxy-server=http://{address}")
+            # Chromium skips the proxy for localhost unless told otherwise (local stand-in site)
+            options.add_argument("--proxy-bypass-list=<-loopback>")
+
+    @staticmethod
+    def get_driver(browser_name="chrome", headless=False, proxy=None, profile=None, page_load_strategy=None):
+        """proxy: "host:port" to send all browser traffic through; defaults to the caching proxy if enabled.
+        profile: a BrowserProfiles name ("minimal", "no-images", "no-ads") to block resources up front.
+        page_load_strategy: "normal", "eager" (return at DOMContentLoaded) or "none"; defaults to
+        PAGE_LOAD_STRATEGY or "normal". With eager/none, navigate through a page object
+        (BasePage.open/refresh/back/forward) so its readiness contract is awaited instead.
+        With SELENIUM_GRID_URLS set the same options start a webdriver.Remote session on a grid instead.
+        """
         browser_name = browser_name.lower()
+        page_load_strategy = (page_load_strategy or os.getenv("PAGE_LOAD_STRATEGY") or "normal").lower()
+        if page_load_strategy not in ("normal", "eager", "none"):
+            raise ValueError(f"Unsupported page load strategy: {page_load_strategy}")
         driver = None
+        temp_dir = None
+        grid = DriverFactory.grid()
+        if proxy is None and DriverFactory.caching_proxy() is not None:
+            proxy = DriverFactory.caching_proxy().address
 
         try:
             if browser_name == "chrome":
@@ -26,13 +243,21 @@ class DriverFactory:
                     options.add_argument("--disable-dev-shm-usage")
                     options.add_argument("--disable-gpu")
                     options.add_argument("--disable-extensions")
-                    options.add_argument("--remote-debugging-port=9222")
+                    # Port 0 lets Chrome pick a free port, so parallel workers never collide
+                    options.add_argument("--remote-debugging-port=0")
 
-                    # ✅ Use a unique temporary user data dir to avoid conflicts in CI
-                    temp_dir = tempfile.mkdtemp()
-                    options.add_argument(f"--user-data-dir={temp_dir}")
+                    # ✅ Use a unique temporary user data dir to avoid conflicts in CI (grid nodes manage their own)
+                    if not grid:
+                        temp_dir = DriverFactory._new_profile_dir(browser_name)
+                        options.add_argument(f"--user-data-dir={temp_dir}")
+                if proxy:
+                    DriverFactory._apply_proxy(options, browser_name, proxy)
+                if profile:
+                    BrowserProfiles.apply_options(options, browser_name, profile)
+                options.page_load_strategy = page_load_strategy
 
-                driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+                driver = grid.create(browser_name, options) if grid else \
+                    webdriver.Chrome(service=ChromeService(DriverResolver.resolve("chrome")), options=options)
 
             elif browser_name == "edge":
                 options = EdgeOptions()
@@ -42,37 +267,57 @@ class DriverFactory:
                     options.add_argument("--disable-dev-shm-usage")
                     options.add_argument("--disable-gpu")
                     options.add_argument("--disable-extensions")
-                    options.add_argument("--remote-debugging-port=9222")
-
-                    temp_dir = tempfile.mkdtemp()
-                    options.add_argument(f"--user-data-dir={temp_dir}")
-
-                try:
-                    driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()), options=options)
-                except Exception as e:
-                    print(f"[Warning] Edge driver download failed: {e}")
-                    local_edge_path = r"C:\WebDrivers\Edge\msedgedriver.exe"
-                    if os.path.exists(local_edge_path):
-                        print(f"[Fallback] Using local Edge driver from {local_edge_path}")
-                        driver = webdriver.Edge(service=EdgeService(local_edge_path), options=options)
-                    else:
-                        raise FileNotFoundError(
-                            f"Edge driver not found at {local_edge_path} and could not be downloaded."
-                        )
+                    options.add_argument("--remote-debugging-port=0")
+
+                    if not grid:
+                        temp_dir = DriverFactory._new_profile_dir(browser_name)
+                        options.add_argument(f"--user-data-dir={temp_dir}")
+                if proxy:
+                    DriverFactory._apply_proxy(options, browser_name, proxy)
+                if profile:
+                    BrowserProfiles.apply_options(options, browser_name, profile)
+                options.page_load_strategy = page_load_strategy
+
+                # DriverResolver also covers the old local fallback (EDGE_DRIVER_PATH)
+                driver = grid.create(browser_name, options) if grid else \
+                    webdriver.Edge(service=EdgeService(DriverResolver.resolve("edge")), options=options)
 
             elif browser_name == "firefox":
                 options = FirefoxOptions()
                 if headless:
                     options.add_argument("--headless")
+                if proxy:
+                    DriverFactory._apply_proxy(options, browser_name, proxy)
+                if profile:
+                    BrowserProfiles.apply_options(options, browser_name, profile)
+                options.page_load_strategy = page_load_strategy
 
-                driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
+                driver = grid.create(browser_name, options) if grid else \
+                    webdriver.Firefox(service=FirefoxService(DriverResolver.resolve("firefox")), options=options)
 
             else:
                 raise ValueError(f"Unsupported browser: {browser_name}")
 
+            DriverFactory._cleanup_on_quit(driver, temp_dir)
+            driver.launch_args = {"browser_name": browser_name, "headless": headless, "proxy": proxy,
+                                  "profile": profile, "page_load_strategy": page_load_strategy}
+            ResourceMonitor.attach(driver)
+            if CommandTimer.enabled:
+                CommandTimer.instrument(driver)
             driver.maximize_window()
+            if profile:
+                BrowserProfiles.apply_driver(driver, profile)
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium: count requests from the first byte of every page for wait_for_network_idle
+                WaitUtils.install_network_tracker(driver)
             return driver
 
         except Exception as e:
             print(f"[Error] Failed to initialize driver for {browser_name}: {e}")
+            if temp_dir and driver is None:
+                DriverFactory._remove_profile_dir(temp_dir)
             raise
+
+
+# Drivers that were never quit (e.g. a test crashed) still get their profile removed
+atexit.register(DriverFactory._remove_leftover_profiles)
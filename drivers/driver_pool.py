@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+
+
+class DriverPool:
+    """Keeps warm browser sessions per (browser, headless, profile, page load strategy) and hands them out to tests."""
+
+    def __init__(self, factory, max_size=None, idle_timeout=None, retire=None):
+        self.factory = factory
+        self.retire = retire  # driver -> reason to quit it instead of reusing it, or None
+        self.max_size = max_size or int(os.getenv("DRIVER_POOL_SIZE", "2"))
+        self.idle_timeout = idle_timeout or float(os.getenv("DRIVER_POOL_IDLE_TIMEOUT", "300"))
+        self._idle = {}      # key -> [(driver, released_at), ...]
+        self._leased = {}    # id(driver) -> (key, driver)
+        self._starting = {}  # key -> number of drivers being launched right now
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def _key(browser_name, headless, profile=None, page_load_strategy=None):
+        return browser_name.lower(), bool(headless), profile, page_load_strategy
+
+    def _size(self, key):
+        leased = sum(1 for k, _ in self._leased.values() if k == key)
+        return len(self._idle.get(key, [])) + leased + self._starting.get(key, 0)
+
+    def acquire(self, browser_name="chrome", headless=False, profile=None, timeout=120, page_load_strategy=None):
+        key = self._key(browser_name, headless, profile, page_load_strategy)
+        deadline = time.time() + timeout
+
+        with self._cond:
+            while True:
+                self._evict_idle()
+                idle = self._idle.get(key, [])
+                while idle:
+                    driver, _ = idle.pop()
+                    if self.is_healthy(driver):
+                        self._leased[id(driver)] = (key, driver)
+                        print(f"[Pool] Reusing warm {key[0]} session")
+                        return driver
+                    print(f"[Pool] Discarding broken {key[0]} session")
+                    self._quit(driver)
+
+                if self._size(key) < self.max_size:
+                    self._starting[key] = self._starting.get(key, 0) + 1
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"No {key[0]} session became free within {timeout}s")
+                self._cond.wait(remaining)
+
+        # Launch outside the lock, browser startup takes seconds
+        try:
+            driver = self.factory(browser_name=key[0], headless=key[1], profile=key[2], page_load_strategy=key[3])
+        except Exception:
+            with self._cond:
+                self._starting[key] -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._starting[key] -= 1
+            self._leased[id(driver)] = (key, driver)
+        print(f"[Pool] Started new {key[0]} session")
+        return driver
+
+    def release(self, driver):
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+
+        if entry is None:
+            # Not ours (or already released), nothing to hand back
+            self._quit(driver)
+            return
+
+        key, _ = entry
+        reason = self.retire(driver) if self.retire else None
+        if reason:
+            print(f"[Pool] Retiring {key[0]} session ({reason})")
+            self._quit(driver)
+            with self._cond:
+                self._cond.notify()
+        elif self.reset(driver) and self.is_healthy(driver):
+            with self._cond:
+                self._idle.setdefault(key, []).append((driver, time.time()))
+                self._cond.notify()
+        else:
+            print(f"[Pool] Session could not be reset, quitting {key[0]} driver")
+            self._quit(driver)
+            with self._cond:
+                self._cond.notify()
+
+    def shutdown(self):
+        with self._cond:
+            drivers = [d for entries in self._idle.values() for d, _ in entries]
+            drivers += [d for _, d in self._leased.values()]
+            self._idle.clear()
+            self._leased.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _evict_idle(self):
+        now = time.time()
+        for key, entries in self._idle.items():
+            fresh = []
+            for driver, released_at in entries:
+                if now - released_at > self.idle_timeout:
+                    print(f"[Pool] Evicting idle {key[0]} session")
+                    self._quit(driver)
+                else:
+                    fresh.append((driver, released_at))
+            self._idle[key] = fresh
+
+    @staticmethod
+    def is_healthy(driver):
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def reset(driver):
+        """Bring a session back to a blank state: no alerts, one window, no cookies or storage."""
+        try:
+            try:
+                driver.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.delete_all_cookies()
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium only: also drop cookies of origins we are not on
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            print(f"[Pool] Reset failed: {e}")
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,206 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+
+class DriverResolver:
+    """Finds the driver binary for a browser once per run, remembering it on disk per browser version.
+
+    Lookup order: this run's memory -> on-disk index -> preseeded cache dir -> webdriver_manager.
+    With DRIVER_OFFLINE=true the last step is skipped, so a preseeded DRIVER_CACHE_DIR is enough
+    to run without network. Cache layout: <cache>/<browser>/<major version>/<binary> or <cache>/<binary>.
+
+    A driver outside a version folder (<cache>/<binary>, EDGE_DRIVER_PATH) is only used once
+    `<driver> --version` matches the browser. When the browser version cannot be probed, the
+    index is neither read nor written and webdriver_manager decides; offline, an unversioned
+    driver is used as the last resort.
+    """
+
+    BINARIES = {"chrome": "chromedriver", "edge": "msedgedriver", "firefox": "geckodriver"}
+    BROWSER_COMMANDS = {
+        "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+        "edge": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+        "firefox": ["firefox"],
+    }
+    INDEX_FILE = "index.json"
+    UNKNOWN = "unknown"
+
+    _resolved = {}  # browser -> driver path, valid for this process
+    timings = []    # (browser, seconds, source) for every resolve() call
+
+    @staticmethod
+    def cache_dir():
+        default = os.path.join(os.path.expanduser("~"), ".cache", "capstone-webdrivers")
+        return os.getenv("DRIVER_CACHE_DIR", default)
+
+    @staticmethod
+    def offline():
+        return os.getenv("DRIVER_OFFLINE", "false").lower() == "true"
+
+    @staticmethod
+    def binary_name(browser_name):
+        name = DriverResolver.BINARIES[browser_name]
+        return name + ".exe" if sys.platform == "win32" else name
+
+    @staticmethod
+    def resolve(browser_name):
+        browser_name = browser_name.lower()
+        if browser_name not in DriverResolver.BINARIES:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+
+        start = time.perf_counter()
+        path = DriverResolver._resolved.get(browser_name)
+        source = "memory"
+
+        if path is None:
+            version = DriverResolver.browser_version(browser_name)
+            known = version != DriverResolver.UNKNOWN
+            key = f"{browser_name}:{version}"
+            index = DriverResolver._load_index() if known else {}
+
+            path = index.get(key)
+            source = "index"
+            if not path or not os.path.exists(path):
+                path, source = DriverResolver._find_cached(browser_name, version), "cache"
+            if path is None:
+                path, source = DriverResolver._download(browser_name), "download"
+
+            if known and index.get(key) != path:
+                index[key] = path
+                DriverResolver._save_index(index)
+            DriverResolver._resolved[browser_name] = path
+
+        elapsed = time.perf_counter() - start
+        DriverResolver.timings.append((browser_name, elapsed, source))
+        if source != "memory":
+            print(f"[Driver] {browser_name} {version} driver resolved from {source} in {elapsed * 1000:.1f} ms: {path}")
+        return path
+
+    @staticmethod
+    def browser_version(browser_name):
+        """Major version of the installed browser, or 'unknown' if it cannot be probed."""
+        for command in DriverResolver.BROWSER_COMMANDS[browser_name]:
+            executable = shutil.which(command)
+            if not executable:
+                continue
+            try:
+                output = subprocess.run(
+                    [executable, "--version"], capture_output=True, text=True, timeout=10
+                ).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            match = re.search(r"(\d+)\.\d+", output)
+            if match:
+                return match.group(1)
+        return DriverResolver.UNKNOWN
+
+    @staticmethod
+    def driver_version(path):
+        """Version the driver binary reports (major for chromedriver/msedgedriver, 0.x for geckodriver), or None."""
+        try:
+            output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = re.search(r"(\d+)\.(\d+)", output)
+        if not match:
+            return None
+        return match.group(0) if match.group(1) == "0" else match.group(1)
+
+    @staticmethod
+    def _matches(browser_name, version, path):
+        driver_version = DriverResolver.driver_version(path)
+        if driver_version is None:
+            return False
+        # geckodriver has its own numbering and covers a range of Firefox releases
+        return browser_name == "firefox" or driver_version == version
+
+    @staticmethod
+    def _find_cached(browser_name, version):
+        binary = DriverResolver.binary_name(browser_name)
+        known = version != DriverResolver.UNKNOWN
+        if known:
+            path = os.path.join(DriverResolver.cache_dir(), browser_name, version, binary)
+            if os.path.exists(path):
+                return path
+
+        unversioned = [os.path.join(DriverResolver.cache_dir(), binary)]
+        if browser_name == "edge":
+            # Old Windows machines keep msedgedriver here
+            unversioned.append(os.getenv("EDGE_DRIVER_PATH", r"C:\WebDrivers\Edge\msedgedriver.exe"))
+        for path in unversioned:
+            if not os.path.exists(path):
+                continue
+            if known and DriverResolver._matches(browser_name, version, path):
+                return path
+            if not known and DriverResolver.offline():
+                print(f"[Driver] {browser_name} version unknown, using unchecked offline driver {path}")
+                return path
+        return None
+
+    @staticmethod
+    def _download(browser_name):
+        if DriverResolver.offline():
+            raise FileNotFoundError(
+                f"No cached {browser_name} driver in {DriverResolver.cache_dir()} and DRIVER_OFFLINE is set."
+            )
+        # webdriver_manager is only imported when we really have to download
+        if browser_name == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        if browser_name == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            return EdgeChromiumDriverManager().install()
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+
+    @staticmethod
+    def _index_path():
+        return os.path.join(DriverResolver.cache_dir(), DriverResolver.INDEX_FILE)
+
+    @staticmethod
+    def _load_index():
+        try:
+            with open(DriverResolver._index_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_index(index):
+        os.makedirs(DriverResolver.cache_dir(), exist_ok=True)
+        # Write-then-rename so parallel workers never read a half written index
+        tmp_path = f"{DriverResolver._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, DriverResolver._index_path())
+
+    @staticmethod
+    def seed(browser_name):
+        """Resolve a driver online and copy it into the cache dir so later runs can go offline."""
+        browser_name = browser_name.lower()
+        version = DriverResolver.browser_version(browser_name)
+        source = DriverResolver.resolve(browser_name)
+        known = version != DriverResolver.UNKNOWN
+        # Without a browser version only the unversioned slot fits (offline last resort)
+        target_dir = os.path.join(DriverResolver.cache_dir(), browser_name, version) if known else DriverResolver.cache_dir()
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, DriverResolver.binary_name(browser_name))
+        if os.path.abspath(source) != os.path.abspath(target):
+            shutil.copy2(source, target)
+
+        if known:
+            index = DriverResolver._load_index()
+            index[f"{browser_name}:{version}"] = target
+            DriverResolver._save_index(index)
+        print(f"[Driver] Seeded {browser_name} {version} driver at {target}")
+        return target
+
+
+if __name__ == "__main__":
+    # python -m drivers.driver_resolver chrome firefox  -> fill the cache for offline CI runs
+    for name in sys.argv[1:] or ["chrome"]:
+        DriverResolver.seed(name)
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+import requests
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.remote.file_detector import LocalFileDetector
+
+# DriverFactory's browser names -> the W3C browserName grid nodes advertise in their slot stereotypes
+W3C_BROWSER_NAMES = {"chrome": "chrome", "edge": "MicrosoftEdge", "firefox": "firefox"}
+
+
+class GridBalancer:
+    """Starts webdriver.Remote sessions on one or more Selenium Grid hubs, where there is room.
+
+    Each hub's /status says which node slots are free for a browser. A session goes to the hub
+    with the most free slots for it, discounted by how slowly that hub has been starting
+    sessions (moving average). A hub that refuses a session is treated as full until its
+    status is read again, and the next hub is tried. Sessions get a LocalFileDetector, so
+    send_keys(path) uploads the local file to the node.
+
+    SELENIUM_GRID_URLS: comma-separated hub URLs, e.g. http://grid-a:4444,http://grid-b:4444
+    """
+
+    STATUS_TTL = 2.0     # seconds a /status answer is trusted
+    WEIGHT = 0.3         # share of the newest start time in the average
+
+    def __init__(self, hubs, wait_timeout=None):
+        self.hubs = [hub.rstrip("/") for hub in hubs]
+        self.wait_timeout = wait_timeout if wait_timeout is not None else \
+            float(os.getenv("GRID_WAIT_TIMEOUT", "60"))
+        self._status = {}     # hub -> (read_at, {browser: free slots})
+        self._latency = {}    # hub -> average session start in seconds
+        self._started = {}    # hub -> sessions started by this process
+        self._lock = threading.Lock()
+        self._http = requests.Session()
+
+    @staticmethod
+    def from_env():
+        hubs = [hub.strip() for hub in os.getenv("SELENIUM_GRID_URLS", "").split(",") if hub.strip()]
+        return GridBalancer(hubs) if hubs else None
+
+    def _fetch_status(self, hub):
+        response = self._http.get(f"{hub}/status", timeout=5)
+        response.raise_for_status()
+        return response.json()["value"]
+
+    @staticmethod
+    def slot_key(browser_name):
+        """Key free_slots() counts a browser's slots under ("edge" and "MicrosoftEdge" -> "microsoftedge")."""
+        return W3C_BROWSER_NAMES.get(browser_name.lower(), browser_name).lower()
+
+    @staticmethod
+    def free_slots(status):
+        """{browser name: free slots} over the nodes that are up."""
+        free = {}
+        for node in status.get("nodes", []):
+            if node.get("availability", "UP") != "UP":
+                continue
+            for slot in node.get("slots", []):
+                if slot.get("session") is None:
+                    browser_name = slot.get("stereotype", {}).get("browserName", "").lower()
+                    free[browser_name] = free.get(browser_name, 0) + 1
+        return free
+
+    def _free(self, hub, browser_name, refresh=False):
+        now = time.time()
+        cached = self._status.get(hub)
+        if refresh or cached is None or now - cached[0] > self.STATUS_TTL:
+            try:
+                cached = (now, self.free_slots(self._fetch_status(hub)))
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"[Grid] {hub} status unavailable: {e}")
+                cached = (now, {})
+            self._status[hub] = cached
+        return cached[1].get(browser_name, 0)
+
+    def _score(self, hub, browser_name):
+        # Free slots, worth less on a hub that starts sessions slowly; unknown latency counts as 1s
+        return self._free(hub, browser_name) / (1.0 + self._latency.get(hub, 1.0)), -self._started.get(hub, 0)
+
+    def ranked(self, browser_name):
+        """Hubs with a free slot for the browser, best first."""
+        browser_name = self.slot_key(browser_name)
+        with self._lock:
+            scored = [(self._score(hub, browser_name), hub) for hub in self.hubs]
+        return [hub for score, hub in sorted(scored, key=lambda s: s[0], reverse=True) if score[0] > 0]
+
+    def _claim(self, hub, browser_name):
+        # Count the slot as taken until the next /status says otherwise
+        with self._lock:
+            read_at, free = self._status.get(hub, (time.time(), {}))
+            free = dict(free, **{browser_name: max(0, free.get(browser_name, 0) - 1)})
+            self._status[hub] = (read_at, free)
+
+    def _mark_full(self, hub, browser_name):
+        with self._lock:
+            read_at, free = self._status.get(hub, (time.time(), {}))
+            self._status[hub] = (read_at, dict(free, **{browser_name: 0}))
+
+    def _record_start(self, hub, seconds):
+        with self._lock:
+            previous = self._latency.get(hub)
+            self._latency[hub] = seconds if previous is None else previous * (1 - self.WEIGHT) + seconds * self.WEIGHT
+            self._started[hub] = self._started.get(hub, 0) + 1
+
+    def _connect(self, hub, options):
+        return webdriver.Remote(command_executor=hub, options=options, file_detector=LocalFileDetector())
+
+    def create(self, browser_name, options):
+        """A remote session on the best hub; waits up to wait_timeout for a free slot anywhere."""
+        browser_name = self.slot_key(browser_name)
+        deadline = time.time() + self.wait_timeout
+        errors = []
+        while True:
+            for hub in self.ranked(browser_name):
+                self._claim(hub, browser_name)
+                started = time.time()
+                try:
+                    driver = self._connect(hub, options)
+                except (SessionNotCreatedException, WebDriverException) as e:
+                    print(f"[Grid] {hub} could not start {browser_name}, trying the next hub: {e.msg}")
+                    self._mark_full(hub, browser_name)
+                    errors.append(f"{hub}: {e.msg}")
+                    continue
+                self._record_start(hub, time.time() - started)
+                driver.grid_hub = hub
+                print(f"[Grid] Started {browser_name} on {hub} in {time.time() - started:.1f}s")
+                return driver
+
+            if time.time() >= deadline:
+                detail = "; ".join(errors[-3:]) or "no free slots"
+                raise SessionNotCreatedException(f"No grid hub could start {browser_name} ({detail})")
+            time.sleep(0.5)
+            with self._lock:
+                for hub in self.hubs:
+                    self._free(hub, browser_name, refresh=True)
+
+    def stats(self):
+        with self._lock:
+            return {hub: {"sessions": self._started.get(hub, 0),
+                          "avg_start_s": round(self._latency[hub], 2) if hub in self._latency else None}
+                    for hub in self.hubs}
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # optional: without it there is no sampling and nothing is recycled on memory
+    psutil = None
+
+
+class ResourceMonitor:
+    """Samples the process tree behind each driver (driver binary + browser + renderers).
+
+    A background thread samples every attached driver every DRIVER_SAMPLE_INTERVAL seconds
+    (RSS, CPU, open handles) and keeps the peak since the last reset_peaks(), so each test can
+    report its peak browser memory. over_limit() tells when a driver should be replaced: RSS above
+    DRIVER_MAX_RSS_MB or more than DRIVER_MAX_COMMANDS commands (0 = no limit).
+    """
+
+    _entries = {}   # id(entry) -> {"driver", "commands", "peak_rss", "last"}; the entry also sits on the driver
+    _lock = threading.Lock()
+    _thread = None
+    _peak = 0.0     # all drivers together, since reset_peaks()
+
+    @staticmethod
+    def available():
+        return psutil is not None
+
+    @staticmethod
+    def limits():
+        return {
+            "max_rss_mb": float(os.getenv("DRIVER_MAX_RSS_MB", "1500")),
+            "max_commands": int(os.getenv("DRIVER_MAX_COMMANDS", "0")),
+        }
+
+    @staticmethod
+    def attach(driver):
+        if getattr(driver, "_resource_monitor", None) is not None:
+            return driver
+        entry = {"driver": driver, "commands": 0, "peak_rss": 0, "last": None}
+        driver._resource_monitor = entry
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            entry["commands"] += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        with ResourceMonitor._lock:
+            ResourceMonitor._entries[id(entry)] = entry
+        ResourceMonitor._start_sampler()
+        return driver
+
+    @staticmethod
+    def detach(driver):
+        entry = getattr(driver, "_resource_monitor", None)
+        if entry is not None:
+            with ResourceMonitor._lock:
+                ResourceMonitor._entries.pop(id(entry), None)
+
+    @staticmethod
+    def pid_alive(pid):
+        if psutil is not None:
+            return psutil.pid_exists(pid)
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True  # exists but belongs to someone else (on Windows signal 0 is no probe either)
+        return True
+
+    @staticmethod
+    def _root_pid(driver):
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        return getattr(process, "pid", None)
+
+    @staticmethod
+    def sample(driver):
+        """{"rss_mb", "cpu_percent", "handles", "processes"} for the driver's process tree, or None."""
+        pid = ResourceMonitor._root_pid(driver)
+        if psutil is None or pid is None:
+            return None
+        try:
+            root = psutil.Process(pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+
+        rss = cpu = handles = 0
+        for process in tree:
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+                    handles += process.num_handles() if os.name == "nt" else process.num_fds()
+            except psutil.Error:
+                continue  # renderers come and go
+        stats = {"rss_mb": round(rss / 2 ** 20, 1), "cpu_percent": round(cpu, 1),
+                 "handles": handles, "processes": len(tree)}
+
+        entry = getattr(driver, "_resource_monitor", None)
+        if entry is not None:
+            entry["last"] = stats
+            entry["peak_rss"] = max(entry["peak_rss"], stats["rss_mb"])
+        return stats
+
+    @staticmethod
+    def _start_sampler():
+        if psutil is None or (ResourceMonitor._thread and ResourceMonitor._thread.is_alive()):
+            return
+        interval = float(os.getenv("DRIVER_SAMPLE_INTERVAL", "0.5"))
+
+        def run():
+            while True:
+                with ResourceMonitor._lock:
+                    drivers = [e["driver"] for e in ResourceMonitor._entries.values()]
+                samples = [ResourceMonitor.sample(driver) for driver in drivers]
+                total = sum(stats["rss_mb"] for stats in samples if stats)
+                ResourceMonitor._peak = max(ResourceMonitor._peak, round(total, 1))
+                time.sleep(interval)
+
+        ResourceMonitor._thread = threading.Thread(target=run, name="resource-monitor", daemon=True)
+        ResourceMonitor._thread.start()
+
+    @staticmethod
+    def reset_peaks():
+        with ResourceMonitor._lock:
+            entries = list(ResourceMonitor._entries.values())
+        for entry in entries:
+            entry["peak_rss"] = entry["last"]["rss_mb"] if entry["last"] else 0
+        ResourceMonitor._peak = round(sum(e["peak_rss"] for e in entries), 1)
+
+    @staticmethod
+    def peak_rss_mb():
+        """Highest RSS of all browsers together since reset_peaks(); kept after their drivers quit."""
+        return ResourceMonitor._peak
+
+    @staticmethod
+    def over_limit(driver):
+        """Reason the driver should be replaced, or None."""
+        entry = getattr(driver, "_resource_monitor", None)
+        if entry is None:
+            return None
+        limits = ResourceMonitor.limits()
+        if limits["max_commands"] and entry["commands"] >= limits["max_commands"]:
+            return f"{entry['commands']} commands"
+        stats = ResourceMonitor.sample(driver)
+        if stats and stats["rss_mb"] >= limits["max_rss_mb"]:
+            return f"{stats['rss_mb']:.0f} MB RSS"
+        return None
@@ -0,0 +1,133 @@
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    JavascriptException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+from utilities.command_timer import CommandTimer
+from utilities.js_utils import JSUtils
+from utilities.wait_utils import WaitUtils
+
+# A cached element raising one of these is looked up (and waited for) again
+RETRY_EXCEPTIONS = (
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+)
+
+
+class BasePage:
+    """Shared page object plumbing: caches resolved WebElements per locator.
+
+    A cached element is reused until it goes stale (navigation, re-render) or stops being
+    interactable, at which point it is waited for again. Every hit is a wait + find round
+    trip that did not happen; totals across all pages are in BasePage.cache_stats().
+
+    Each page also declares a readiness contract: `ready_locators` that must be displayed and
+    an optional `ready_script` (JS body returning true). open/refresh/back/forward return as soon
+    as the new document meets it, which is what makes the eager/none load strategies safe.
+    """
+
+    _stats = {"hits": 0, "misses": 0, "invalidations": 0}
+    ready_locators = ()
+    ready_script = None
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def cache_stats(cls):
+        return dict(BasePage._stats)
+
+    def _navigate(self, action, timeout):
+        self.invalidate()
+        token = JSUtils.mark_navigation(self.driver)
+        action()
+        self.wait_until_ready(token, timeout)
+
+    def wait_until_ready(self, token=None, timeout=15):
+        """Wait for this page's readiness contract (on a document other than `token`'s)."""
+        with CommandTimer.waiting():
+            WebDriverWait(self.driver, timeout, poll_frequency=0.05, ignored_exceptions=(JavascriptException,)).until(
+                lambda d: JSUtils.page_ready(d, token, self.ready_locators, self.ready_script),
+                f"{type(self).__name__} not ready: {list(self.ready_locators)} / {self.ready_script}",
+            )
+
+    def open(self, url, timeout=15):
+        self._navigate(lambda: self.driver.get(url), timeout)
+
+    def refresh(self, timeout=15):
+        self._navigate(self.driver.refresh, timeout)
+
+    def back(self, timeout=15):
+        self._navigate(self.driver.back, timeout)
+
+    def forward(self, timeout=15):
+        self._navigate(self.driver.forward, timeout)
+
+    def invalidate(self, locator=None):
+        if locator is None:
+            dropped = len(self._elements)
+            self._elements.clear()
+        else:
+            dropped = 1 if self._elements.pop(locator, None) is not None else 0
+        BasePage._stats["invalidations"] += dropped
+
+    def element(self, locator, clickable=False, timeout=15):
+        element = self._elements.get(locator)
+        if element is not None:
+            self.hits += 1
+            BasePage._stats["hits"] += 1
+            return element
+
+        self.misses += 1
+        BasePage._stats["misses"] += 1
+        if clickable:
+            element = WaitUtils.wait_for_element_clickable(self.driver, locator, timeout)
+        else:
+            element = WaitUtils.wait_for_element_visible(self.driver, locator, timeout)
+        self._elements[locator] = element
+        return element
+
+    def _with_element(self, locator, action, clickable=False):
+        try:
+            return action(self.element(locator, clickable))
+        except RETRY_EXCEPTIONS:
+            self.invalidate(locator)
+            return action(self.element(locator, clickable))
+
+    def click(self, locator):
+        self._with_element(locator, lambda el: el.click(), clickable=True)
+
+    def enter_text(self, locator, text, clear=False):
+        def action(el):
+            if clear:
+                el.clear()
+            el.send_keys(text)
+        self._with_element(locator, action)
+
+    def text_of(self, locator):
+        return self._with_element(locator, lambda el: el.text)
+
+    def fill_form(self, values, keystrokes=False):
+        """Fill {locator: value} in a single script call that fires input/change events.
+
+        keystrokes=True types every field for real; an iterable of locators types only those.
+        Fields the script could not reach fall back to typing as well.
+        """
+        if keystrokes is True:
+            typed = set(values)
+        else:
+            typed = set(keystrokes or ())
+
+        batch = [(locator, value) for locator, value in values.items() if locator not in typed]
+        skipped = JSUtils.fill_fields(self.driver, batch) if batch else []
+
+        fallback = [batch[i][0] for i in skipped]
+        for locator, value in values.items():
+            if locator in typed or locator in fallback:
+                self.enter_text(locator, value, clear=True)
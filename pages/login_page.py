@@ -1,28 +1,34 @@
 from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
 from utilities.wait_utils import WaitUtils
 
-class LoginPage:
+class LoginPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.login_button_nav = (By.ID, "login2")           # top nav "Log in"
         self.username_input = (By.ID, "loginusername")     # modal username
         self.password_input = (By.ID, "loginpassword")     # modal password
         self.submit_button = (By.XPATH, "//button[text()='Log in']")  # modal submit
         self.logout_button = (By.ID, "logout2")            # top nav "Log out"
+        # Nav link is shown and the site script that opens the modal and logs in is loaded
+        self.ready_locators = (self.login_button_nav,)
+        self.ready_script = "return typeof logIn === 'function';"
 
     def open_login_modal(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.login_button_nav).click()
+        self.click(self.login_button_nav)
 
     def enter_username(self, username):
-        WaitUtils.wait_for_element_visible(self.driver, self.username_input).clear()
-        WaitUtils.wait_for_element_visible(self.driver, self.username_input).send_keys(username)
+        self.enter_text(self.username_input, username, clear=True)
 
     def enter_password(self, password):
-        WaitUtils.wait_for_element_visible(self.driver, self.password_input).clear()
-        WaitUtils.wait_for_element_visible(self.driver, self.password_input).send_keys(password)
+        self.enter_text(self.password_input, password, clear=True)
+
+    def enter_credentials(self, username, password, keystrokes=False):
+        self.fill_form({self.username_input: username, self.password_input: password}, keystrokes=keystrokes)
 
     def click_login(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.submit_button).click()
+        self.click(self.submit_button)
+        WaitUtils.wait_for_network_idle(self.driver)
 
     def is_logged_in(self):
         """Return True if logout button is visible (user is logged in)."""
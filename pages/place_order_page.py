@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
-from utilities.wait_utils import WaitUtils
+from pages.base_page import BasePage
 
-class PlaceOrderPage:
+class PlaceOrderPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.place_order_btn = (By.XPATH, "//button[text()='Place Order']")
         self.name_input = (By.ID, "name")
         self.country_input = (By.ID, "country")
@@ -12,20 +12,23 @@ class PlaceOrderPage:
         self.month_input = (By.ID, "month")
         self.year_input = (By.ID, "year")
         self.purchase_btn = (By.XPATH, "//button[text()='Purchase']")
+        self.ready_locators = (self.place_order_btn,)  # cart page
 
     def open_place_order_modal(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.place_order_btn).click()
+        self.click(self.place_order_btn)
 
-    def fill_order_details(self, name, country, city, card, month, year):
-        WaitUtils.wait_for_element_visible(self.driver, self.name_input).send_keys(name)
-        WaitUtils.wait_for_element_visible(self.driver, self.country_input).send_keys(country)
-        WaitUtils.wait_for_element_visible(self.driver, self.city_input).send_keys(city)
-        WaitUtils.wait_for_element_visible(self.driver, self.card_input).send_keys(card)
-        WaitUtils.wait_for_element_visible(self.driver, self.month_input).send_keys(month)
-        WaitUtils.wait_for_element_visible(self.driver, self.year_input).send_keys(year)
+    def fill_order_details(self, name, country, city, card, month, year, keystrokes=False):
+        self.fill_form({
+            self.name_input: name,
+            self.country_input: country,
+            self.city_input: city,
+            self.card_input: card,
+            self.month_input: month,
+            self.year_input: year,
+        }, keystrokes=keystrokes)
 
     def place_order(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.purchase_btn).click()
+        self.click(self.purchase_btn)
         # Accept alert if present
         try:
             alert = self.driver.switch_to.alert
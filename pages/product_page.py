@@ -1,18 +1,24 @@
 from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
 from utilities.wait_utils import WaitUtils
 from utilities.js_utils import JSUtils
 
-class ProductPage:
+class ProductPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.product_link = (By.LINK_TEXT, "Samsung galaxy s6")
         self.add_to_cart_btn = (By.LINK_TEXT, "Add to cart")
+        # The product grid is filled by a request after load; images may still be loading
+        self.ready_locators = (self.product_link,)
 
     def open_product(self):
-        product = WaitUtils.wait_for_element_visible(self.driver, self.product_link)
-        JSUtils.scroll_into_view(self.driver, product)
-        product.click()
+        def scroll_and_click(product):
+            JSUtils.scroll_into_view(self.driver, product)
+            product.click()
+        self._with_element(self.product_link, scroll_and_click)
+        WaitUtils.wait_for_network_idle(self.driver)
 
     def add_to_cart(self):
-        btn = WaitUtils.wait_for_element_clickable(self.driver, self.add_to_cart_btn)
-        JSUtils.click_element(self.driver, btn)
+        self._with_element(self.add_to_cart_btn, lambda btn: JSUtils.click_element(self.driver, btn),
+                           clickable=True)
+        WaitUtils.wait_for_network_idle(self.driver)
@@ -1,20 +1,23 @@
 from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
 from utilities.wait_utils import WaitUtils
 
-class SignupPage:
+class SignupPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.signup_btn = (By.ID, "signin2")
         self.username_input = (By.ID, "sign-username")
         self.password_input = (By.ID, "sign-password")
         self.signup_submit = (By.XPATH, "//button[text()='Sign up']")
+        self.ready_locators = (self.signup_btn,)
+        self.ready_script = "return typeof register === 'function';"
 
     def open_signup_modal(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.signup_btn).click()
+        self.click(self.signup_btn)
 
-    def enter_signup_details(self, username, password):
-        WaitUtils.wait_for_element_visible(self.driver, self.username_input).send_keys(username)
-        WaitUtils.wait_for_element_visible(self.driver, self.password_input).send_keys(password)
+    def enter_signup_details(self, username, password, keystrokes=False):
+        self.fill_form({self.username_input: username, self.password_input: password}, keystrokes=keystrokes)
 
     def submit_signup(self):
-        WaitUtils.wait_for_element_clickable(self.driver, self.signup_submit).click()
+        self.click(self.signup_submit)
+        WaitUtils.wait_for_network_idle(self.driver)
@@ -0,0 +1,79 @@
+// Minimal re-implementation of demoblaze's shared page script: nav, modals, login/signup.
+var API_URL = window.location.origin;
+
+function getCookie(name) {
+  var match = document.cookie.match(new RegExp('(?:^|; )' + name + '=([^;]*)'));
+  return match ? decodeURIComponent(match[1]) : null;
+}
+
+function api(endpoint, payload) {
+  return fetch(API_URL + '/' + endpoint, {
+    method: payload === undefined ? 'GET' : 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: payload === undefined ? undefined : JSON.stringify(payload)
+  }).then(function (r) { return r.json(); });
+}
+
+function cartOwner() {
+  var token = getCookie('tokenp_');
+  return token ? { cookie: token, flag: true } : { cookie: getCookie('user'), flag: false };
+}
+
+function uuid() {
+  return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function (c) {
+    var r = Math.random() * 16 | 0;
+    return (c === 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+  });
+}
+
+function showModal(id) { document.getElementById(id).classList.add('show'); }
+function hideModal(id) { document.getElementById(id).classList.remove('show'); }
+
+function logIn() {
+  var username = document.getElementById('loginusername').value;
+  var password = btoa(document.getElementById('loginpassword').value);
+  api('login', { username: username, password: password }).then(function (data) {
+    if (data.errorMessage) { alert(data.errorMessage); return; }
+    document.cookie = 'tokenp_=' + data.split('Auth_token: ')[1] + '; path=/';
+    hideModal('logInModal');
+    window.location.href = 'index.html';
+  });
+}
+
+function register() {
+  var username = document.getElementById('sign-username').value;
+  var password = btoa(document.getElementById('sign-password').value);
+  api('signup', { username: username, password: password }).then(function (data) {
+    alert(data && data.errorMessage ? data.errorMessage : 'Sign up successful.');
+    hideModal('signInModal');
+  });
+}
+
+function logOut() {
+  document.cookie = 'tokenp_=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/';
+  window.location.href = 'index.html';
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+  if (!getCookie('user')) { document.cookie = 'user=' + uuid() + '; path=/'; }
+
+  document.getElementById('login2').onclick = function (e) { e.preventDefault(); showModal('logInModal'); };
+  document.getElementById('signin2').onclick = function (e) { e.preventDefault(); showModal('signInModal'); };
+  document.getElementById('logout2').onclick = function (e) { e.preventDefault(); logOut(); };
+  Array.prototype.forEach.call(document.querySelectorAll('[data-dismiss="modal"]'), function (btn) {
+    btn.onclick = function () { btn.closest('.modal').classList.remove('show'); };
+  });
+
+  var token = getCookie('tokenp_');
+  if (token) {
+    api('check', { token: token }).then(function (data) {
+      if (!data.Item) { return; }
+      document.getElementById('login2').style.display = 'none';
+      document.getElementById('signin2').style.display = 'none';
+      document.getElementById('logout2').style.display = 'block';
+      var name = document.getElementById('nameofuser');
+      name.textContent = 'Welcome ' + data.Item.username;
+      name.style.display = 'block';
+    });
+  }
+});
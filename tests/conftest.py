@@ -19,28 +19,441 @@
 #     yield driver
 #     driver.quit()
 # tests/conftest.py
+import json
 import pytest
-import time
 import os
-from drivers.driver_factory import DriverFactory
-from pages.login_page import LoginPage
+import sys
+import time
+from utilities.command_timer import CommandTimer
+from utilities.config import Config
+from utilities.data_provider import CsvDataSet
+from utilities.scheduler import DurationHistory, by_scope, dependency_groups, longest_first, parse_shard, partition
+from utilities.screenshot_service import ScreenshotService
+from utilities.session_store import SessionStore
+
+# Selenium, requests, psutil and the allure writer are imported by the fixtures and hooks that
+# need them, so collecting (or running) tests that never start a browser does not pay for them.
+
+try:
+    import allure
+except ImportError:  # allure-pytest is only needed for the report
+    allure = None
+
+# Slowest WebDriver commands of the run; fed from report user_properties so xdist workers count too
+_slowest_commands = []
+# Peak browser memory (MB) per test, from report user_properties like the commands above
+_peak_memory = {}
+# Time spent collecting, in total and per test module
+_collection = {"seconds": None, "modules": {}}
+# Duration history, this run's per-test durations and the shard plan
+_schedule = {"history": None, "durations": {}, "summary": None}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--target", choices=["live", "local"], default=os.getenv("TEST_TARGET", "live"),
+        help="run against the real sites (live) or the bundled local stand-in (local); "
+             "CACHING_PROXY=record|replay only applies to local, the live sites are https and cannot be cached",
+    )
+    parser.addoption(
+        "--command-timing", action="store_true",
+        default=os.getenv("COMMAND_TIMING", "").lower() in ("1", "true"),
+        help="time every WebDriver command and report per-test latencies",
+    )
+    parser.addoption(
+        "--allure-keep-runs", type=int, default=int(os.getenv("ALLURE_KEEP_RUNS", "3")),
+        help="previous --alluredir runs to keep zipped in reports/allure-archive (-1: keep adding to the dir)",
+    )
+    parser.addoption(
+        "--shard", default=os.getenv("TEST_SHARD"),
+        help="run only part i of n (e.g. 2/3), split by predicted duration",
+    )
+    parser.addoption(
+        "--collection-timing", action="store_true",
+        default=os.getenv("COLLECTION_TIMING", "").lower() in ("1", "true"),
+        help="report how long collection took and which test modules were slowest to collect",
+    )
+    parser.addoption(
+        "--screenshots", choices=["on-failure", "off"], default=os.getenv("SCREENSHOTS", "on-failure"),
+        help="capture a screenshot of every browser a failing test used",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    CommandTimer.enable(config.getoption("--command-timing"))
+    try:
+        parse_shard(config.getoption("--shard") or "1/1")
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+    history = _schedule["history"] = DurationHistory()
+    alluredir = getattr(config.option, "allure_report_dir", None)
+    if not history.durations and os.path.isdir(alluredir or ""):
+        history.import_allure(alluredir)  # no history yet: start from the last Allure run
+
+    # Before allure-pytest sets up its writer: start from an empty results dir, store attachments once
+    if alluredir:
+        from utilities.allure_results import AllureResults, DedupingFileLogger
+        keep = config.getoption("--allure-keep-runs")
+        if keep >= 0 and not hasattr(config, "workerinput") and not config.option.collectonly:
+            archive = AllureResults(alluredir).rotate(keep=keep)
+            if archive:
+                print(f"[Allure] Previous results archived to {archive}")
+        DedupingFileLogger.install()
+
+
+@pytest.fixture(autouse=True)
+def command_timing(request):
+    """With --command-timing, summarise this test's WebDriver commands (JSON in Allure + user_properties)."""
+    if not CommandTimer.enabled:
+        yield
+        return
+    CommandTimer.begin()
+    yield
+    summary = CommandTimer.end(request.node.nodeid)
+    request.node.user_properties.append(("webdriver_commands", summary))
+    if allure is not None:
+        allure.attach(json.dumps(summary, indent=2), name="webdriver-commands",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+def _loaded(module_name, attribute):
+    """`attribute` of a module if this run has imported it, else None (it has nothing to report)."""
+    return getattr(sys.modules.get(module_name), attribute, None)
+
+
+@pytest.fixture(autouse=True)
+def resource_usage(request):
+    """Record the test's peak browser memory; recycle the shared logged-in browser once it is over its limits."""
+    monitor = _loaded("drivers.resource_monitor", "ResourceMonitor")  # loaded with the first driver
+    if monitor is not None:
+        monitor.reset_peaks()
+    yield
+    monitor = _loaded("drivers.resource_monitor", "ResourceMonitor")
+    if monitor is None or not monitor.available():
+        return
+    request.node.user_properties.append(("peak_browser_rss_mb", monitor.peak_rss_mb()))
+    if "logged_in_session" in request.fixturenames:
+        from drivers.driver_factory import DriverFactory
+        session = request.getfixturevalue("logged_in_session")
+        reason = monitor.over_limit(session["driver"])
+        if reason:
+            print(f"[Monitor] logged_in_driver over its limit ({reason}), recycling")
+            # The next test's logged_in_driver is the fresh browser
+            session["driver"] = DriverFactory.recycle(session["driver"])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "teardown" or not report.failed or item.config.getoption("--screenshots") == "off":
+        return
+    # Only drivers the test received through fixtures; the capture is queued, not written here
+    drivers = {id(v): v for v in getattr(item, "funcargs", {}).values() if hasattr(v, "get_screenshot_as_base64")}
+    for driver in drivers.values():
+        try:
+            path = ScreenshotService.default().capture(driver, f"FAILED_{item.name}")
+            report.sections.append(("screenshot", path))
+        except Exception as e:
+            print(f"[Screenshot] Could not capture {item.name}: {e}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    started = time.perf_counter()
+    yield
+    _collection["seconds"] = time.perf_counter() - started
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    # Collecting a module is importing it plus parametrizing its tests
+    started = time.perf_counter()
+    yield
+    if isinstance(collector, pytest.Module):
+        _collection["modules"][collector.nodeid] = time.perf_counter() - started
+
+
+def _cached_row_count(config, dataset):
+    """Row count from the pytest cache while the file is unchanged, so collection need not read it."""
+    cache = getattr(config, "cache", None)
+    key = f"data_provider/{dataset.name}"
+    stamp = list(dataset.stamp())
+    entry = cache.get(key, None) if cache is not None else None
+    if entry and entry.get("stamp") == stamp:
+        return entry["rows"]
+    rows = len(dataset)
+    if cache is not None:
+        cache.set(key, {"stamp": stamp, "rows": rows})
+    return rows
+
+
+def pytest_generate_tests(metafunc):
+    """`@pytest.mark.data_rows(argname, file)`: one test per row of testdata/<file>, read when that test runs."""
+    for marker in metafunc.definition.iter_markers("data_rows"):
+        argname, name = marker.args
+        dataset = CsvDataSet(name)
+        metafunc.parametrize(argname, dataset.params(count=_cached_row_count(metafunc.config, dataset)))
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """Longest predicted modules, classes and tests first (`depends_on` chains keep their order); --shard keeps one slice."""
+    groups = dependency_groups(items)
+    for group in groups:
+        if len(group) > 1:
+            # With `-n auto --dist loadgroup` a dependency chain stays on one worker
+            for item in group:
+                item.add_marker(pytest.mark.xdist_group(f"depends-{group[0].name}"))
+
+    costed = longest_first(groups, _schedule["history"].predict)
+    shard = config.getoption("--shard")
+    if shard:
+        index, total = parse_shard(shard)
+        assignment, loads = partition(costed, total)
+        keep = {id(item) for group in assignment[index] for item in group}
+        deselected = [item for item in items if id(item) not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        costed = [(cost, group) for cost, group in costed if id(group[0]) in keep]
+        _schedule["summary"] = (f"shard {index + 1}/{total}: {len(keep)} tests, predicted {loads[index]:.0f}s "
+                                f"(shards: {', '.join(f'{load:.0f}s' for load in loads)})")
+    items[:] = [item for _, group in by_scope(costed) for item in group]
+
+
+def pytest_sessionfinish(session):
+    ScreenshotService.shutdown_default()
+    # Workers report to the controller, which keeps the history
+    if _schedule["durations"] and not hasattr(session.config, "workerinput"):
+        history = _schedule["history"]
+        for nodeid, seconds in _schedule["durations"].items():
+            history.record(nodeid, seconds)
+        history.save()
+
+
+def pytest_runtest_logreport(report):
+    if not (report.when == "call" and report.skipped):
+        _schedule["durations"][report.nodeid] = _schedule["durations"].get(report.nodeid, 0.0) + report.duration
+    for name, value in report.user_properties:
+        if name == "webdriver_commands" and report.when == "teardown":
+            _slowest_commands.extend(value["slowest"])
+        if name == "peak_browser_rss_mb" and report.when == "teardown" and value:
+            _peak_memory[report.nodeid] = value
+
+
+@pytest.fixture(scope="session", autouse=True)
+def site(request):
+    """With --target=local, serve demoblaze/demoqa (and the demoblaze API) from this machine."""
+    if request.config.getoption("--target") != "local":
+        yield Config
+        return
+
+    from utilities.local_site import LocalSite
+    demoblaze = LocalSite("demoblaze").start()
+    demoqa = LocalSite("demoqa").start()
+    overrides = {
+        "TEST_TARGET": "local",
+        "DEMOBLAZE_URL": demoblaze.url,
+        "DEMOBLAZE_API_URL": demoblaze.url,
+        "DEMOQA_URL": demoqa.url,
+    }
+    previous = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    print(f"\n[Site] Local demoblaze at {demoblaze.url}, demoqa at {demoqa.url}")
+
+    yield Config
+
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    demoblaze.stop()
+    demoqa.stop()
+
 
 @pytest.fixture(scope="session", params=["chrome"])  # CI-friendly
-def logged_in_driver(request):
+def logged_in_session(request):
+    """{"driver": logged-in browser} shared by the tests of one run; under pytest-xdist every worker gets its own.
+
+    resource_usage may replace the driver between tests, so tests take it from logged_in_driver.
+    """
+    from drivers.driver_factory import DriverFactory
+    from pages.login_page import LoginPage
     browser_name = request.param
+    print(f"\n[Session] Starting logged-in {browser_name} for worker {DriverFactory.worker_id()}")
 
     # ✅ Use headless mode in CI
     is_ci = os.getenv("CI", "false").lower() == "true"
-    driver = DriverFactory.get_driver(browser_name=browser_name, headless=is_ci)
+    # Page objects wait for their own readiness contract, no need to wait for every image
+    driver = DriverFactory.get_driver(browser_name=browser_name, headless=is_ci, page_load_strategy="eager")
 
-    # Open the website and login
-    driver.get("https://www.demoblaze.com")
+    # Reuse a stored login if there is a fresh one, otherwise log in through the modal once
     login_page = LoginPage(driver)
-    login_page.open_login_modal()
-    login_page.enter_username("Ramya Hunagund")
-    login_page.enter_password("ramya123")
-    login_page.click_login()
-    time.sleep(2)  # wait for login to complete
-
-    yield driver
-    driver.quit()
+
+    def ui_login(driver):
+        login_page.open_login_modal()
+        login_page.enter_credentials("Ramya Hunagund", "ramya123")
+        login_page.click_login()  # returns once the login request has settled
+
+    def log_in(driver):
+        SessionStore().ensure_logged_in(
+            driver, Config.demoblaze_url(), "Ramya Hunagund",
+            login=ui_login, is_valid=lambda driver: login_page.is_logged_in(),
+        )
+
+    log_in(driver)
+    # A recycled browser (see resource_usage) comes back logged in, from the stored session
+    driver._after_recycle = log_in
+
+    session = {"driver": driver}
+    yield session
+    session["driver"].quit()
+
+
+@pytest.fixture
+def logged_in_driver(logged_in_session):
+    """The shared logged-in browser, as it is for this test."""
+    return logged_in_session["driver"]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def driver_pool():
+    """One warm-session pool per run (created on first use); every pooled browser is quit at the end."""
+    yield
+    factory = _loaded("drivers.driver_factory", "DriverFactory")
+    if factory is not None:
+        factory.shutdown_pool()
+
+
+@pytest.fixture
+def pooled_driver(request):
+    """Borrow a warm driver for one test; honours a `browser_name` parameter if the test has one.
+
+    `@pytest.mark.browser_profile(name)` (or BROWSER_PROFILE) picks a resource-blocking profile;
+    whatever it blocked is printed and kept in the test's user_properties. Browsers are headless
+    on CI, and everywhere for tests marked `@pytest.mark.headless`.
+    """
+    from drivers.browser_profiles import BrowserProfiles
+    from drivers.driver_factory import DriverFactory
+    callspec = getattr(request.node, "callspec", None)
+    browser_name = callspec.params.get("browser_name", "chrome") if callspec else "chrome"
+    is_ci = os.getenv("CI", "false").lower() == "true"
+    headless = is_ci or request.node.get_closest_marker("headless") is not None
+    marker = request.node.get_closest_marker("browser_profile")
+    profile = marker.args[0] if marker else os.getenv("BROWSER_PROFILE") or None
+
+    driver = DriverFactory.acquire(browser_name=browser_name, headless=headless, profile=profile)
+    try:
+        yield driver
+        if profile:
+            blocked = BrowserProfiles.blocked_requests(driver)
+            request.node.user_properties.append(("blocked_requests", blocked))
+            if blocked:
+                print(f"[Profile] {profile} blocked {len(blocked)} requests:")
+                for url in blocked:
+                    print(f"  {url}")
+    finally:
+        DriverFactory.release(driver)  # also when the test failed, or the lease is lost to the pool
+
+
+@pytest.fixture(scope="session")
+def api_seeder(site):
+    """Backend API client for test setup; DEMOBLAZE_API_URL points it at a stub or the live API."""
+    from utilities.api_seeder import ApiSeeder
+    seeder = ApiSeeder()
+    yield seeder
+    seeder.close()
+
+
+@pytest.fixture
+def seeded_cart(request, logged_in_driver, api_seeder):
+    """Fill the browser user's cart over the API; `@pytest.mark.cart_items(n)` sets how many."""
+    marker = request.node.get_closest_marker("cart_items")
+    count = marker.args[0] if marker else 1
+
+    token = logged_in_driver.get_cookie("tokenp_")
+    guest = logged_in_driver.get_cookie("user")
+    if token:
+        cookie, logged_in = token["value"], True
+    elif guest:
+        cookie, logged_in = guest["value"], False
+    else:
+        pytest.skip("[Setup] No demoblaze session cookie to seed a cart for")
+
+    item_ids = api_seeder.add_to_cart(cookie, prod_id=1, count=count, logged_in=logged_in)
+    yield item_ids
+
+    try:
+        api_seeder.cleanup()
+    except Exception as e:
+        print(f"[Setup] Could not remove seeded cart items: {e}")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if config.getoption("--collection-timing") and _collection["seconds"] is not None:
+        modules = _collection["modules"]
+        terminalreporter.section("collection")
+        terminalreporter.write_line(f"{_collection['seconds']:.2f}s collecting {len(modules)} modules")
+        for nodeid, seconds in sorted(modules.items(), key=lambda m: -m[1])[:10]:
+            terminalreporter.write_line(f"{seconds * 1000:8.1f} ms  {nodeid}")
+        heavy = [name for name in ("selenium.webdriver", "requests", "psutil") if name in sys.modules]
+        terminalreporter.write_line(f"heavy imports loaded: {', '.join(heavy) or 'none'}")
+
+    resolver = _loaded("drivers.driver_resolver", "DriverResolver")
+    if resolver is not None and resolver.timings:
+        terminalreporter.section("driver resolution")
+        for browser_name, seconds, source in resolver.timings:
+            terminalreporter.write_line(f"{browser_name:<8} {source:<9} {seconds * 1000:8.1f} ms")
+
+    factory = _loaded("drivers.driver_factory", "DriverFactory")
+    proxy = factory._proxy if factory is not None else None
+    if proxy:
+        stats = proxy.stats()
+        terminalreporter.section(f"caching proxy ({proxy.mode})")
+        terminalreporter.write_line(
+            f"http GET/HEAD hit rate {stats['hit_rate']:.0%}: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['bytes_saved'] / 1024:.0f} KiB saved; {stats['uncached']} other requests passed through"
+        )
+        if stats["tunneled"]:
+            terminalreporter.write_line(
+                f"{stats['tunneled']} HTTPS connections tunneled uncached: "
+                f"third-party https resources of the local pages are not cached"
+            )
+
+    grid = factory._grid if factory is not None else None
+    if grid:
+        terminalreporter.section("selenium grid")
+        for hub, stats in grid.stats().items():
+            start = f"{stats['avg_start_s']:.1f}s avg start" if stats["avg_start_s"] is not None else "unused"
+            terminalreporter.write_line(f"{hub}: {stats['sessions']} sessions, {start}")
+
+    if _schedule["summary"]:
+        terminalreporter.section("schedule")
+        terminalreporter.write_line(_schedule["summary"])
+
+    if _slowest_commands:
+        terminalreporter.section("slowest webdriver commands")
+        for entry in sorted(_slowest_commands, key=lambda e: -e["ms"])[:15]:
+            locator = f" [{entry['locator']}]" if entry["locator"] else ""
+            terminalreporter.write_line(
+                f"{entry['ms']:9.1f} ms  {entry['command']}{locator} ({entry['outcome']})  {entry['test']}"
+            )
+
+    if _peak_memory:
+        terminalreporter.section("peak browser memory")
+        for nodeid, mb in sorted(_peak_memory.items(), key=lambda e: -e[1])[:10]:
+            terminalreporter.write_line(f"{mb:8.0f} MB  {nodeid}")
+        terminalreporter.write_line(f"max {max(_peak_memory.values()):.0f} MB per worker "
+                                    f"(limit per browser: DRIVER_MAX_RSS_MB={os.getenv('DRIVER_MAX_RSS_MB', '1500')})")
+
+    page = _loaded("pages.base_page", "BasePage")
+    stats = page.cache_stats() if page is not None else {"hits": 0, "misses": 0}
+    if stats["hits"] or stats["misses"]:
+        terminalreporter.section("page element cache")
+        terminalreporter.write_line(
+            f"{stats['hits']} hits (round trips saved), {stats['misses']} misses, "
+            f"{stats['invalidations']} invalidations"
+        )
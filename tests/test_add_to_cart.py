@@ -6,37 +6,42 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from pages.product_page import ProductPage
 from pages.login_page import LoginPage
+from utilities.config import Config
+from utilities.js_utils import JSUtils
+from utilities.screenshot_utils import ScreenshotUtils
+from utilities.wait_utils import WaitUtils
 
-@pytest.mark.order(3)
 def test_add_to_cart_advanced(logged_in_driver):
     driver = logged_in_driver
     wait = WebDriverWait(driver, 10)
     actions = ActionChains(driver)
 
     print("\n=== Starting Add to Cart Test (Advanced) ===")
-    driver.get("https://www.demoblaze.com")
+    # Each navigation returns once the product grid is rendered, not when every image has loaded
+    product_page = ProductPage(driver)
+    product_page.open(Config.demoblaze_url())
     driver.set_window_size(1366, 768)  # New: Set browser window size
-    time.sleep(1)
 
     # 🔹 FEATURE 1: Navigation commands
-    driver.refresh()
+    product_page.refresh()
     print("[Navigation] Page refreshed")
-    driver.get("https://www.demoblaze.com")
-    driver.back()
+    product_page.open(Config.demoblaze_url())
+    product_page.back()
     print("[Navigation] Back navigation")
-    driver.forward()
+    product_page.forward()
     print("[Navigation] Forward navigation")
-    time.sleep(1)
 
     # 🔹 FEATURE 2: List first 5 products using multiple_elements
     print("[Feature] Loading products...")
-    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#tbodyid .hrefch")))
-    items = driver.find_elements(By.CSS_SELECTOR, "#tbodyid .hrefch")
+    items = JSUtils.extract_rows(
+        driver, (By.ID, "tbodyid"), row_selector=".hrefch",
+        columns={"text": "", "displayed": ("", "displayed"), "enabled": ("", "enabled")},
+        min_rows=1, timeout=10,
+    )
     for i, item in enumerate(items[:5], start=1):
-        print(f"  Product {i}: {item.text} | Displayed: {item.is_displayed()} | Enabled: {item.is_enabled()}")
+        print(f"  Product {i}: {item['text']} | Displayed: {item['displayed']} | Enabled: {item['enabled']}")
 
     # 🔹 FEATURE 3: Open first product and use javascript_executor_demo for scrolling
-    product_page = ProductPage(driver)
     product_page.open_product()
     driver.execute_script("window.scrollBy(0, 400);")
     print("[JS Executor] Scrolled 400px using JS")
@@ -82,7 +87,7 @@ def test_add_to_cart_advanced(logged_in_driver):
 
     # 🔹 FEATURE 9: Window handling demo
     main_window = driver.current_window_handle
-    driver.execute_script("window.open('https://www.demoblaze.com/about.html','_blank');")
+    driver.execute_script("window.open(arguments[0],'_blank');", Config.demoblaze_url("/about.html"))
     time.sleep(1)
     for win in driver.window_handles:
         if win != main_window:
@@ -96,15 +101,15 @@ def test_add_to_cart_advanced(logged_in_driver):
     print("[Window Handling] Back to main window")
 
     # 🔹 FEATURE 10: Screenshot demo
-    driver.save_screenshot("cart_page_screenshot.png")
-    print("[Screenshot] Captured screenshot of main page")
+    path = ScreenshotUtils.take_screenshot(driver, "cart_page")
+    print(f"[Screenshot] Captured screenshot of main page: {path}")
 
     # 🔹 FEATURE 11: Scroll demo
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
     print("[Scroll Demo] Scrolled to bottom of page")
 
     # 🔹 FEATURE 12: Go to Cart page
-    cart_link = wait.until(EC.element_to_be_clickable((By.ID, "cartur")))
+    cart_link = WaitUtils.wait_for_element_clickable(driver, (By.ID, "cartur"), timeout=10)
     cart_link.click()
     print("[Feature] Navigated to Cart page")
 
@@ -0,0 +1,67 @@
+import json
+import os
+import zipfile
+from utilities.allure_results import AllureResults
+
+
+def write(directory, name, content):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content if isinstance(content, str) else json.dumps(content))
+    return path
+
+
+def result_with(source):
+    return {"name": "test", "status": "passed", "attachments": [{"name": "stdout", "source": source}],
+            "steps": [{"name": "step", "attachments": [{"name": "log", "source": source}]}]}
+
+
+def test_dedupe_keeps_one_copy_and_repoints_results(tmp_path):
+    results = str(tmp_path)
+    write(results, "a-attachment.txt", "same log")
+    write(results, "b-attachment.txt", "same log")
+    write(results, "c-attachment.txt", "other log")
+    write(results, "1-result.json", result_with("a-attachment.txt"))
+    write(results, "2-result.json", result_with("b-attachment.txt"))
+
+    removed = AllureResults(results).dedupe()
+
+    attachments = sorted(n for n in os.listdir(results) if "-attachment" in n)
+    assert removed == len("same log")
+    assert len(attachments) == 2
+    for name in ("1-result.json", "2-result.json"):
+        with open(os.path.join(results, name), encoding="utf-8") as f:
+            document = json.load(f)
+        sources = {document["attachments"][0]["source"], document["steps"][0]["attachments"][0]["source"]}
+        assert len(sources) == 1 and sources <= set(attachments)
+
+
+def test_merge_moves_worker_directories(tmp_path):
+    target, gw0, gw1 = str(tmp_path / "results"), str(tmp_path / "gw0"), str(tmp_path / "gw1")
+    write(gw0, "1-result.json", result_with("x-attachment.txt"))
+    write(gw0, "x-attachment.txt", "log")
+    write(gw1, "2-result.json", result_with("x-attachment.txt"))
+    write(gw1, "x-attachment.txt", "log")
+
+    moved = AllureResults(target).merge([gw0, gw1])
+
+    assert moved == 3
+    assert sorted(os.listdir(target)) == ["1-result.json", "2-result.json", "x-attachment.txt"]
+    assert not os.path.exists(gw0) and not os.path.exists(gw1)
+
+
+def test_rotate_archives_previous_runs_and_keeps_history(tmp_path):
+    results, archive_dir = str(tmp_path / "results"), str(tmp_path / "archive")
+    write(os.path.join(results, "history"), "history-trend.json", "[]")
+
+    archives = []
+    for run in range(4):
+        write(results, f"{run}-result.json", result_with("x-attachment.txt"))
+        archives.append(AllureResults(results).rotate(archive_dir, keep=2))
+
+    assert os.listdir(results) == ["history"]
+    assert sorted(os.listdir(archive_dir)) == sorted(os.path.basename(a) for a in archives[-2:])
+    with zipfile.ZipFile(archives[-1]) as zf:
+        assert zf.namelist() == ["3-result.json"]
+    assert AllureResults(results).rotate(archive_dir, keep=2) is None
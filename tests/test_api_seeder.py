@@ -0,0 +1,55 @@
+import pytest
+from utilities.api_seeder import ApiSeeder
+from utilities.stub_backend import StubBackend
+
+
+@pytest.fixture(scope="module")
+def stub_api():
+    with StubBackend() as backend:
+        yield backend
+
+
+@pytest.fixture
+def seeder(stub_api):
+    seeder = ApiSeeder(api_url=stub_api.url)
+    yield seeder
+    seeder.close()
+
+
+def test_signup_and_login_return_a_token(seeder):
+    username = ApiSeeder.unique_username()
+    assert seeder.signup(username, "secret123")
+    assert not seeder.signup(username, "secret123"), "second signup should report an existing user"
+
+    token = seeder.login(username, "secret123")
+    assert token
+    with pytest.raises(RuntimeError):
+        seeder.login(username, "wrong")
+
+
+def test_prefills_and_cleans_up_cart(seeder, stub_api):
+    username = ApiSeeder.unique_username()
+    seeder.signup(username, "secret123")
+    token = seeder.login(username, "secret123")
+
+    item_ids = seeder.add_to_cart(token, prod_id=1, count=3)
+    cart = seeder.view_cart(token)
+    assert sorted(item["id"] for item in cart) == sorted(item_ids)
+    assert {item["prod_id"] for item in cart} == {1}
+
+    seeder.cleanup()
+    assert seeder.view_cart(token) == []
+
+
+def test_guest_cart_is_separate_from_user_cart(seeder):
+    guest = "guest-cookie-1"
+    seeder.add_to_cart(guest, prod_id=2, count=2, logged_in=False)
+    assert len(seeder.view_cart(guest, logged_in=False)) == 2
+
+    seeder.clear_cart(guest, logged_in=False)
+    assert seeder.view_cart(guest, logged_in=False) == []
+
+
+def test_products_come_from_the_catalog(seeder):
+    titles = [p["title"] for p in seeder.products()]
+    assert "Samsung galaxy s6" in titles
@@ -0,0 +1,107 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utilities.js_utils import JSUtils
+from utilities.wait_utils import WaitUtils
+
+USERNAME = (By.ID, "loginusername")
+PASSWORD = (By.ID, "loginpassword")
+
+
+class FakeElement:
+    def __init__(self, name, stale=False):
+        self.name = name
+        self.stale = stale
+        self.typed = []
+        self.clicks = 0
+
+    def _check(self):
+        if self.stale:
+            raise StaleElementReferenceException(self.name)
+
+    def click(self):
+        self._check()
+        self.clicks += 1
+
+    def clear(self):
+        self._check()
+        self.typed = []
+
+    def send_keys(self, text):
+        self._check()
+        self.typed.append(text)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.navigations = []
+
+    def refresh(self):
+        self.navigations.append("refresh")
+
+
+@pytest.fixture
+def page(monkeypatch):
+    """A BasePage whose waits hand out elements from `page.found` (locator -> [elements])."""
+    monkeypatch.setattr(BasePage, "_stats", {"hits": 0, "misses": 0, "invalidations": 0})  # keep the run's totals real
+    page = BasePage(FakeDriver())
+    page.found = {}
+    page.lookups = []
+
+    def wait(driver, locator, timeout=15):
+        page.lookups.append(locator)
+        return page.found[locator].pop(0)
+
+    monkeypatch.setattr(WaitUtils, "wait_for_element_visible", staticmethod(wait))
+    monkeypatch.setattr(WaitUtils, "wait_for_element_clickable", staticmethod(wait))
+    monkeypatch.setattr(JSUtils, "mark_navigation", staticmethod(lambda driver: "token"))
+    monkeypatch.setattr(BasePage, "wait_until_ready", lambda self, token=None, timeout=15: None)
+    return page
+
+
+def test_elements_are_cached_until_navigation(page):
+    first, second = FakeElement("first"), FakeElement("second")
+    page.found[USERNAME] = [first, second]
+
+    assert page.element(USERNAME) is page.element(USERNAME) is first
+    assert (page.hits, page.misses) == (1, 1)
+
+    page.refresh()
+    assert page.element(USERNAME) is second
+    assert page.driver.navigations == ["refresh"] and page.lookups == [USERNAME, USERNAME]
+
+
+def test_stale_element_is_looked_up_again_once(page):
+    stale, fresh = FakeElement("stale", stale=True), FakeElement("fresh")
+    page.found[USERNAME] = [stale, fresh]
+
+    page.click(USERNAME)
+    assert fresh.clicks == 1 and page.lookups == [USERNAME, USERNAME]
+
+    page.found[PASSWORD] = [FakeElement("a", stale=True), FakeElement("b", stale=True)]
+    with pytest.raises(StaleElementReferenceException):
+        page.enter_text(PASSWORD, "secret")
+
+
+def test_fill_form_batches_in_js_and_types_the_rest(page, monkeypatch):
+    batches = []
+    # The script could not reach the first field of its batch
+    monkeypatch.setattr(JSUtils, "fill_fields", staticmethod(lambda driver, fields: batches.append(fields) or [0]))
+    username, password = FakeElement("username"), FakeElement("password")
+    page.found = {USERNAME: [username], PASSWORD: [password]}
+
+    page.fill_form({USERNAME: "Ramya Hunagund", PASSWORD: "ramya123"})
+
+    assert batches == [[(USERNAME, "Ramya Hunagund"), (PASSWORD, "ramya123")]]
+    assert username.typed == ["Ramya Hunagund"] and password.typed == []
+
+
+def test_fill_form_with_keystrokes_skips_the_script(page, monkeypatch):
+    monkeypatch.setattr(JSUtils, "fill_fields", staticmethod(lambda driver, fields: pytest.fail("no JS expected")))
+    username, password = FakeElement("username"), FakeElement("password")
+    page.found = {USERNAME: [username], PASSWORD: [password]}
+
+    page.fill_form({USERNAME: "Ramya Hunagund", PASSWORD: "ramya123"}, keystrokes=True)
+
+    assert username.typed == ["Ramya Hunagund"] and password.typed == ["ramya123"]
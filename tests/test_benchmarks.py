@@ -0,0 +1,37 @@
+import json
+from benchmarks import bench
+
+
+def result(**medians):
+    return {"results": {name: bench.summarize([ms, ms, ms]) for name, ms in medians.items()}}
+
+
+def test_summarize_reports_order_statistics():
+    stats = bench.summarize([30.0, 10.0, 20.0, 40.0])
+    assert stats["runs"] == 4
+    assert stats["min_ms"] == 10.0 and stats["max_ms"] == 40.0
+    assert stats["median_ms"] == 25.0
+    assert stats["p95_ms"] == 40.0
+    assert stats["samples_ms"] == [30.0, 10.0, 20.0, 40.0]
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise_floor():
+    baseline = result(login_flow=100.0, screenshot=2.0, cart_read=200.0, checkout=300.0)
+    current = result(login_flow=130.0, screenshot=4.0, cart_read=100.0, add_to_cart=50.0)
+
+    status = {row[0]: row[4] for row in bench.compare(baseline, current, threshold=0.2, min_ms=5.0)}
+
+    assert status == {"login_flow": "regression", "screenshot": "ok", "cart_read": "improved",
+                      "checkout": "missing", "add_to_cart": "new"}
+
+
+def test_compare_command_exit_code(tmp_path, capsys):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(result(login_flow=100.0)))
+
+    current.write_text(json.dumps(result(login_flow=110.0)))
+    assert bench.main(["compare", str(baseline), str(current), "--threshold", "0.2"]) == 0
+
+    current.write_text(json.dumps(result(login_flow=150.0)))
+    assert bench.main(["compare", str(baseline), str(current), "--threshold", "0.2"]) == 1
+    assert "login_flow" in capsys.readouterr().out
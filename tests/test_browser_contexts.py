@@ -0,0 +1,146 @@
+import itertools
+import os
+import threading
+import time
+import pytest
+from drivers.browser_contexts import BrowserContexts, _ContextMixin
+
+
+class FakeBrowser:
+    """The shared browser: just enough of the CDP Target domain."""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.targets = {"default-tab": None}  # targetId -> browserContextId
+        self.contexts = set()
+        self.capabilities = {"goog:chromeOptions": {"debuggerAddress": "localhost:9222"}}
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Target.createBrowserContext":
+            context_id = f"ctx-{next(self.ids)}"
+            self.contexts.add(context_id)
+            return {"browserContextId": context_id}
+        if cmd == "Target.createTarget":
+            target_id = f"tab-{next(self.ids)}"
+            self.targets[target_id] = params["browserContextId"]
+            return {"targetId": target_id}
+        if cmd == "Target.disposeBrowserContext":
+            self.contexts.discard(params["browserContextId"])
+            self.targets = {t: c for t, c in self.targets.items() if c != params["browserContextId"]}
+            return {}
+        if cmd == "Target.getTargets":
+            return {"targetInfos": [{"targetId": t, "browserContextId": c, "type": "page"}
+                                    for t, c in self.targets.items()]}
+        raise AssertionError(cmd)
+
+
+class FakeSessionBase:
+    def __init__(self, browser, page_load_strategy="normal"):
+        self.browser = browser
+        self.attached_with = page_load_strategy
+        self.current = None
+        self.switch_to = self
+        self.scripts = []
+
+    def window(self, handle):
+        self.current = handle
+
+    @property
+    def window_handles(self):
+        return list(self.browser.targets)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+class FakeSession(_ContextMixin, FakeSessionBase):
+    pass
+
+
+def make_contexts(monkeypatch, directory, browser=None):
+    """BrowserContexts on a fake browser; `attached` records (address, shared) of every attach."""
+    browser = browser or FakeBrowser()
+    launched, attached = [], []
+
+    def launch(**kwargs):
+        launched.append(kwargs)
+        return browser
+
+    def attach(key, address, strategy, shared=False):
+        attached.append((address, shared))
+        return browser if shared else FakeSession(browser, strategy)
+
+    contexts = BrowserContexts(launch, directory=str(directory))
+    monkeypatch.setattr(contexts, "_attach", attach)
+    contexts.browser, contexts.launched, contexts.attached = browser, launched, attached
+    return contexts
+
+
+@pytest.fixture
+def contexts(monkeypatch, tmp_path):
+    monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+    return make_contexts(monkeypatch, tmp_path)
+
+
+def test_each_lease_gets_its_own_context_in_one_browser(contexts):
+    first = contexts.acquire("chrome", headless=True)
+    second = contexts.acquire("chrome", headless=True)
+
+    assert len(contexts.launched) == 1
+    assert first.context_id != second.context_id
+    assert first.current in first.window_handles
+    assert first.window_handles != second.window_handles
+    assert "default-tab" not in first.window_handles
+
+
+def test_release_disposes_the_context_and_reuses_the_session(contexts):
+    driver = contexts.acquire("chrome")
+    old_context = driver.context_id
+    contexts.release(driver)
+
+    assert old_context not in contexts.browser.contexts
+    again = contexts.acquire("chrome")
+    assert again is driver
+    assert again.context_id != old_context and again.context_id in contexts.browser.contexts
+
+
+def test_only_chromium_browsers_are_supported():
+    assert BrowserContexts.supports("Chrome") and BrowserContexts.supports("edge")
+    assert not BrowserContexts.supports("firefox")
+
+
+def test_page_load_strategy_is_passed_through_and_kept_apart(contexts, monkeypatch):
+    monkeypatch.setenv("PAGE_LOAD_STRATEGY", "none")
+    eager = contexts.acquire("chrome", page_load_strategy="eager")
+    default = contexts.acquire("chrome")
+    contexts.release(eager)
+
+    assert (eager.attached_with, default.attached_with) == ("eager", "none")  # env only as the fallback
+    assert contexts.acquire("chrome") is not eager
+    assert contexts.acquire("chrome", page_load_strategy="EAGER") is eager
+
+
+def test_xdist_workers_share_the_browser_of_the_first(monkeypatch, tmp_path):
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run-1")
+    first = make_contexts(monkeypatch, tmp_path)
+    first.acquire("chrome", headless=True)
+    second = make_contexts(monkeypatch, tmp_path, browser=first.browser)
+    second.acquire("chrome", headless=True)
+
+    assert len(first.launched) == 1 and second.launched == []
+    assert second.attached[0] == ("localhost:9222", True)
+
+    # Another worker still uses the browser: the one that launched it waits for it to leave
+    path = first._shared[("chrome", True, None)]
+    other = os.path.join(path + ".users", str(os.getppid()))
+    open(other, "w").close()
+    threading.Timer(0.3, os.remove, [other]).start()
+    started = time.time()
+    first.shutdown()
+
+    assert first.browser.quit_called and time.time() - started >= 0.3
+    assert not os.path.exists(path + ".json")
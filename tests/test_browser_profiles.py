@@ -0,0 +1,49 @@
+import json
+import pytest
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from drivers.browser_profiles import BrowserProfiles
+
+
+class FakePerformanceLog:
+    def __init__(self, events):
+        self.events = events
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        return [{"message": json.dumps({"message": {"method": m, "params": p}})} for m, p in self.events]
+
+
+def test_minimal_profile_blocks_every_group():
+    patterns = BrowserProfiles.url_patterns("minimal")
+    assert "*doubleclick.net*" in patterns
+    assert "*.woff2" in patterns
+    assert "*.png" in patterns
+    assert "*.png" not in BrowserProfiles.url_patterns("no-ads")
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        BrowserProfiles.url_patterns("turbo")
+
+
+def test_profile_options_per_browser():
+    chrome = ChromeOptions()
+    BrowserProfiles.apply_options(chrome, "chrome", "no-images")
+    assert chrome.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    assert chrome.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+
+    firefox = FirefoxOptions()
+    BrowserProfiles.apply_options(firefox, "firefox", "minimal")
+    assert firefox.preferences["permissions.default.image"] == 2
+    assert firefox.preferences["gfx.downloadable_fonts.enabled"] is False
+
+
+def test_blocked_requests_are_read_from_the_performance_log():
+    driver = FakePerformanceLog([
+        ("Network.requestWillBeSent", {"requestId": "1", "request": {"url": "https://ads.example/ad.js"}}),
+        ("Network.requestWillBeSent", {"requestId": "2", "request": {"url": "https://demoqa.com/app.js"}}),
+        ("Network.loadingFailed", {"requestId": "1", "blockedReason": "inspector"}),
+        ("Network.loadingFailed", {"requestId": "2", "errorText": "net::ERR_ABORTED"}),
+    ])
+    assert BrowserProfiles.blocked_requests(driver) == ["https://ads.example/ad.js"]
@@ -0,0 +1,119 @@
+import http.client
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utilities.caching_proxy import CachingProxy
+
+
+# --------------------------- Local origin server ---------------------------
+class OriginHandler(BaseHTTPRequestHandler):
+    hits = {}
+
+    def _respond(self, body, status=200):
+        OriginHandler.hits[(self.command, self.path)] = OriginHandler.hits.get((self.command, self.path), 0) + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/missing":
+            return self._respond(b"not found", status=404)
+        self._respond(f"page {self.path}".encode())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._respond(b"echo " + self.rfile.read(length))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def reset_hits():
+    OriginHandler.hits.clear()
+
+
+def fetch(proxy, method, url, body=None):
+    # Talk to the proxy directly so NO_PROXY settings for localhost don't get in the way
+    host, port = proxy.address.split(":")
+    connection = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        connection.request(method, url, body=body)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+# --------------------------- Tests ---------------------------
+def test_record_mode_fetches_once_then_serves_from_cache(origin, tmp_path):
+    with CachingProxy(str(tmp_path), mode="record") as proxy:
+        first = fetch(proxy, "GET", f"{origin}/index.html")
+        second = fetch(proxy, "GET", f"{origin}/index.html")
+        stats = proxy.stats()
+
+    assert first == second == (200, b"page /index.html")
+    assert OriginHandler.hits[("GET", "/index.html")] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["bytes_saved"] == len(b"page /index.html")
+
+
+def test_only_successful_gets_are_cached(origin, tmp_path):
+    with CachingProxy(str(tmp_path), mode="record") as proxy:
+        assert fetch(proxy, "POST", f"{origin}/api", b"a") == (200, b"echo a")
+        assert fetch(proxy, "POST", f"{origin}/api", b"a") == (200, b"echo a")
+        assert fetch(proxy, "GET", f"{origin}/missing")[0] == 404
+        assert fetch(proxy, "GET", f"{origin}/missing")[0] == 404
+        stats = proxy.stats()
+
+    assert OriginHandler.hits[("POST", "/api")] == 2
+    assert OriginHandler.hits[("GET", "/missing")] == 2
+    assert stats["hits"] == stats["misses"] == 0 and stats["uncached"] == 4
+
+    with CachingProxy(str(tmp_path), mode="replay") as proxy:
+        assert fetch(proxy, "POST", f"{origin}/api", b"a")[0] == 504
+
+
+def test_replay_serves_recordings_without_touching_the_network(origin, tmp_path):
+    with CachingProxy(str(tmp_path), mode="record") as proxy:
+        fetch(proxy, "GET", f"{origin}/cart.html")
+    OriginHandler.hits.clear()
+
+    with CachingProxy(str(tmp_path), mode="replay") as proxy:
+        assert fetch(proxy, "GET", f"{origin}/cart.html") == (200, b"page /cart.html")
+        status, _ = fetch(proxy, "GET", f"{origin}/never-recorded")
+        stats = proxy.stats()
+
+    assert status == 504
+    assert not OriginHandler.hits
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_driver_factory_only_proxies_the_local_target(tmp_path, monkeypatch):
+    from drivers.driver_factory import DriverFactory
+    monkeypatch.setenv("CACHING_PROXY", "record")
+    monkeypatch.setenv("CACHING_PROXY_DIR", str(tmp_path))
+    monkeypatch.setattr(DriverFactory, "_proxy", None)
+
+    monkeypatch.setenv("TEST_TARGET", "live")  # https only: everything would be tunneled uncached
+    assert DriverFactory.caching_proxy() is None
+
+    monkeypatch.setattr(DriverFactory, "_proxy", None)
+    monkeypatch.setenv("TEST_TARGET", "local")
+    proxy = DriverFactory.caching_proxy()
+    try:
+        assert proxy is not None and proxy is DriverFactory.caching_proxy()
+    finally:
+        proxy.stop()
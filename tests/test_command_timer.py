@@ -0,0 +1,70 @@
+import time
+import pytest
+from utilities.command_timer import CommandTimer, percentile
+
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        time.sleep(0.002)
+        if driver_command == "findElement" and params["value"] == "missing":
+            raise LookupError("no such element")
+        return {"value": None}
+
+
+@pytest.fixture
+def timer():
+    was_enabled = CommandTimer.enabled
+    CommandTimer.enable()
+    CommandTimer.begin()
+    yield CommandTimer
+    CommandTimer.enable(was_enabled)
+
+
+def test_records_commands_with_locator_and_outcome(timer):
+    driver = timer.instrument(FakeDriver())
+    for _ in range(4):
+        driver.execute("findElement", {"using": "id", "value": "login2"})
+    with pytest.raises(LookupError):
+        driver.execute("findElement", {"using": "id", "value": "missing"})
+    driver.execute("executeScript", {"script": "return 1;", "args": []})
+
+    summary = timer.end("test_x")
+
+    assert summary["commands"] == 6
+    finds = summary["by_command"]["findElement"]
+    assert finds["count"] == 5 and finds["errors"] == 1
+    assert finds["p50_ms"] <= finds["p95_ms"] <= finds["max_ms"]
+    assert {"command", "locator", "ms", "outcome", "test"} <= set(summary["slowest"][0])
+    assert any(e["locator"] == "id=missing" and e["outcome"] == "LookupError" for e in summary["slowest"])
+
+
+def test_wait_time_is_kept_apart_from_active_commands(timer):
+    driver = timer.instrument(FakeDriver())
+    driver.execute("getTitle")
+
+    @CommandTimer.timed_wait
+    def wait():
+        with CommandTimer.waiting():  # nested waits are counted once
+            driver.execute("executeScript")
+            time.sleep(0.02)
+
+    wait()
+    summary = timer.end("test_y")
+
+    assert summary["wait_ms"] >= 20
+    assert summary["command_ms"] < summary["wait_ms"]
+
+
+def test_instrumenting_twice_does_not_double_count(timer):
+    driver = timer.instrument(timer.instrument(FakeDriver()))
+    driver.execute("getTitle")
+    assert timer.end("test_z")["commands"] == 1
+
+
+def test_percentile_is_nearest_rank():
+    samples = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]
+
+    assert percentile(samples, 50) == 30.0  # rank ceil(3.0) = 3
+    assert percentile(samples, 95) == 60.0
+    assert percentile(samples, 0) == 10.0
+    assert percentile([7.0], 95) == 7.0
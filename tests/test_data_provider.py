@@ -0,0 +1,66 @@
+import os
+import pytest
+from utilities.data_provider import CsvDataSet, DataError
+
+SCHEMA = {"name": r".+", "card": r"\d{12,19}", "year": r"\d{4}"}
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def orders(tmp_path):
+    write(tmp_path / "orders.csv",
+          'name,card,year\n'
+          'Ramya,297968355916,2027\n'
+          '"Hunagund, R",411111111111,2028\n'
+          '"Multi\nline",555555555555,2029\n'
+          'Varshi,422222222222,2030\n')
+    return CsvDataSet("orders.csv", schema=SCHEMA, directory=str(tmp_path))
+
+
+def test_rows_are_indexed_at_collection_and_read_on_demand(orders):
+    params = orders.params()
+
+    assert [p.id for p in params] == ["orders-1", "orders-2", "orders-3", "orders-4"]
+    assert CsvDataSet._cache[orders.path]["rows"] == {}  # nothing parsed yet
+    assert params[1].values[0].name == "Hunagund, R"
+    assert params[2].values[0]["name"] == "Multi\nline"
+    assert params[3].values[0].values("name", "year") == ("Varshi", "2030")
+    assert sorted(CsvDataSet._cache[orders.path]["rows"]) == [1, 2, 3]
+
+
+def test_cache_is_dropped_when_the_file_changes(orders, tmp_path):
+    assert len(orders) == 4
+    write(tmp_path / "orders.csv", "name,card,year\nOnly,297968355916,2027\n")
+    os.utime(orders.path, ns=(0, 1))  # a new mtime even on coarse clocks
+
+    assert len(orders) == 1
+    assert orders.row(0)["name"] == "Only"
+
+
+def test_schema_is_checked(tmp_path):
+    write(tmp_path / "bad.csv", "name,card,year\nRamya,not-a-card,2027\n")
+    with pytest.raises(DataError, match="row 1: card='not-a-card'"):
+        CsvDataSet("bad.csv", schema=SCHEMA, directory=str(tmp_path)).validate()
+
+    write(tmp_path / "columns.csv", "name,card\nRamya,297968355916\n")
+    with pytest.raises(DataError, match="missing column"):
+        len(CsvDataSet("columns.csv", schema=SCHEMA, directory=str(tmp_path)))
+
+
+def test_repo_data_files_match_their_schemas():
+    for name in ("login_data.csv", "signup_data.csv", "order_data.csv"):
+        assert CsvDataSet(name).validate() >= 1
+
+
+def test_a_known_row_count_needs_no_file_access(tmp_path):
+    dataset = CsvDataSet("later.csv", schema=SCHEMA, directory=str(tmp_path))
+
+    params = dataset.params(count=2)  # e.g. from the pytest cache
+
+    assert [p.id for p in params] == ["later-1", "later-2"]
+    with pytest.raises(DataError, match="not found"):
+        params[0].values[0].name
@@ -13,17 +13,22 @@ Extras:
 - Right click on elements
 """
 
+import os
 import pytest
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.action_chains import ActionChains
-from drivers.driver_factory import DriverFactory
+from utilities.config import Config
+from utilities.wait_utils import WaitUtils
 from selenium.webdriver.common.keys import Keys
 
+# Ads, trackers, images and fonts are blocked before they load (see BrowserProfiles)
+pytestmark = pytest.mark.browser_profile("minimal")
+
 # -----------------------------
 # Helper: remove floating ads
+# (still needed where the browser can't block by URL, e.g. Firefox)
 # -----------------------------
 def remove_ads(driver):
     driver.execute_script("""
@@ -42,185 +47,122 @@ def right_click_demo(driver, element):
     print(f"→ Right-click performed on element: {element.tag_name}")
     time.sleep(1)
 
-# ======================================================================
-# TEST 5: RADIO BUTTON
-# ======================================================================
-# @pytest.mark.order(5)
-# def test_radio_buttons():
-#     print("\n=== TEST: Radio Button on Chrome ===")
-#     driver = DriverFactory.get_driver(browser_name="chrome", headless=False)
-#     driver.set_window_size(1280, 720)
-#     driver.get("https://demoqa.com/radio-button")
-#     wait = WebDriverWait(driver, 20)
-#     remove_ads(driver)
-#     time.sleep(1)
-#
-#     try:
-#         scroll_to_bottom(driver)
-#         yes_radio = wait.until(EC.visibility_of_element_located((By.XPATH, "//label[@for='yesRadio']")))
-#         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", yes_radio)
-#         driver.execute_script("arguments[0].click();", yes_radio)
-#         result = driver.find_element(By.CLASS_NAME, "text-success").text
-#         assert "Yes" in result
-#         print(f"✅ Selected: {result}")
-#
-#         impressive_radio = wait.until(EC.visibility_of_element_located((By.XPATH, "//label[@for='impressiveRadio']")))
-#         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", impressive_radio)
-#         driver.execute_script("arguments[0].click();", impressive_radio)
-#         result = driver.find_element(By.CLASS_NAME, "text-success").text
-#         assert "Impressive" in result
-#         print(f"✅ Selected: {result}")
-#
-#         no_radio = driver.find_element(By.ID, "noRadio")
-#         assert not no_radio.is_enabled(), "'No' should be disabled"
-#         print("✅ 'No' radio is disabled")
-#
-#         # Right-click demo on impressive radio
-#         right_click_demo(driver, impressive_radio)
-#
-#     finally:
-#         driver.quit()
-
 # ======================================================================
 # TEST 6: CHECKBOX
 # ======================================================================
-@pytest.mark.order(6)
-def test_checkboxes():
+def test_checkboxes(pooled_driver):
     print("\n=== TEST: Checkbox on Chrome ===")
-    driver = DriverFactory.get_driver(browser_name="chrome", headless=False)
+    driver = pooled_driver
     driver.set_window_size(1280, 720)
-    driver.get("https://demoqa.com/checkbox")
-    wait = WebDriverWait(driver, 20)
+    driver.get(Config.demoqa_url("/checkbox"))
     remove_ads(driver)
     time.sleep(1)
 
-    try:
-        scroll_to_bottom(driver)
-        expand = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button[title='Expand all']")))
-        driver.execute_script("arguments[0].click();", expand)
-        time.sleep(1)
-
-        desktop = driver.find_element(By.XPATH, "//label[@for='tree-node-desktop']/span[@class='rct-checkbox']")
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", desktop)
-        driver.execute_script("arguments[0].click();", desktop)
-        time.sleep(1)
-        result = driver.find_element(By.ID, "result").text
-        assert "desktop" in result.lower()
-        print(f"✅ Selected: {result}")
+    scroll_to_bottom(driver)
+    expand = WaitUtils.wait_for_element_clickable(driver, (By.CSS_SELECTOR, "button[title='Expand all']"), timeout=20)
+    driver.execute_script("arguments[0].click();", expand)
+    time.sleep(1)
 
-        documents = driver.find_element(By.XPATH, "//label[@for='tree-node-documents']/span[@class='rct-checkbox']")
-        driver.execute_script("arguments[0].click();", documents)
-        time.sleep(1)
-        result = driver.find_element(By.ID, "result").text
-        print(f"✅ Updated: {result}")
+    desktop = driver.find_element(By.XPATH, "//label[@for='tree-node-desktop']/span[@class='rct-checkbox']")
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", desktop)
+    driver.execute_script("arguments[0].click();", desktop)
+    time.sleep(1)
+    result = driver.find_element(By.ID, "result").text
+    assert "desktop" in result.lower()
+    print(f"✅ Selected: {result}")
 
-        # Right-click demo on documents checkbox
-        right_click_demo(driver, documents)
+    documents = driver.find_element(By.XPATH, "//label[@for='tree-node-documents']/span[@class='rct-checkbox']")
+    driver.execute_script("arguments[0].click();", documents)
+    time.sleep(1)
+    result = driver.find_element(By.ID, "result").text
+    print(f"✅ Updated: {result}")
 
-        driver.execute_script("arguments[0].click();", desktop)  # uncheck
-        time.sleep(1)
-        collapse = driver.find_element(By.CSS_SELECTOR, "button[title='Collapse all']")
-        driver.execute_script("arguments[0].click();", collapse)
-        print("✅ Checkbox Test Completed")
+    # Right-click demo on documents checkbox
+    right_click_demo(driver, documents)
 
-    finally:
-        driver.quit()
+    driver.execute_script("arguments[0].click();", desktop)  # uncheck
+    time.sleep(1)
+    collapse = driver.find_element(By.CSS_SELECTOR, "button[title='Collapse all']")
+    driver.execute_script("arguments[0].click();", collapse)
+    print("✅ Checkbox Test Completed")
 
 # ======================================================================
 # TEST 7: DROPDOWN
 # ======================================================================
-@pytest.mark.order(7)
-def test_dropdowns():
+def test_dropdowns(pooled_driver):
     print("\n=== TEST: Dropdown on Chrome ===")
-    driver = DriverFactory.get_driver(browser_name="chrome", headless=False)
+    driver = pooled_driver
     driver.set_window_size(1280, 720)
-    driver.get("https://demoqa.com/select-menu")
-    wait = WebDriverWait(driver, 20)
+    driver.get(Config.demoqa_url("/select-menu"))
     remove_ads(driver)
     time.sleep(1)
 
-    try:
-        scroll_to_bottom(driver)
-        old_select = wait.until(EC.visibility_of_element_located((By.ID, "oldSelectMenu")))
-        select_obj = Select(old_select)
-        select_obj.select_by_visible_text("Purple")
-        time.sleep(1)
-        print(f"✅ Selected: {select_obj.first_selected_option.text}")
-
-        multi_select = driver.find_element(By.ID, "cars")
-        multi_select_obj = Select(multi_select)
-        if multi_select_obj.is_multiple:
-            multi_select_obj.select_by_visible_text("Volvo")
-            multi_select_obj.select_by_visible_text("Audi")
-            time.sleep(1)
-            selected = [o.text for o in multi_select_obj.all_selected_options]
-            print(f"✅ Multi-selected: {selected}")
-            multi_select_obj.deselect_all()
-            print("✅ Deselected all")
+    scroll_to_bottom(driver)
+    old_select = WaitUtils.wait_for_element_visible(driver, (By.ID, "oldSelectMenu"), timeout=20)
+    select_obj = Select(old_select)
+    select_obj.select_by_visible_text("Purple")
+    time.sleep(1)
+    print(f"✅ Selected: {select_obj.first_selected_option.text}")
 
-        # Right-click demo on old select
-        right_click_demo(driver, old_select)
+    multi_select = driver.find_element(By.ID, "cars")
+    multi_select_obj = Select(multi_select)
+    if multi_select_obj.is_multiple:
+        multi_select_obj.select_by_visible_text("Volvo")
+        multi_select_obj.select_by_visible_text("Audi")
+        time.sleep(1)
+        selected = [o.text for o in multi_select_obj.all_selected_options]
+        print(f"✅ Multi-selected: {selected}")
+        multi_select_obj.deselect_all()
+        print("✅ Deselected all")
 
-    finally:
-        driver.quit()
+    # Right-click demo on old select
+    right_click_demo(driver, old_select)
 
 # ======================================================================
 # TEST 8: FILE UPLOAD
 # ======================================================================
-@pytest.mark.order(8)
-def test_file_upload():
+def test_file_upload(pooled_driver):
     print("\n=== TEST: File Upload on Chrome ===")
-    driver = DriverFactory.get_driver(browser_name="chrome", headless=False)
+    driver = pooled_driver
     driver.set_window_size(1280, 720)
-    driver.get("https://demoqa.com/upload-download")
-    wait = WebDriverWait(driver, 20)
+    driver.get(Config.demoqa_url("/upload-download"))
     remove_ads(driver)
     time.sleep(1)
 
-    try:
-        scroll_to_bottom(driver)
-        test_file = r"C:\Users\Ascendion\Documents\some.txt"
-        upload_input = wait.until(EC.presence_of_element_located((By.ID, "uploadFile")))
-        upload_input.send_keys(test_file)
-        time.sleep(2)
-
-        uploaded_path = driver.find_element(By.ID, "uploadedFilePath").text
-        assert "some.txt" in uploaded_path
-        print(f"✅ File uploaded: {uploaded_path}")
+    scroll_to_bottom(driver)
+    test_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testdata", "upload_demo.txt")
+    upload_input = WaitUtils.wait_for_element_present(driver, (By.ID, "uploadFile"), timeout=20)
+    upload_input.send_keys(test_file)
+    time.sleep(2)
 
-        # Right-click demo on upload input
-        right_click_demo(driver, upload_input)
+    uploaded_path = driver.find_element(By.ID, "uploadedFilePath").text
+    assert "upload_demo.txt" in uploaded_path
+    print(f"✅ File uploaded: {uploaded_path}")
 
-    finally:
-        driver.quit()
+    # Right-click demo on upload input
+    right_click_demo(driver, upload_input)
 
 # ======================================================================
 # TEST 9: DRAG & DROP
 # ======================================================================
-@pytest.mark.order(9)
-def test_drag_drop_demo():
+def test_drag_drop_demo(pooled_driver):
     print("\n=== TEST: Drag and Drop on Chrome ===")
-    driver = DriverFactory.get_driver(browser_name="chrome", headless=False)
+    driver = pooled_driver
     driver.set_window_size(1280, 720)
-    wait = WebDriverWait(driver, 20)
 
-    try:
-        driver.get("https://demoqa.com/droppable")
-        remove_ads(driver)
-        time.sleep(1)
-        scroll_to_bottom(driver)
-
-        actions = ActionChains(driver)
-        source = wait.until(EC.visibility_of_element_located((By.ID, "draggable")))
-        target = wait.until(EC.visibility_of_element_located((By.ID, "droppable")))
-        actions.drag_and_drop(source, target).perform()
-        time.sleep(2)
+    driver.get(Config.demoqa_url("/droppable"))
+    remove_ads(driver)
+    time.sleep(1)
+    scroll_to_bottom(driver)
 
-        target_text = target.text
-        print(f"✅ Target text after drop: {target_text}")
+    actions = ActionChains(driver)
+    source = WaitUtils.wait_for_element_visible(driver, (By.ID, "draggable"), timeout=20)
+    target = WaitUtils.wait_for_element_visible(driver, (By.ID, "droppable"), timeout=20)
+    actions.drag_and_drop(source, target).perform()
+    time.sleep(2)
 
-        # Right-click demo on target
-        right_click_demo(driver, target)
+    target_text = target.text
+    print(f"✅ Target text after drop: {target_text}")
 
-    finally:
-        driver.quit()
+    # Right-click demo on target
+    right_click_demo(driver, target)
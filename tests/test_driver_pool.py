@@ -0,0 +1,106 @@
+import time
+import pytest
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from drivers.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException()
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Just enough of a session for the pool: health probe, reset and quit."""
+
+    def __init__(self, number):
+        self.number = number
+        self.window_handles = ["main", "popup"]
+        self.switch_to = FakeSwitchTo(self)
+        self.cookies = ["session"]
+        self.url = "https://www.demoblaze.com/"
+        self.healthy = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise WebDriverException("session deleted")
+        return 1
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def started():
+    return []
+
+
+def make_pool(started, **kwargs):
+    def factory(browser_name, headless, profile, page_load_strategy):
+        driver = FakeDriver(len(started) + 1)
+        started.append(driver)
+        return driver
+
+    return DriverPool(factory, max_size=1, idle_timeout=60, **kwargs)
+
+
+@pytest.fixture
+def pool(started):
+    return make_pool(started)
+
+
+def test_released_session_is_reset_and_reused(pool, started):
+    driver = pool.acquire("chrome", headless=True)
+    pool.release(driver)
+
+    assert driver.window_handles == ["main"] and driver.cookies == [] and driver.url == "about:blank"
+    assert pool.acquire("Chrome", headless=True) is driver
+    assert len(started) == 1
+
+
+def test_acquire_times_out_when_every_session_is_leased(pool):
+    pool.acquire("chrome", headless=True)
+
+    with pytest.raises(TimeoutError, match="No chrome session became free"):
+        pool.acquire("chrome", headless=True, timeout=0.1)
+    assert pool.acquire("firefox", headless=True) is not None  # other browsers have their own slots
+
+
+def test_unhealthy_and_retired_sessions_are_replaced(started):
+    pool = make_pool(started, retire=lambda driver: "900 MB RSS" if driver.number == 2 else None)
+    first = pool.acquire()
+    pool.release(first)
+    first.healthy = False  # e.g. the browser crashed while idle
+
+    second = pool.acquire()
+    assert second is not first and first.quit_called
+
+    pool.release(second)  # over the limit: quit instead of pooled
+    assert second.quit_called
+    third = pool.acquire()
+    assert third.number == 3
+
+
+def test_idle_sessions_expire(pool, started):
+    driver = pool.acquire("chrome", headless=True)
+    pool.release(driver)
+    pool._idle[pool._key("chrome", True)][0] = (driver, time.time() - 61)
+
+    assert pool.acquire("chrome", headless=True) is not driver
+    assert driver.quit_called and len(started) == 2
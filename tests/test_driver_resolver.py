@@ -0,0 +1,99 @@
+import json
+import subprocess
+import pytest
+from drivers.driver_resolver import DriverResolver
+
+
+@pytest.fixture
+def downloads():
+    return []
+
+
+@pytest.fixture
+def resolver(tmp_path, monkeypatch, downloads):
+    """DriverResolver on an empty cache dir with Chrome 120 installed; downloads are recorded, not made."""
+    monkeypatch.setenv("DRIVER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("DRIVER_OFFLINE", raising=False)
+    monkeypatch.setattr(DriverResolver, "_resolved", {})
+    monkeypatch.setattr(DriverResolver, "timings", [])
+    monkeypatch.setattr(DriverResolver, "browser_version", staticmethod(lambda browser_name: "120"))
+    monkeypatch.setattr(DriverResolver, "driver_version", staticmethod(lambda path: "120"))
+    real_download = DriverResolver._download
+
+    def download(browser_name):
+        if DriverResolver.offline():
+            return real_download(browser_name)
+        downloads.append(browser_name)
+        return driver_file(tmp_path / "wdm" / "chromedriver")
+
+    monkeypatch.setattr(DriverResolver, "_download", staticmethod(download))
+    return DriverResolver
+
+
+def driver_file(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+    return str(path)
+
+
+def index(tmp_path):
+    return json.loads((tmp_path / DriverResolver.INDEX_FILE).read_text())
+
+
+def test_versioned_cache_is_indexed_and_memoized(resolver, tmp_path, downloads):
+    cached = driver_file(tmp_path / "chrome" / "120" / resolver.binary_name("chrome"))
+
+    assert resolver.resolve("chrome") == cached
+    assert resolver.resolve("Chrome") == cached
+    assert [source for _, _, source in resolver.timings] == ["cache", "memory"]
+    assert index(tmp_path) == {"chrome:120": cached}
+
+    resolver._resolved.clear()
+    assert resolver.resolve("chrome") == cached
+    assert resolver.timings[-1][2] == "index"
+    assert not downloads
+
+
+def test_offline_without_a_cached_driver_fails(resolver, monkeypatch):
+    monkeypatch.setenv("DRIVER_OFFLINE", "true")
+
+    with pytest.raises(FileNotFoundError, match="DRIVER_OFFLINE"):
+        resolver.resolve("chrome")
+
+
+def test_unversioned_driver_must_match_the_browser(resolver, tmp_path, monkeypatch, downloads):
+    flat = driver_file(tmp_path / resolver.binary_name("chrome"))
+    monkeypatch.setattr(DriverResolver, "driver_version", staticmethod(lambda path: "119"))
+
+    assert resolver.resolve("chrome") != flat  # stale: downloaded instead
+    assert downloads == ["chrome"]
+
+    resolver._resolved.clear()
+    monkeypatch.setattr(DriverResolver, "driver_version", staticmethod(lambda path: "120"))
+    (tmp_path / DriverResolver.INDEX_FILE).unlink()
+    assert resolver.resolve("chrome") == flat
+
+
+def test_unknown_browser_version_skips_index_and_unchecked_drivers(resolver, tmp_path, monkeypatch, downloads):
+    monkeypatch.setattr(DriverResolver, "browser_version", staticmethod(lambda browser_name: "unknown"))
+    stale = driver_file(tmp_path / "stale" / "chromedriver")
+    (tmp_path / DriverResolver.INDEX_FILE).write_text(json.dumps({"chrome:unknown": stale}))
+    flat = driver_file(tmp_path / resolver.binary_name("chrome"))
+
+    assert resolver.resolve("chrome") not in (stale, flat)
+    assert downloads == ["chrome"]
+    assert index(tmp_path) == {"chrome:unknown": stale}  # untouched
+
+    resolver._resolved.clear()
+    monkeypatch.setenv("DRIVER_OFFLINE", "true")
+    assert resolver.resolve("chrome") == flat  # nothing better without network
+
+
+def test_driver_version_parsing(monkeypatch):
+    outputs = {"chromedriver": "ChromeDriver 120.0.6099.109 (3419140ab665596f21b385ce136419fde0924272)\n",
+               "geckodriver": "geckodriver 0.34.0 (c44f0d09630a 2024-01-02 15:36 +0000)\n", "broken": ""}
+    monkeypatch.setattr("subprocess.run", lambda args, **kwargs: subprocess.CompletedProcess(args, 0, outputs[args[0]]))
+
+    assert DriverResolver.driver_version("chromedriver") == "120"
+    assert DriverResolver.driver_version("geckodriver") == "0.34"
+    assert DriverResolver.driver_version("broken") is None
@@ -0,0 +1,66 @@
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+from drivers.grid_balancer import GridBalancer
+
+
+def status(*nodes):
+    """nodes: (availability, [(browser, busy), ...])"""
+    return {"ready": True, "nodes": [
+        {"availability": availability,
+         "slots": [{"stereotype": {"browserName": browser}, "session": {"id": "s"} if busy else None}
+                   for browser, busy in slots]}
+        for availability, slots in nodes
+    ]}
+
+
+class FakeSession:
+    pass
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    statuses = {
+        "http://a:4444": status(("UP", [("chrome", True), ("chrome", False)])),
+        "http://b:4444": status(("UP", [("chrome", False), ("chrome", False)]), ("DOWN", [("chrome", False)])),
+    }
+    balancer = GridBalancer(list(statuses), wait_timeout=0)
+    balancer.refused, balancer.connected = set(), []
+
+    def connect(hub, options):
+        if hub in balancer.refused:
+            raise SessionNotCreatedException("Could not start a new session")
+        balancer.connected.append(hub)
+        return FakeSession()
+
+    monkeypatch.setattr(balancer, "_fetch_status", lambda hub: statuses[hub])
+    monkeypatch.setattr(balancer, "_connect", connect)
+    return balancer
+
+
+def test_free_slots_count_only_idle_slots_on_nodes_that_are_up():
+    assert GridBalancer.free_slots(status(("UP", [("chrome", True), ("firefox", False)]),
+                                          ("DRAINING", [("chrome", False)]))) == {"firefox": 1}
+
+
+def test_sessions_go_where_there_is_room_and_fast_starts(grid):
+    assert grid.create("chrome", options=None).grid_hub == "http://b:4444"   # 2 free vs 1
+    # b now has one slot left like a, but a has been starting sessions much faster
+    grid._latency.update({"http://a:4444": 0.5, "http://b:4444": 8.0})
+    assert grid.create("chrome", options=None).grid_hub == "http://a:4444"
+    assert grid.stats()["http://a:4444"]["sessions"] == 1
+
+
+def test_a_refusing_hub_is_skipped_and_no_room_anywhere_fails(grid):
+    grid.refused.add("http://b:4444")
+    assert grid.create("chrome", options=None).grid_hub == "http://a:4444"
+
+    with pytest.raises(SessionNotCreatedException, match="No grid hub could start chrome"):
+        grid.create("chrome", options=None)
+    assert grid.connected == ["http://a:4444"]
+
+
+def test_edge_is_matched_to_microsoft_edge_slots(grid, monkeypatch):
+    monkeypatch.setattr(grid, "_fetch_status", lambda hub: status(("UP", [("MicrosoftEdge", False)])))
+
+    assert grid.ranked("edge") == ["http://a:4444", "http://b:4444"]
+    assert grid.create("edge", options=None).grid_hub in grid.hubs
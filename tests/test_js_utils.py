@@ -0,0 +1,63 @@
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from utilities.js_utils import EXTRACT_ROWS_JS, FILL_FIELDS_JS, PAGE_READY_JS, JSUtils
+
+
+class FakeDriver:
+    """Records every script call and answers with the next canned result."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def _run(self, script, args):
+        self.calls.append((script, args))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def execute_script(self, script, *args):
+        return self._run(script, args)
+
+    def execute_async_script(self, script, *args):
+        return self._run(script, args)
+
+
+def test_extract_rows_sends_one_spec_for_the_whole_table():
+    driver = FakeDriver([["Samsung galaxy s6", "360"]], [{"name": "Nexus 6", "shown": True}])
+
+    assert JSUtils.extract_rows(driver, (By.ID, "tbodyid"), columns="td", min_rows=1, timeout=2) == \
+        [["Samsung galaxy s6", "360"]]
+    JSUtils.extract_rows(driver, (By.ID, "tbodyid"), row_selector=".card",
+                         columns={"name": ".card-title", "shown": ("", "displayed")})
+
+    assert driver.calls[0] == (EXTRACT_ROWS_JS, ("id", "tbodyid", "tr", {"mode": "cells", "cell": "td"}, 1, 2000))
+    _, (_, _, row_selector, spec, min_rows, _) = driver.calls[1]
+    assert (row_selector, min_rows) == (".card", 0)
+    assert spec == {"mode": "fields", "fields": [["name", ".card-title", "text"], ["shown", "", "displayed"]]}
+
+
+def test_extract_rows_raises_instead_of_returning_a_partial_table():
+    with pytest.raises(TimeoutException, match="2 of 5 'tr' rows"):
+        JSUtils.extract_rows(FakeDriver([["a"], ["b"]]), (By.ID, "tbodyid"), min_rows=5, timeout=1)
+
+    assert JSUtils.extract_rows(FakeDriver([]), (By.ID, "tbodyid")) == []
+
+
+def test_fill_fields_sends_text_and_returns_skipped_fields():
+    driver = FakeDriver([1])
+
+    skipped = JSUtils.fill_fields(driver, [((By.ID, "card"), 4111111111111111), ((By.NAME, "year"), "2027")], timeout=3)
+
+    assert skipped == [1]
+    assert driver.calls == [(FILL_FIELDS_JS, ([["id", "card", "4111111111111111"], ["name", "year", "2027"]], 3000))]
+
+
+def test_page_ready_compares_the_navigation_token():
+    driver = FakeDriver(WebDriverException("no document yet"), False)
+
+    token = JSUtils.mark_navigation(driver)
+    assert JSUtils.page_ready(driver, token, [(By.ID, "nameofuser")], "return !!window.jQuery") is False
+    assert driver.calls[-1] == (PAGE_READY_JS, (token, [["id", "nameofuser"]], "return !!window.jQuery"))
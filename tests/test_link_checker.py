@@ -0,0 +1,89 @@
+import threading
+import time
+import pytest
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utilities.link_checker import LinkChecker
+
+
+# --------------------------- Local link server ---------------------------
+class LinkHandler(BaseHTTPRequestHandler):
+    hits = {}
+    DELAY = 0.5  # seconds /slow takes to answer
+
+    def _respond(self, send_body):
+        LinkHandler.hits[(self.command, self.path)] = LinkHandler.hits.get((self.command, self.path), 0) + 1
+        path = urlsplit(self.path).path
+        if path == "/slow":
+            time.sleep(self.DELAY)
+            status = 200
+        elif path == "/broken":
+            status = 404
+        elif path == "/no-head":
+            status = 405 if self.command == "HEAD" else 200
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def link_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LinkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker():
+    LinkChecker.clear_cache()
+    LinkHandler.hits.clear()
+    checker = LinkChecker(max_workers=8, timeout=5)
+    yield checker
+    checker.close()
+
+
+# --------------------------- Tests ---------------------------
+def test_reports_broken_links_and_falls_back_to_get(link_server, checker):
+    urls = [f"{link_server}/ok", f"{link_server}/broken", f"{link_server}/no-head", f"{link_server}/ok"]
+    report = checker.check_urls(urls)
+
+    by_url = {r["url"]: r for r in report.results}
+    assert len(report.results) == 3, "duplicate URLs should be checked once"
+    assert [r["url"] for r in report.broken] == [f"{link_server}/broken"]
+    assert by_url[f"{link_server}/no-head"]["method"] == "GET"
+    assert by_url[f"{link_server}/no-head"]["ok"]
+
+
+def test_checks_slow_links_concurrently(link_server, checker):
+    urls = [f"{link_server}/slow?{i}" for i in range(8)]
+    report = checker.check_urls(urls)
+
+    assert not report.broken
+    assert report.elapsed >= LinkHandler.DELAY, "the /slow handler did not delay"
+    # one by one this takes 8 x DELAY; with 8 workers it is about one DELAY
+    assert report.elapsed < LinkHandler.DELAY * 3, f"links were not checked in parallel: {report.summary()}"
+
+
+def test_cached_results_skip_the_network(link_server, checker):
+    url = f"{link_server}/ok"
+    checker.check_urls([url])
+    report = LinkChecker(max_workers=2).check_urls([url])
+
+    assert report.results[0]["cached"]
+    assert LinkHandler.hits[("HEAD", "/ok")] == 1
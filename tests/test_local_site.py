@@ -0,0 +1,57 @@
+import http.client
+import os
+import pytest
+import requests
+from urllib.parse import urlsplit
+from utilities.api_seeder import ApiSeeder
+from utilities.local_site import LocalSite
+
+
+@pytest.fixture(scope="module")
+def local_demoblaze():
+    with LocalSite("demoblaze") as site:
+        yield site
+
+
+@pytest.fixture(scope="module")
+def local_demoqa():
+    with LocalSite("demoqa") as site:
+        yield site
+
+
+def test_serves_the_pages_the_page_objects_use(local_demoblaze):
+    index = requests.get(f"{local_demoblaze.url}/index.html", timeout=5).text
+    for locator in ('id="login2"', 'id="signin2"', 'id="cartur"', 'id="tbodyid"', 'id="loginusername"'):
+        assert locator in index
+
+    cart = requests.get(f"{local_demoblaze.url}/cart.html", timeout=5).text
+    for locator in ('id="tbodyid"', ">Place Order<", 'id="card"', ">Purchase<"):
+        assert locator in cart
+
+
+def test_demoqa_routes_resolve_without_extension(local_demoqa):
+    for route, locator in (("/checkbox", "tree-node-desktop"), ("/select-menu", "oldSelectMenu"),
+                           ("/upload-download", "uploadFile"), ("/droppable", "droppable")):
+        response = requests.get(local_demoqa.url + route, timeout=5)
+        assert response.status_code == 200
+        assert locator in response.text
+
+
+@pytest.mark.parametrize("path", ["/../../../requirements.txt", "/%2e%2e/%2e%2e/%2e%2e/requirements.txt"])
+def test_does_not_serve_files_outside_the_site(local_demoblaze, path):
+    assert os.path.isfile(os.path.join(local_demoblaze.root, "..", "..", "..", "requirements.txt"))
+    # Sent as is: requests would collapse the /../ before it left the client
+    connection = http.client.HTTPConnection(urlsplit(local_demoblaze.url).netloc, timeout=5)
+    try:
+        connection.request("GET", path)
+        assert connection.getresponse().status == 404
+    finally:
+        connection.close()
+
+
+def test_api_knows_the_csv_users(local_demoblaze):
+    seeder = ApiSeeder(api_url=local_demoblaze.url)
+    try:
+        assert seeder.login("Ramya Hunagund", "ramya123")
+    finally:
+        seeder.close()
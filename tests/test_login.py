@@ -1,50 +1,27 @@
 import pytest
-import csv
-import os
 import time
-import requests
-from drivers.driver_factory import DriverFactory
 from pages.login_page import LoginPage
+from utilities.config import Config
+from utilities.wait_utils import WaitUtils
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 
-# --------------------------- Data Handling ---------------------------
-def ensure_login_data():
-    folder = os.path.join(os.getcwd(), "testdata")
-    os.makedirs(folder, exist_ok=True)
-    file_path = os.path.join(folder, "login_data.csv")
-
-    if not os.path.exists(file_path):
-        with open(file_path, "w", newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["username", "password"])
-            writer.writerow(["varshitha reddy", "varshi123"])
-    return file_path
-
-
-def read_login_data():
-    file_path = ensure_login_data()
-    with open(file_path, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        return [(row['username'], row['password']) for row in reader]
+# --------------------------- Demo / Helper Functions ---------------------------
+@pytest.fixture(scope="module")
+def link_checker():
+    """Shared by the module's tests so keep-alive connections and results survive between them."""
+    from utilities.link_checker import LinkChecker  # pulls in requests; not needed to collect
+    checker = LinkChecker()
+    yield checker
+    checker.close()
 
 
-# --------------------------- Demo / Helper Functions ---------------------------
-def broken_links_check(driver):
+def broken_links_check(driver, link_checker):
     print("\n[Demo] Checking for broken links...")
-    links = driver.find_elements(By.TAG_NAME, "a")
-    print(f"Total links found: {len(links)}")
-    for link in links:
-        href = link.get_attribute("href")
-        if href and href.startswith("http"):
-            try:
-                response = requests.head(href, timeout=5)
-                assert response.status_code < 400, f"Broken link detected: {href}"
-            except Exception as e:
-                print(f"Error checking link: {href} -> {e}")
-    print("[Demo] Broken links check completed.")
+    report = link_checker.check_page(driver)
+    for result in report.broken:
+        print(f"Error checking link: {result['url']} -> {result['error'] or result['status']}")
+    print(f"[Demo] Broken links check completed: {report.summary()}")
 
 
 def navigation_commands_demo(driver):
@@ -61,22 +38,21 @@ def navigation_commands_demo(driver):
 
 
 def wait_for_element(driver, by, locator, timeout=10):
-    wait = WebDriverWait(driver, timeout)
-    return wait.until(EC.visibility_of_element_located((by, locator)))
+    return WaitUtils.wait_for_element_visible(driver, (by, locator), timeout)
 
 
 # --------------------------- Test: Login ---------------------------
-@pytest.mark.order(2)
 @pytest.mark.parametrize("browser_name", ["chrome", "edge", "firefox"])
-@pytest.mark.parametrize("username,password", read_login_data())
-def test_login(browser_name, username, password):
-    driver = DriverFactory.get_driver(browser_name=browser_name, headless=False)
-    driver.get("https://www.demoblaze.com")
+@pytest.mark.data_rows("account", "login_data.csv")
+def test_login(browser_name, account, pooled_driver, link_checker):
+    username, password = account.values("username", "password")
+    driver = pooled_driver
+    driver.get(Config.demoblaze_url())
     driver.maximize_window()
     print(f"\n=== Starting login test for {username} on {browser_name} ===")
 
     # 🔹 FEATURE 1: Broken Links Detection
-    broken_links_check(driver)
+    broken_links_check(driver, link_checker)
 
     # 🔹 FEATURE 2: Navigation Commands
     driver.find_element(By.ID, "login2").click()
@@ -102,7 +78,7 @@ def test_login(browser_name, username, password):
     except:
         print("[Login] Login may have failed.")
 
-    time.sleep(2)
+    WaitUtils.wait_for_network_idle(driver)
 
     # 🔹 FEATURE 4: Refresh and verify
     driver.refresh()
@@ -114,11 +90,10 @@ def test_login(browser_name, username, password):
     # 🔹 FEATURE 5: Logout
     if login_page.is_logged_in():
         driver.find_element(By.ID, "logout2").click()
-        time.sleep(2)
+        WaitUtils.wait_for_network_idle(driver)
         assert not login_page.is_logged_in(), "[Assertion] Logout failed!"
         print("User logged out successfully.")
     else:
         print("User was not logged in; skipping logout.")
 
     print(f"\n=== Login test executed successfully for user: {username} ===")
-    driver.quit()
@@ -1,110 +1,52 @@
 import time
 import pytest
-import os
-import csv
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pages.product_page import ProductPage
 from pages.place_order_page import PlaceOrderPage
-
-# ---------------------------
-# Function to read order data
-# ---------------------------
-def read_order_data_from_csv():
-    folder = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(folder, "..", "testdata", "order_data.csv")
-
-    print(f"[Data] Reading order data from CSV: {file_path}")
-
-    data_list = []
-    with open(file_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            data_list.append((
-                row["name"],
-                row["country"],
-                row["city"],
-                row["card"],
-                row["month"],
-                row["year"]
-            ))
-    print(f"[Data] Loaded {len(data_list)} order(s) from CSV.")
-    return data_list
+from utilities.config import Config
+from utilities.wait_utils import WaitUtils
+from utilities.js_utils import JSUtils
 
 # ---------------------------
 # Helper function to read cart table
 # ---------------------------
 def read_cart_table(driver):
     print("\n[Cart] Reading Cart Table Contents...")
-    wait = WebDriverWait(driver, 10)
-    table_body = wait.until(EC.presence_of_element_located((By.ID, "tbodyid")))
+    # One round trip: waits in the page for the first row, then returns every cell text
+    table_data = JSUtils.extract_rows(driver, (By.ID, "tbodyid"), row_selector="tr", columns="td",
+                                      min_rows=1, timeout=10)
 
-    timeout = time.time() + 10
-    rows = []
-    while time.time() < timeout:
-        rows = table_body.find_elements(By.TAG_NAME, "tr")
-        if len(rows) > 0:
-            break
-        time.sleep(0.5)
-
-    if len(rows) == 0:
+    if len(table_data) == 0:
         raise AssertionError("[Cart] Cart table is empty!")
 
-    table_data = []
-    for i, row in enumerate(rows, start=1):
-        cols = row.find_elements(By.TAG_NAME, "td")
-        item = [col.text for col in cols]
-        table_data.append(item)
+    for i, item in enumerate(table_data, start=1):
         print(f"[Cart] Row {i}: {item}")
     return table_data
 
 # ---------------------------
 # Test
 # ---------------------------
-@pytest.mark.order(4)
-@pytest.mark.parametrize(
-    "name,country,city,card,month,year",
-    read_order_data_from_csv()
-)
-def test_place_order(logged_in_driver, name, country, city, card, month, year):
+@pytest.mark.data_rows("order", "order_data.csv")
+def test_place_order(logged_in_driver, seeded_cart, order):
+    name, country, city, card, month, year = order.values("name", "country", "city", "card", "month", "year")
     driver = logged_in_driver
-    wait = WebDriverWait(driver, 10)
 
     print(f"\n=== Starting Place Order Test for {name} ===")
-    driver.get("https://www.demoblaze.com")
+    driver.get(Config.demoblaze_url())
     driver.maximize_window()
 
     print("[Login] Using already logged-in session")
 
-    # Step 1: Open a product
-    print("[Step 1] Opening a product...")
-    product_page = ProductPage(driver)
-    product_page.open_product()
-    time.sleep(1)
-
-    # Step 2: Add product to cart
-    print("[Step 2] Adding product to cart...")
-    product_page.add_to_cart()
-
-    # Step 3: Handle alert
-    try:
-        alert = wait.until(EC.alert_is_present())
-        print(f"[Alert] Alert appeared with text: {alert.text}")
-        alert.accept()
-        print("[Alert] Alert accepted successfully.")
-        time.sleep(2)  # Allow time for cart update
-    except:
-        print("[Alert] No alert appeared.")
+    # Steps 1-3: the product is put into the cart over the API by the seeded_cart fixture
+    print(f"[Setup] Cart seeded with {len(seeded_cart)} item(s) via API")
 
     # Step 4: Go to Cart
     print("[Step 4] Navigating to Cart page...")
-    cart_link = wait.until(EC.element_to_be_clickable((By.ID, "cartur")))
+    cart_link = WaitUtils.wait_for_element_clickable(driver, (By.ID, "cartur"), timeout=10)
     cart_link.click()
 
     # Step 4a: Wait for cart page to load
-    wait.until(EC.presence_of_element_located((By.ID, "tbodyid")))
-    time.sleep(2)
+    WaitUtils.wait_for_element_present(driver, (By.ID, "tbodyid"), timeout=10)
+    WaitUtils.wait_for_network_idle(driver)
 
     # Step 4b: Read and verify cart table
     try:
@@ -114,14 +56,14 @@ def test_place_order(logged_in_driver, name, country, city, card, month, year):
         print(f"[Cart] Error reading cart: {e}")
         print("[Cart] Retrying after refresh...")
         driver.refresh()
-        wait.until(EC.presence_of_element_located((By.ID, "tbodyid")))
-        time.sleep(2)
+        WaitUtils.wait_for_element_present(driver, (By.ID, "tbodyid"), timeout=10)
+        WaitUtils.wait_for_network_idle(driver)
         cart_items = read_cart_table(driver)
         assert len(cart_items) > 0, "[Cart] Cart is still empty after refresh!"
 
     # Step 5: Click “Place Order”
     print("[Step 5] Clicking 'Place Order' button...")
-    place_order_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Place Order']")))
+    place_order_btn = WaitUtils.wait_for_element_clickable(driver, (By.XPATH, "//button[text()='Place Order']"), timeout=10)
     place_order_btn.click()
 
     # Step 6: Fill order details
@@ -132,12 +74,12 @@ def test_place_order(logged_in_driver, name, country, city, card, month, year):
 
     # Step 7: Click “Purchase”
     print("[Step 7] Clicking 'Purchase' button...")
-    purchase_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Purchase']")))
+    purchase_btn = WaitUtils.wait_for_element_clickable(driver, (By.XPATH, "//button[text()='Purchase']"), timeout=10)
     purchase_btn.click()
 
     # Step 8: Capture confirmation
-    confirmation_text = wait.until(
-        EC.visibility_of_element_located((By.XPATH, "//h2[contains(text(),'Thank you')]"))
+    confirmation_text = WaitUtils.wait_for_element_visible(
+        driver, (By.XPATH, "//h2[contains(text(),'Thank you')]"), timeout=10
     ).text
     print(f"[Step 8] Order Confirmation received: {confirmation_text}")
 
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from drivers.driver_factory import OWNER_FILE, PROFILE_PREFIX, DriverFactory
+from drivers.resource_monitor import ResourceMonitor
+
+pytestmark = pytest.mark.skipif(not ResourceMonitor.available(), reason="psutil is not installed")
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, process=None, session_id="old"):
+        self.service = FakeService(process)
+        self.session_id = session_id
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def process_tree():
+    # Stand-in for driver binary + browser: a parent with one child
+    code = "import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); time.sleep(30)"
+    process = subprocess.Popen([sys.executable, "-c", code])
+    yield process
+    import psutil
+    for child in psutil.Process(process.pid).children(recursive=True):
+        child.kill()
+    process.kill()
+    process.wait()
+
+
+def test_samples_the_whole_process_tree_and_applies_limits(process_tree, monkeypatch):
+    driver = ResourceMonitor.attach(FakeDriver(process_tree))
+    deadline = time.time() + 5
+    while ResourceMonitor.sample(driver)["processes"] < 2 and time.time() < deadline:
+        time.sleep(0.05)  # child not spawned yet
+
+    stats = ResourceMonitor.sample(driver)
+    assert stats["processes"] == 2 and stats["rss_mb"] > 1 and stats["handles"] > 0
+
+    monkeypatch.setenv("DRIVER_MAX_RSS_MB", "100000")
+    monkeypatch.setenv("DRIVER_MAX_COMMANDS", "3")
+    driver.execute("getTitle")
+    assert ResourceMonitor.over_limit(driver) is None
+    driver.execute("getTitle")
+    driver.execute("getTitle")
+    assert ResourceMonitor.over_limit(driver) == "3 commands"
+
+    monkeypatch.setenv("DRIVER_MAX_COMMANDS", "0")
+    monkeypatch.setenv("DRIVER_MAX_RSS_MB", "1")
+    assert ResourceMonitor.over_limit(driver).endswith("MB RSS")
+    ResourceMonitor.detach(driver)
+
+
+def test_sweep_removes_only_profiles_of_dead_runs(tmp_path):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    profiles = {}
+    for name, owner in {"dead": finished.pid, "ours": os.getpid(), "no-owner": None}.items():
+        path = tmp_path / f"{PROFILE_PREFIX}chrome-main-{name}"
+        path.mkdir()
+        if owner is not None:
+            (path / OWNER_FILE).write_text(str(owner))
+        profiles[name] = path
+    os.utime(profiles["no-owner"], (0, 0))
+    (tmp_path / "unrelated").mkdir()
+
+    removed = DriverFactory.sweep_stale_profiles(str(tmp_path))
+
+    assert sorted(removed) == sorted(str(profiles[name]) for name in ("dead", "no-owner"))
+    assert profiles["ours"].exists() and (tmp_path / "unrelated").exists()
+
+
+def test_recycle_returns_a_fresh_session_that_keeps_the_restore_hook(monkeypatch):
+    driver = FakeDriver()
+    driver.launch_args = {"browser_name": "chrome", "headless": True}
+    restored, quit_sessions = [], []
+    driver._after_recycle = restored.append
+    driver.quit = lambda: quit_sessions.append(driver.session_id)
+    monkeypatch.setattr(DriverFactory, "get_driver", lambda **kwargs: FakeDriver(session_id="new"))
+
+    fresh = DriverFactory.recycle(driver)
+
+    assert fresh is not driver and fresh.session_id == "new"
+    assert quit_sessions == ["old"]
+    assert restored == [fresh] and fresh._after_recycle == restored.append
+
+    unmanaged = FakeDriver()  # no launch_args: not started by the factory
+    assert DriverFactory.recycle(unmanaged) is unmanaged
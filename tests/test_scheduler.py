@@ -0,0 +1,93 @@
+import json
+import pytest
+from utilities.scheduler import DurationHistory, by_scope, dependency_groups, longest_first, parse_shard, partition
+
+
+class FakeMarker:
+    def __init__(self, *args):
+        self.args = args
+
+
+class FakeItem:
+    def __init__(self, name, depends_on=(), parent="tests/test_x.py"):
+        self.name = self.originalname = name
+        self.nodeid = f"{parent}::{name}"
+        self.depends_on = depends_on
+
+    def iter_markers(self, name):
+        return [FakeMarker(*self.depends_on)] if name == "depends_on" and self.depends_on else []
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = DurationHistory(path=str(tmp_path / "durations.json"))
+    for name, seconds in {"slow": 30, "medium": 12, "quick": 1, "login": 5}.items():
+        history.record(f"tests/test_x.py::{name}", seconds)
+    return history
+
+
+def test_prediction_falls_back_to_siblings_then_median(history):
+    history.record("tests/test_x.py::matrix[chrome]", 10)
+    history.record("tests/test_x.py::matrix[edge]", 20)
+
+    assert history.predict("tests/test_x.py::slow") == 30
+    assert history.predict("tests/test_x.py::matrix[firefox]") == 15
+    assert history.predict("tests/test_x.py::brand_new") == 11  # median of all six
+
+
+def test_history_is_a_moving_average_and_round_trips(history):
+    history.record("tests/test_x.py::quick", 11)
+    history.save()
+
+    reloaded = DurationHistory(path=history.path)
+    assert reloaded.durations["tests/test_x.py::quick"] == {"avg": 4.0, "runs": 2}
+
+
+def test_history_can_be_seeded_from_allure_results(tmp_path):
+    result = {"name": "test_login[chrome]", "fullName": "tests.test_login#test_login", "start": 1000, "stop": 4500}
+    (tmp_path / "abc-result.json").write_text(json.dumps(result))
+
+    history = DurationHistory(path=str(tmp_path / "durations.json"))
+    assert history.import_allure(str(tmp_path)) == 1
+    assert history.predict("tests/test_login.py::test_login[chrome]") == 3.5
+
+
+def test_longest_first_keeps_declared_dependencies_together(history):
+    items = [FakeItem("quick"), FakeItem("checkout", depends_on=("login",)), FakeItem("slow"),
+             FakeItem("login"), FakeItem("medium")]
+
+    ordered = [[item.name for item in group] for _, group in longest_first(dependency_groups(items), history.predict)]
+
+    assert ordered == [["slow"], ["login", "checkout"], ["medium"], ["quick"]]
+
+
+def test_modules_and_classes_stay_contiguous(history):
+    history.record("tests/test_y.py::huge", 40)
+    history.record("tests/test_x.py::TestCart::add", 8)
+    items = [FakeItem("quick"), FakeItem("add", parent="tests/test_x.py::TestCart"), FakeItem("slow"),
+             FakeItem("huge", parent="tests/test_y.py"), FakeItem("medium"), FakeItem("empty", parent="tests/test_y.py")]
+
+    ordered = [group[0].nodeid for _, group in by_scope(longest_first(dependency_groups(items), history.predict))]
+
+    # test_x (51s) before test_y (40s + median); TestCart's tests together, after the longer module-level bucket
+    assert ordered == ["tests/test_x.py::slow", "tests/test_x.py::medium", "tests/test_x.py::quick",
+                       "tests/test_x.py::TestCart::add", "tests/test_y.py::huge", "tests/test_y.py::empty"]
+
+
+def test_shards_are_balanced_by_predicted_time(history):
+    items = [FakeItem(name) for name in ("slow", "medium", "quick", "login")]
+    costed = longest_first(dependency_groups(items), history.predict)
+
+    assignment, loads = partition(costed, 2)
+
+    assert sorted(loads) == [18, 30]
+    assert sorted(item.name for group in assignment[0] + assignment[1] for item in group) == \
+        ["login", "medium", "quick", "slow"]
+
+
+def test_parse_shard():
+    assert parse_shard("2/3") == (1, 3)
+    with pytest.raises(ValueError):
+        parse_shard("4/3")
+    with pytest.raises(ValueError):
+        parse_shard("half")
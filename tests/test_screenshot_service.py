@@ -0,0 +1,68 @@
+import base64
+import os
+import threading
+import time
+import pytest
+from utilities.screenshot_service import ScreenshotService
+
+
+class FakeDriver:
+    """Firefox-like driver: PNG screenshots only, no CDP."""
+
+    def __init__(self):
+        self.frame = b"frame-1"
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.frame).decode("ascii")
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ScreenshotService(directory=str(tmp_path), fmt="png")
+    yield service
+    service.close()
+
+
+def test_capture_is_written_in_the_background(service):
+    path = service.capture(FakeDriver(), "cart page")
+
+    assert os.path.basename(path).startswith("cart_page_") and path.endswith(".png")
+    assert service.flush(timeout=5)
+    with open(path, "rb") as f:
+        assert f.read() == b"frame-1"
+
+
+def test_identical_consecutive_frames_are_written_once(service):
+    driver = FakeDriver()
+    first = service.capture(driver, "step")
+    second = service.capture(driver, "step")
+    driver.frame = b"frame-2"
+    third = service.capture(driver, "step")
+    service.flush(timeout=5)
+
+    assert first == second != third
+    assert service.stats["duplicates"] == 1
+    assert service.stats["written"] == 2
+
+
+def test_capture_does_not_wait_for_the_writer(service, monkeypatch):
+    release = threading.Event()
+    original_write = service._write
+
+    def slow_write(*job):
+        release.wait(5)
+        original_write(*job)
+
+    monkeypatch.setattr(service, "_write", slow_write)
+    driver = FakeDriver()
+    start = time.perf_counter()
+    for i in range(5):
+        driver.frame = f"frame-{i}".encode()
+        service.capture(driver, "burst")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert service.stats["written"] == 0
+    release.set()
+    assert service.flush(timeout=5)
+    assert service.stats["written"] == 5
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+import pytest
+from utilities.session_store import CAPTURE_STORAGE_JS, RESTORE_STORAGE_JS, SessionStore
+
+URL = "https://www.demoblaze.com"
+USER = "Ramya Hunagund"
+
+
+class FakeDriver:
+    """A browser with cookies and local storage that records its navigation calls."""
+
+    def __init__(self, cookies=(), local=None):
+        self.cookies = list(cookies)
+        self.local = dict(local or {})
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def refresh(self):
+        self.calls.append(("refresh",))
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if script == CAPTURE_STORAGE_JS:
+            return {"local": dict(self.local), "session": {}}
+        if script == RESTORE_STORAGE_JS:
+            self.local.update(args[0])
+        self.calls.append(("script", args))
+
+
+class FakeChrome(FakeDriver):
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        if cmd == "Network.setCookies":
+            self.cookies.extend(params["cookies"])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(directory=str(tmp_path), max_age=60)
+
+
+def logged_in(driver):
+    return any(c["name"] == "tokenp_" for c in driver.cookies)
+
+
+def test_capture_and_restore_round_trip(store):
+    cookie = {"name": "tokenp_", "value": "abc", "domain": ".demoblaze.com", "path": "/"}
+    store.capture(FakeDriver([cookie], {"cart": "1"}), URL, USER)
+
+    state = store.load(URL, USER)
+    assert state["cookies"] == [cookie] and state["local"] == {"cart": "1"}
+    assert store.load(URL, "someone else") is None
+
+    driver = FakeDriver()
+    SessionStore.restore(driver, URL, state)
+    assert driver.cookies == [cookie] and driver.local == {"cart": "1"}
+    assert driver.calls[0] == ("get", URL) and driver.calls[-1] == ("refresh",)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_stored_sessions_are_private_to_the_user(tmp_path):
+    store = SessionStore(directory=str(tmp_path / "sessions"))
+    store.capture(FakeDriver([{"name": "tokenp_", "value": "abc"}]), URL, USER)
+
+    assert os.stat(store.directory).st_mode & 0o777 == 0o700
+    assert os.stat(store._path(URL, USER)).st_mode & 0o777 == 0o600
+
+
+def test_chromium_restores_all_cookies_in_one_cdp_call(store):
+    expires = time.time() + 600
+    store.capture(FakeDriver([{"name": "tokenp_", "value": "abc", "expiry": expires},
+                              {"name": "user", "value": "r"}]), URL, USER)
+
+    driver = FakeChrome()
+    SessionStore.restore(driver, URL, store.load(URL, USER))
+
+    cdp = [call for call in driver.calls if call[0] == "Network.setCookies"]
+    assert cdp == [("Network.setCookies", {"cookies": [{"name": "tokenp_", "value": "abc", "expires": expires},
+                                                       {"name": "user", "value": "r"}]})]
+
+
+def test_expired_state_is_not_loaded(store):
+    store.capture(FakeDriver([{"name": "tokenp_", "value": "abc"}]), URL, USER)
+    path = store._path(URL, USER)
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+
+    state["captured_at"] -= 61
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    assert store.load(URL, USER) is None
+
+    state["captured_at"] = time.time()
+    state["cookies"][0]["expiry"] = time.time() - 1
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    assert store.load(URL, USER) is None
+
+
+def test_login_runs_once_and_is_reused(store):
+    logins = []
+
+    def login(driver):
+        logins.append(driver)
+        driver.cookies.append({"name": "tokenp_", "value": "abc"})
+
+    store.ensure_logged_in(FakeDriver(), URL, USER, login, logged_in)
+    second = FakeDriver()
+    store.ensure_logged_in(second, URL, USER, login, logged_in)
+
+    assert len(logins) == 1 and logged_in(second)
+    assert not os.path.exists(store._path(URL, USER, suffix=".lock"))
+
+
+def test_lock_waits_for_the_other_worker(store):
+    order = []
+
+    def second_worker():
+        with store._lock(URL, USER):
+            order.append("second")
+
+    with store._lock(URL, USER):
+        waiter = threading.Thread(target=second_worker)
+        waiter.start()
+        time.sleep(0.3)
+        order.append("first")
+    waiter.join(5)
+
+    assert order == ["first", "second"]
+
+
+def test_lock_left_by_a_crashed_worker_is_taken_over(store):
+    path = store._path(URL, USER, suffix=".lock")
+    open(path, "w").close()
+    os.utime(path, (time.time() - 10, time.time() - 10))
+
+    with store._lock(URL, USER, timeout=5):
+        assert os.path.exists(path)
+    assert not os.path.exists(path)
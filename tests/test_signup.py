@@ -1,36 +1,14 @@
 import pytest
-import csv
-import os
 import time
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from drivers.driver_factory import DriverFactory
 from pages.signup_page import SignupPage
-
-
-# -------------------- Data Setup --------------------
-def ensure_signup_data():
-    folder = os.path.join(os.getcwd(), "testdata")
-    os.makedirs(folder, exist_ok=True)
-    file_path = os.path.join(folder, "signup_data.csv")
-
-    # overwrite with Ramya’s credentials
-    with open(file_path, "w", newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["username", "password"])
-        writer.writerow(["Ramya Hunagund", "ramya123"])
-    return file_path
-
-
-def read_signup_data():
-    file_path = ensure_signup_data()
-    with open(file_path, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        data = [(row['username'], row['password']) for row in reader]
-    return data
+from utilities.config import Config
+from utilities.screenshot_utils import ScreenshotUtils
+from utilities.wait_utils import WaitUtils
 
 
 # -------------------- Utility Demos --------------------
@@ -67,7 +45,7 @@ def window_handling_demo(driver):
     """Demonstrate window handling"""
     print("\n[Demo] Window Handling:")
     parent = driver.current_window_handle
-    driver.execute_script("window.open('https://www.google.com');")
+    driver.execute_script("window.open(arguments[0]);", Config.demoblaze_url("/about.html"))
     time.sleep(1)
     all_windows = driver.window_handles
     for win in all_windows:
@@ -91,22 +69,20 @@ def alert_handling_demo(driver, wait):
 
 
 def screenshot_demo(driver, name="default_screenshot"):
-    """Take and store screenshots in /screenshots folder"""
-    folder = os.path.join(os.getcwd(), "screenshots")
-    os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, f"{name}.png")
-    driver.save_screenshot(path)
+    """Queue a screenshot; it is written to reports/screenshots in the background"""
+    path = ScreenshotUtils.take_screenshot(driver, name)
     print(f"Screenshot saved at: {path}")
 
 
 # -------------------- Test Case --------------------
-@pytest.mark.order(1)
 @pytest.mark.parametrize("browser_name", ["chrome", "edge", "firefox"])
-@pytest.mark.parametrize("username,password", read_signup_data())
-def test_signup(browser_name, username, password):
+@pytest.mark.data_rows("account", "signup_data.csv")
+@pytest.mark.headless
+def test_signup(browser_name, account, pooled_driver):
+    username, password = account.values("username", "password")
     print(f"\n=== Starting signup test for user: {username} ===")
-    driver = DriverFactory.get_driver(browser_name=browser_name, headless=True)
-    driver.get("https://www.demoblaze.com")
+    driver = pooled_driver
+    driver.get(Config.demoblaze_url())
     driver.maximize_window()
     wait = WebDriverWait(driver, 10)
 
@@ -118,16 +94,14 @@ def test_signup(browser_name, username, password):
     print("\n[Feature] Opening signup modal...")
     signup_page = SignupPage(driver)
     signup_page.open_signup_modal()
-    wait.until(EC.visibility_of_element_located((By.ID, "signInModal")))
+    WaitUtils.wait_for_element_visible(driver, (By.ID, "signInModal"), timeout=10)
 
     print(f"[Action] Entering signup details for user: {username}")
     signup_page.enter_signup_details(username, password)
-    signup_page.submit_signup()
-    time.sleep(3)
+    signup_page.submit_signup()  # returns as soon as the signup request has settled
 
     alert_handling_demo(driver, wait)
     window_handling_demo(driver)
     screenshot_demo(driver, f"signup_{username.replace(' ', '_')}")
 
-    driver.quit()
     print(f"=== Signup test completed for user: {username} ===\n")
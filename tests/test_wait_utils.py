@@ -0,0 +1,122 @@
+import pytest
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, TimeoutException, UnexpectedAlertPresentException,
+)
+from selenium.webdriver.common.by import By
+from utilities.wait_utils import NETWORK_IDLE_JS, NETWORK_TRACKER_JS, WaitUtils
+
+
+class FakeElement:
+    def __init__(self, text=""):
+        self.text = text
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class FakeDriver:
+    """execute_async_script answers from a script of outcomes; find_element serves the polling fallback."""
+
+    def __init__(self, *outcomes, element=None):
+        self.outcomes = list(outcomes)
+        self.element = element
+        self.scripts = []
+        self.finds = 0
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(args)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def find_element(self, by, value):
+        self.finds += 1
+        if self.element is None or self.finds < 3:
+            raise NoSuchElementException(value)
+        return self.element
+
+
+def test_condition_is_resolved_in_the_page_in_one_round_trip():
+    element = FakeElement()
+    driver = FakeDriver({"value": element})
+
+    assert WaitUtils.wait_for_element_visible(driver, (By.ID, "login2"), timeout=5) is element
+    assert len(driver.scripts) == 1
+    by, value, condition, expected, timeout_ms = driver.scripts[0]
+    assert (by, value, condition, expected) == ("id", "login2", "visible", None) and 0 < timeout_ms <= 5000
+
+
+def test_navigation_and_script_timeouts_re_arm_the_wait():
+    element = FakeElement("Thank you")
+    driver = FakeDriver(JavascriptException("javascript error: document unloaded while waiting for result"),
+                        TimeoutException("script timeout"),
+                        {"value": element})
+
+    assert WaitUtils.wait_for_text(driver, (By.TAG_NAME, "h2"), "Thank", timeout=5) is element
+    assert len(driver.scripts) == 3
+
+
+def test_timeout_and_polling_fallback():
+    with pytest.raises(TimeoutException):
+        WaitUtils.wait_for_element_present(FakeDriver(None), (By.ID, "missing"), timeout=0.2)
+
+    element = FakeElement()
+    driver = FakeDriver(JavascriptException("Unsupported locator strategy: -android uiautomator"), element=element)
+    assert WaitUtils.wait_for_element_present(driver, (By.ID, "late"), timeout=5) is element
+    assert driver.finds == 3
+
+
+class FakeFirefox:
+    """execute_script answers the idle check from a list of results; an open alert refuses every script."""
+
+    def __init__(self, *idle, alert=False):
+        self.idle = list(idle)
+        self.alert = alert
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if self.alert:
+            raise UnexpectedAlertPresentException(alert_text="Sign up successful.")
+        return self.idle.pop(0) if script == NETWORK_IDLE_JS else None
+
+
+class FakeChrome(FakeFirefox):
+    def __init__(self, *idle):
+        super().__init__(*idle)
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+
+def test_network_tracker_is_installed_per_document_on_chromium_only_in_the_page_elsewhere():
+    chrome, firefox = FakeChrome(), FakeFirefox()
+    WaitUtils.install_network_tracker(chrome)
+    WaitUtils.install_network_tracker(firefox)
+
+    assert chrome.cdp == [("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})]
+    assert chrome.scripts == firefox.scripts == [(NETWORK_TRACKER_JS, ())]
+
+
+@pytest.mark.parametrize("driver_class", [FakeChrome, FakeFirefox])
+def test_network_idle_polls_the_page_until_quiet(driver_class):
+    driver = driver_class(False, False, True)
+
+    assert WaitUtils.wait_for_network_idle(driver, quiet_ms=100, timeout=5, leave_ms=500)
+    # the idle check carries the tracker, so a page without it gets it on the first poll
+    assert NETWORK_IDLE_JS.startswith(NETWORK_TRACKER_JS)
+    assert [args for _, args in driver.scripts] == [(100, 500)] * 3
+
+
+def test_network_idle_gives_up_and_treats_an_alert_as_settled():
+    with pytest.raises(TimeoutException):
+        WaitUtils.wait_for_network_idle(FakeFirefox(*[False] * 100), timeout=0.2)
+
+    driver = FakeFirefox(alert=True)
+    assert WaitUtils.wait_for_network_idle(driver, timeout=1)
+    assert len(driver.scripts) == 1  # one command per poll, no separate alert probe
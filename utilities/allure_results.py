@@ -0,0 +1,255 @@
+"""Keeps reports/allure-results small: content-addressed attachments, rotation and worker merges.
+
+    python -m utilities.allure_results dedupe reports/allure-results
+    python -m utilities.allure_results merge reports/allure-results reports/allure-gw0 reports/allure-gw1
+    python -m utilities.allure_results rotate reports/allure-results --keep 3
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import zipfile
+from datetime import datetime
+
+try:
+    from allure_commons import hookimpl
+    from allure_commons.logger import AllureFileLogger
+except ImportError:  # allure-pytest not installed: merge/rotate/dedupe still work on existing files
+    AllureFileLogger = object
+
+    def hookimpl(func):
+        return func
+
+ATTACHMENT_MARK = "-attachment"
+# Files that reference attachments
+REPORT_SUFFIXES = ("-result.json", "-container.json")
+# Trend data and report settings, these survive a rotation
+KEEP_NAMES = {"history", "environment.properties", "categories.json", "executor.json"}
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _attachment_name(digest, file_name):
+    # Keep the extension Allure picked, it decides how the attachment is rendered
+    extension = file_name.split(ATTACHMENT_MARK, 1)[1] if ATTACHMENT_MARK in file_name else ""
+    return f"{digest}{ATTACHMENT_MARK}{extension}"
+
+
+def _rewrite_sources(node, mapping):
+    """Point every {"source": ...} in a result/container document (dict tree) at its canonical file."""
+    changed = False
+    if isinstance(node, dict):
+        source = node.get("source")
+        if isinstance(source, str) and source in mapping:
+            node["source"] = mapping[source]
+            changed = True
+        for value in node.values():
+            changed |= _rewrite_sources(value, mapping)
+    elif isinstance(node, list):
+        for value in node:
+            changed |= _rewrite_sources(value, mapping)
+    return changed
+
+
+class DedupingFileLogger(AllureFileLogger):
+    """Allure's file writer, but every attachment is stored once under a hash of its content.
+
+    Results and containers are still written one file per test as they finish; only their
+    attachment references are pointed at the shared file first.
+    """
+
+    def __init__(self, report_dir, clean=False):
+        super().__init__(report_dir, clean)
+        self._canonical = {}  # file name Allure picked -> content-addressed name
+        self.saved_bytes = 0
+
+    def _store(self, data, file_name):
+        name = _attachment_name(_digest(data), file_name)
+        self._canonical[file_name] = name
+        destination = os.path.join(self._report_dir, name)
+        if os.path.exists(destination):
+            self.saved_bytes += len(data)
+            return
+        tmp_path = f"{destination}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, destination)
+
+    def _rewrite(self, item):
+        for attachment in getattr(item, "attachments", None) or []:
+            attachment.source = self._canonical.pop(attachment.source, attachment.source)
+        for field in ("steps", "befores", "afters"):
+            for child in getattr(item, field, None) or []:
+                self._rewrite(child)
+
+    @hookimpl
+    def report_result(self, result):
+        self._rewrite(result)
+        super().report_result(result)
+
+    @hookimpl
+    def report_container(self, container):
+        self._rewrite(container)
+        super().report_container(container)
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        with open(source, "rb") as f:
+            self._store(f.read(), file_name)
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        self._store(body.encode("utf-8") if isinstance(body, str) else body, file_name)
+
+    @staticmethod
+    def install():
+        """Make allure-pytest create this logger; call before its pytest_configure runs."""
+        try:
+            import allure_pytest.plugin
+        except ImportError:
+            return False
+        allure_pytest.plugin.AllureFileLogger = DedupingFileLogger
+        return True
+
+
+class AllureResults:
+    """Housekeeping on a results directory that does not need Allure installed."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _files(self):
+        try:
+            return sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+
+    def dedupe(self):
+        """Store each distinct attachment once and repoint the results; returns bytes removed."""
+        mapping, removed = {}, 0
+        for name in self._files():
+            if ATTACHMENT_MARK not in name or name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            canonical = _attachment_name(_digest(data), name)
+            if canonical == name:
+                continue
+            target = os.path.join(self.directory, canonical)
+            if os.path.exists(target):
+                os.remove(path)
+                removed += len(data)
+            else:
+                os.replace(path, target)
+            mapping[name] = canonical
+
+        if mapping:
+            for name in self._files():
+                if name.endswith(REPORT_SUFFIXES):
+                    self._rewrite_file(os.path.join(self.directory, name), mapping)
+        return removed
+
+    @staticmethod
+    def _rewrite_file(path, mapping):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if '"source"' not in text:
+            return
+        document = json.loads(text)
+        if _rewrite_sources(document, mapping):
+            tmp_path = f"{path}.tmp"
+            with io.open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(document, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+    def merge(self, sources, remove_sources=True):
+        """Move the files of per-worker result directories in here; no JSON is parsed.
+
+        File names are uuids or content hashes, so a name that already exists here is the same file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        moved = 0
+        for source in sources:
+            if os.path.abspath(source) == os.path.abspath(self.directory) or not os.path.isdir(source):
+                continue
+            for name in os.listdir(source):
+                path = os.path.join(source, name)
+                target = os.path.join(self.directory, name)
+                if not os.path.isfile(path) or name.endswith(".tmp"):
+                    continue
+                if os.path.exists(target):
+                    os.remove(path)
+                    continue
+                shutil.move(path, target)
+                moved += 1
+            if remove_sources:
+                shutil.rmtree(source, ignore_errors=True)
+        return moved
+
+    def rotate(self, archive_dir=None, keep=3):
+        """Zip the previous run's files into archive_dir, keep the newest `keep` archives and start empty.
+
+        history/ and the report config files stay, so trend graphs keep working.
+        """
+        names = [n for n in self._files() if n not in KEEP_NAMES]
+        if not names:
+            return None
+        archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(self.directory)), "allure-archive")
+        os.makedirs(archive_dir, exist_ok=True)
+
+        archive = None
+        if keep > 0:
+            archive = os.path.join(archive_dir, f"allure-results-{datetime.now():%Y%m%d_%H%M%S_%f}.zip")
+            with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for name in names:
+                    zf.write(os.path.join(self.directory, name), name)
+
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+        archives = sorted(n for n in os.listdir(archive_dir) if n.startswith("allure-results-") and n.endswith(".zip"))
+        for name in archives[:max(0, len(archives) - keep)]:
+            os.remove(os.path.join(archive_dir, name))
+        return archive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utilities.allure_results", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    dedupe_parser = commands.add_parser("dedupe", help="store identical attachments once")
+    dedupe_parser.add_argument("directory")
+    merge_parser = commands.add_parser("merge", help="move per-worker result directories into one")
+    merge_parser.add_argument("directory")
+    merge_parser.add_argument("sources", nargs="+")
+    merge_parser.add_argument("--keep-sources", action="store_true")
+    rotate_parser = commands.add_parser("rotate", help="archive the previous run and start empty")
+    rotate_parser.add_argument("directory")
+    rotate_parser.add_argument("--archive-dir")
+    rotate_parser.add_argument("--keep", type=int, default=3, help="archives to keep (0 = just delete)")
+
+    args = parser.parse_args(argv)
+    results = AllureResults(args.directory)
+    if args.command == "dedupe":
+        print(f"[Allure] Removed {results.dedupe() / 1024:.0f} KiB of duplicate attachments")
+    elif args.command == "merge":
+        moved = results.merge(args.sources, remove_sources=not args.keep_sources)
+        print(f"[Allure] Merged {moved} files into {args.directory}")
+        results.dedupe()
+    else:
+        archive = results.rotate(args.archive_dir, args.keep)
+        print(f"[Allure] Previous run archived to {archive}" if archive else "[Allure] Nothing to rotate")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
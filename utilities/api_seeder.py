@@ -0,0 +1,89 @@
+import base64
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
+from utilities.config import Config
+
+
+class ApiSeeder:
+    """Sets up users and carts through demoblaze's backend API instead of the browser.
+
+    Everything goes over one pooled keep-alive session. Cart items added here are remembered
+    and removed again by cleanup(). The API has no way to delete users, so callers should
+    create throwaway usernames (see unique_username()).
+    """
+
+    def __init__(self, api_url=None, timeout=10):
+        self.api_url = (api_url or Config.demoblaze_api_url()).rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount(self.api_url, HTTPAdapter(pool_connections=1, pool_maxsize=8))
+        self._added_items = []
+
+    def _post(self, endpoint, payload):
+        response = self.session.post(f"{self.api_url}/{endpoint}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json() if response.content else ""
+        if isinstance(data, dict) and data.get("errorMessage"):
+            raise RuntimeError(f"[API] {endpoint} failed: {data['errorMessage']}")
+        return data
+
+    @staticmethod
+    def _encode(password):
+        # The site sends btoa(password)
+        return base64.b64encode(password.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def unique_username(prefix="capstone"):
+        return f"{prefix}_{uuid.uuid4().hex[:10]}"
+
+    # --------------------------- Users ---------------------------
+    def signup(self, username, password):
+        """Create a user; returns False if it already exists."""
+        try:
+            self._post("signup", {"username": username, "password": self._encode(password)})
+            return True
+        except RuntimeError as e:
+            if "already exist" in str(e):
+                return False
+            raise
+
+    def login(self, username, password):
+        """Auth token, the same value the site stores in the `tokenp_` cookie."""
+        data = self._post("login", {"username": username, "password": self._encode(password)})
+        return data.split("Auth_token: ", 1)[1].strip()
+
+    # --------------------------- Catalog / cart ---------------------------
+    def products(self):
+        response = self.session.get(f"{self.api_url}/entries", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["Items"]
+
+    def add_to_cart(self, cookie, prod_id=1, count=1, logged_in=True):
+        """Add `count` items; `cookie` is the auth token (logged in) or the guest `user` cookie."""
+        item_ids = []
+        for _ in range(count):
+            item_id = str(uuid.uuid4())
+            self._post("addtocart", {"id": item_id, "cookie": cookie, "prod_id": prod_id, "flag": logged_in})
+            item_ids.append(item_id)
+        self._added_items.extend(item_ids)
+        return item_ids
+
+    def view_cart(self, cookie, logged_in=True):
+        return self._post("viewcart", {"cookie": cookie, "flag": logged_in})["Items"]
+
+    def delete_item(self, item_id):
+        self._post("deleteitem", {"id": item_id})
+
+    def clear_cart(self, cookie, logged_in=True):
+        for item in self.view_cart(cookie, logged_in):
+            self.delete_item(item["id"])
+
+    def cleanup(self):
+        """Remove every cart item this seeder added that is still around."""
+        while self._added_items:
+            self.delete_item(self._added_items.pop())
+
+    def close(self):
+        self.cleanup()
+        self.session.close()
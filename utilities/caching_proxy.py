@@ -0,0 +1,217 @@
+import hashlib
+import http.client
+import json
+import os
+import select
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Headers that describe one connection, never forwarded or stored
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+              "te", "trailer", "transfer-encoding", "upgrade"}
+# Only these are answered from or stored in the cache, and only with a 200
+CACHED_METHODS = ("GET", "HEAD")
+
+
+class ProxyCache:
+    """On-disk responses keyed by method, URL and a hash of the request body."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(method, url, body):
+        body_hash = hashlib.sha256(body or b"").hexdigest()
+        return hashlib.sha256(f"{method} {url} {body_hash}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, key + ".json"), os.path.join(folder, key + ".body")
+
+    def load(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, meta, body):
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # Body first, metadata last: a reader that finds the .json always finds the body too
+        for path, data, mode in ((body_path, body, "wb"), (meta_path, json.dumps(meta), "w")):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+
+class CachingProxyHandler(BaseHTTPRequestHandler):
+    proxy = None  # set per server by CachingProxy
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle()
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = self.path
+        key = ProxyCache.key(self.command, url, body)
+        cacheable = self.command in CACHED_METHODS
+
+        cached = self.proxy.cache.load(key) if cacheable else None
+        if cached:
+            meta, data = cached
+            self.proxy.count("hits", saved=len(data))
+            return self._send(meta["status"], meta["headers"], data)
+
+        if self.proxy.mode == "replay":
+            self.proxy.count("misses" if cacheable else "uncached")
+            return self._send(504, [["Content-Type", "text/plain"]], f"Not recorded: {self.command} {url}".encode())
+
+        try:
+            status, headers, data = self._fetch(url, body)
+        except OSError as e:
+            self.proxy.count("errors")
+            return self._send(502, [["Content-Type", "text/plain"]], str(e).encode())
+
+        if cacheable and status == 200:
+            self.proxy.count("misses")
+            self.proxy.cache.store(key, {"method": self.command, "url": url, "status": status, "headers": headers}, data)
+        else:
+            self.proxy.count("uncached")
+        self._send(status, headers, data)
+
+    def _fetch(self, url, body):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.hostname, parts.port, timeout=30)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+        try:
+            connection.request(self.command, path, body=body or None, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            kept = [[k, v] for k, v in response.getheaders()
+                    if k.lower() not in HOP_BY_HOP and k.lower() != "content-length"]
+            return response.status, kept, data
+        finally:
+            connection.close()
+
+    def _send(self, status, headers, data):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def do_CONNECT(self):
+        # HTTPS is end-to-end encrypted, so it can only be passed through, never cached
+        if self.proxy.mode == "replay":
+            self.proxy.count("misses")
+            self.send_error(403, "HTTPS is not available in replay mode")
+            return
+
+        host, _, port = self.path.partition(":")
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+        except OSError as e:
+            self.proxy.count("errors")
+            self.send_error(502, str(e))
+            return
+        self.proxy.count("tunneled")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, broken = select.select(sockets, [], sockets, 30)
+                if broken or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class CachingProxy:
+    """Local HTTP proxy that records responses to disk and replays them.
+
+    mode="record": serve GET/HEAD from the cache, fetch and store the 200s that are missing;
+    everything else (POST and friends, non-200 answers) is forwarded and never cached.
+    mode="replay": serve from the cache only; anything else gets a 504 and no upstream I/O happens.
+    HTTPS requests arrive as CONNECT tunnels and are only passed through (record mode), so a live
+    https:// target gets nothing from the cache; the hit rate covers plain http:// only. That is
+    why DriverFactory only routes the --target=local stand-in (http) through it.
+    """
+
+    def __init__(self, cache_dir, mode="record", host="127.0.0.1", port=0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported proxy mode: {mode}")
+        self.mode = mode
+        self.cache = ProxyCache(cache_dir)
+        self._stats = {"hits": 0, "misses": 0, "uncached": 0, "tunneled": 0, "errors": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+        handler = type("BoundHandler", (CachingProxyHandler,), {"proxy": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self):
+        return f"http://{self.address}"
+
+    def count(self, name, saved=0):
+        with self._lock:
+            self._stats[name] += 1
+            self._stats["bytes_saved"] += saved
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        answered = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / answered, 3) if answered else 0.0
+        return stats
+
+    def start(self):
+        self.thread.start()
+        print(f"[Proxy] {self.mode} proxy on {self.url}, cache in {self.cache.directory}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
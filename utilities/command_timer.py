@@ -0,0 +1,123 @@
+import functools
+import math
+import time
+from contextlib import contextmanager
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile: the smallest value with at least pct% of the samples at or below it."""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _locator(params):
+    if params and "using" in params:
+        return f"{params['using']}={params.get('value')}"
+    return None
+
+
+class CommandTimer:
+    """Opt-in timing of every WebDriver command, collected per test.
+
+    instrument(driver) wraps driver.execute, which every driver and WebElement call goes through,
+    so each command costs two perf_counter() calls and a list append. Time spent inside
+    waiting() blocks (WaitUtils, page readiness) is tracked separately from active commands.
+    """
+
+    enabled = False
+    _records = []      # (command, locator, seconds, outcome, inside_wait)
+    _wait_seconds = 0.0
+    _wait_depth = 0
+    _started = None
+
+    @staticmethod
+    def enable(on=True):
+        CommandTimer.enabled = on
+
+    @staticmethod
+    def instrument(driver):
+        if getattr(driver, "_command_timer", False):
+            return driver
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            outcome = "ok"
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                CommandTimer._records.append((driver_command, _locator(params), time.perf_counter() - start,
+                                              outcome, CommandTimer._wait_depth > 0))
+
+        driver.execute = timed_execute
+        driver._command_timer = True
+        return driver
+
+    @staticmethod
+    @contextmanager
+    def waiting():
+        if not CommandTimer.enabled:
+            yield
+            return
+        CommandTimer._wait_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            CommandTimer._wait_depth -= 1
+            if CommandTimer._wait_depth == 0:  # nested waits count once
+                CommandTimer._wait_seconds += time.perf_counter() - start
+
+    @staticmethod
+    def timed_wait(func):
+        """Decorator: count the call as wait time."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with CommandTimer.waiting():
+                return func(*args, **kwargs)
+        return wrapper
+
+    @staticmethod
+    def begin():
+        CommandTimer._records.clear()
+        CommandTimer._wait_seconds = 0.0
+        CommandTimer._wait_depth = 0
+        CommandTimer._started = time.perf_counter()
+
+    @staticmethod
+    def end(test_id, slowest=5):
+        """Summary of the commands since begin(); times in milliseconds."""
+        records = list(CommandTimer._records)
+        elapsed = time.perf_counter() - (CommandTimer._started or time.perf_counter())
+        by_command = {}
+        for command, _, seconds, outcome, _ in records:
+            entry = by_command.setdefault(command, {"durations": [], "errors": 0})
+            entry["durations"].append(seconds * 1000)
+            entry["errors"] += outcome != "ok"
+
+        stats = {}
+        for command, entry in by_command.items():
+            durations = sorted(entry["durations"])
+            stats[command] = {
+                "count": len(durations),
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p95_ms": round(percentile(durations, 95), 2),
+                "max_ms": round(durations[-1], 2),
+                "total_ms": round(sum(durations), 2),
+                "errors": entry["errors"],
+            }
+
+        top = sorted(records, key=lambda r: r[2], reverse=True)[:slowest]
+        return {
+            "test": test_id,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "commands": len(records),
+            "command_ms": round(sum(r[2] for r in records if not r[4]) * 1000, 1),
+            "wait_ms": round(CommandTimer._wait_seconds * 1000, 1),
+            "by_command": dict(sorted(stats.items(), key=lambda item: -item[1]["total_ms"])),
+            "slowest": [{"test": test_id, "command": c, "locator": loc, "ms": round(s * 1000, 2), "outcome": o}
+                        for c, loc, s, o, _ in top],
+        }
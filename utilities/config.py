@@ -0,0 +1,26 @@
+import os
+
+
+class Config:
+    """Where the tests point. The `site` fixture in tests/conftest.py switches these to a local
+    stand-in with `--target=local` (or TEST_TARGET=local); any URL can also be set directly."""
+
+    LIVE_DEMOBLAZE_URL = "https://www.demoblaze.com"
+    LIVE_DEMOBLAZE_API_URL = "https://api.demoblaze.com"
+    LIVE_DEMOQA_URL = "https://demoqa.com"
+
+    @staticmethod
+    def target():
+        return os.getenv("TEST_TARGET", "live").lower()
+
+    @staticmethod
+    def demoblaze_url(path=""):
+        return os.getenv("DEMOBLAZE_URL", Config.LIVE_DEMOBLAZE_URL) + path
+
+    @staticmethod
+    def demoblaze_api_url():
+        return os.getenv("DEMOBLAZE_API_URL", Config.LIVE_DEMOBLAZE_API_URL)
+
+    @staticmethod
+    def demoqa_url(path=""):
+        return os.getenv("DEMOQA_URL", Config.LIVE_DEMOQA_URL) + path
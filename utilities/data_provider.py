@@ -0,0 +1,201 @@
+"""CSV test data for parametrized tests: declared schemas, lazy rows, nothing loaded or written at collection.
+
+    python -m utilities.data_provider validate order_data.csv login_data.csv
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, "testdata")
+
+# column -> regular expression every value must match in full
+SCHEMAS = {
+    "login_data.csv": {"username": r".+", "password": r".+"},
+    "signup_data.csv": {"username": r".+", "password": r".+"},
+    "user_data.csv": {"username": r".+", "password": r".+"},
+    "order_data.csv": {
+        "name": r".+", "country": r".+", "city": r".+",
+        "card": r"\d{12,19}", "month": r"[A-Za-z]+|\d{1,2}", "year": r"\d{4}",
+    },
+}
+
+
+class DataError(ValueError):
+    """A data file is missing, has the wrong columns or a value that does not fit its schema."""
+
+
+class CsvDataSet:
+    """One CSV file from testdata/, read the way a large file should be.
+
+    Collection only counts the records (one streaming pass that remembers where each record
+    starts); a row is read, parsed and validated when a test asks for it. Under xdist or with
+    --shard every process therefore loads just the rows of the tests it runs. The record index
+    and parsed rows are cached per file and thrown away when the file's mtime or size changes.
+    """
+
+    _cache = {}   # path -> {"stamp", "header", "offsets", "rows"}
+    _lock = threading.Lock()
+
+    def __init__(self, name, schema=None, directory=None):
+        self.name = name
+        self.path = os.path.join(directory or os.getenv("TEST_DATA_DIR", DATA_DIR), name)
+        schema = schema if schema is not None else SCHEMAS.get(name)
+        if schema is None:
+            raise DataError(f"No schema declared for {name}, add it to SCHEMAS")
+        self.schema = {column: re.compile(pattern, re.DOTALL) for column, pattern in schema.items()}
+
+    def stamp(self):
+        """(mtime, size) of the file; the cached index is only valid while this is unchanged."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            raise DataError(f"Test data file not found: {self.path}")
+        return stat.st_mtime_ns, stat.st_size
+
+    def _index(self):
+        stamp = self.stamp()
+        with self._lock:
+            entry = self._cache.get(self.path)
+            if entry is None or entry["stamp"] != stamp:
+                header, offsets = self._scan()
+                entry = self._cache[self.path] = {"stamp": stamp, "header": header, "offsets": offsets, "rows": {}}
+            return entry
+
+    def _records(self, f):
+        """(offset, raw bytes) per CSV record; a quoted field may span lines."""
+        offset, record = 0, b""
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if not record:
+                start = offset
+            record += line
+            offset += len(line)
+            if record.count(b'"') % 2 == 0:
+                if record.strip():
+                    yield start, record
+                record = b""
+        if record.strip():
+            yield start, record
+
+    def _scan(self):
+        with open(self.path, "rb") as f:
+            records = self._records(f)
+            first = next(records, None)
+            if first is None:
+                raise DataError(f"{self.name} is empty")
+            header = self._parse(first[1])
+            missing = [column for column in self.schema if column not in header]
+            if missing:
+                raise DataError(f"{self.name} is missing column(s) {', '.join(missing)}")
+            offsets = [offset for offset, _ in records]
+        return header, offsets
+
+    @staticmethod
+    def _parse(raw):
+        return next(csv.reader(io.StringIO(raw.decode("utf-8-sig"), newline="")))
+
+    def _validate(self, header, values, number):
+        if len(values) != len(header):
+            raise DataError(f"{self.name} row {number}: expected {len(header)} values, got {len(values)}")
+        row = dict(zip(header, values))
+        for column, pattern in self.schema.items():
+            if not pattern.fullmatch(row[column]):
+                raise DataError(f"{self.name} row {number}: {column}={row[column]!r} does not match {pattern.pattern}")
+        return row
+
+    def __len__(self):
+        return len(self._index()["offsets"])
+
+    def row(self, index):
+        """Row `index` (0-based, header excluded) as a dict, validated against the schema."""
+        entry = self._index()
+        row = entry["rows"].get(index)
+        if row is None:
+            start = entry["offsets"][index]
+            end = entry["offsets"][index + 1] if index + 1 < len(entry["offsets"]) else None
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                raw = f.read(end - start) if end is not None else f.read()
+            row = entry["rows"][index] = self._validate(entry["header"], self._parse(raw), index + 1)
+        return row
+
+    def rows(self):
+        """Stream every row, validated, without keeping them."""
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            number = 0
+            for values in reader:
+                if values:
+                    number += 1
+                    yield self._validate(header, values, number)
+
+    def validate(self):
+        """Check the whole file; returns the number of rows."""
+        self._index()
+        return sum(1 for _ in self.rows())
+
+    def params(self, count=None):
+        """One pytest.param per row, each holding a DataRow that is read when the test runs.
+
+        count: the number of rows if already known (e.g. from the pytest cache); saves reading the file.
+        """
+        import pytest
+        stem = os.path.splitext(self.name)[0]
+        count = len(self) if count is None else count
+        return [pytest.param(DataRow(self, index), id=f"{stem}-{index + 1}") for index in range(count)]
+
+
+class DataRow:
+    """A row of a CsvDataSet that is not read until a value is needed: `row.card` or `row["card"]`."""
+
+    def __init__(self, dataset, index):
+        self.dataset = dataset
+        self.index = index
+
+    def __getitem__(self, column):
+        return self.dataset.row(self.index)[column]
+
+    def __getattr__(self, column):
+        if column.startswith("_") or column in ("dataset", "index"):
+            raise AttributeError(column)
+        try:
+            return self[column]
+        except KeyError:
+            raise AttributeError(f"{self.dataset.name} has no column {column!r}")
+
+    def values(self, *columns):
+        """Values in the given column order, for unpacking."""
+        row = self.dataset.row(self.index)
+        return tuple(row[column] for column in columns)
+
+    def __repr__(self):
+        return f"DataRow({self.dataset.name!r}, {self.index})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utilities.data_provider", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate_parser = commands.add_parser("validate", help="check data files against their schema")
+    validate_parser.add_argument("names", nargs="*", help="files in testdata/ (default: every file with a schema)")
+
+    args = parser.parse_args(argv)
+    failed = False
+    for name in args.names or sorted(SCHEMAS):
+        try:
+            print(f"{name}: {CsvDataSet(name).validate()} rows ok")
+        except DataError as e:
+            print(f"{name}: {e}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,121 @@
+import uuid
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Resolves a Selenium (By, value) locator inside the page, so one script can work on many elements.
+FIND_ELEMENT_JS = """
+function __capstoneFind(by, value, root) {
+  root = root || document;
+  var doc = root.ownerDocument || root;
+  switch (by) {
+    case 'id': return doc.getElementById(value);
+    case 'css selector': return root.querySelector(value);
+    case 'tag name': return root.querySelector(value);
+    case 'class name': return root.querySelector('.' + CSS.escape(value));
+    case 'name': return root.querySelector('[name="' + CSS.escape(value) + '"]');
+    case 'xpath':
+      return doc.evaluate(value, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case 'link text':
+    case 'partial link text':
+      var links = root.querySelectorAll('a');
+      for (var i = 0; i < links.length; i++) {
+        var text = (links[i].innerText || links[i].textContent).trim();
+        if (by === 'link text' ? text === value : text.indexOf(value) !== -1) { return links[i]; }
+      }
+      return null;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+function __capstoneDisplayed(el) {
+  return el.getClientRects().length > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+}
+"""
+
+EXTRACT_ROWS_JS = FIND_ELEMENT_JS + """
+var by = arguments[0], value = arguments[1], rowSelector = arguments[2], spec = arguments[3];
+var minRows = arguments[4], timeoutMs = arguments[5];
+var done = arguments[arguments.length - 1];
+
+function read(el, selector, prop) {
+  var target = selector ? el.querySelector(selector) : el;
+  if (!target) { return null; }
+  if (prop === 'text') { return (target.innerText || target.textContent || '').trim(); }
+  if (prop === 'displayed') { return __capstoneDisplayed(target); }
+  if (prop === 'enabled') { return !target.disabled; }
+  return target.getAttribute(prop);
+}
+
+function collect() {
+  var container = __capstoneFind(by, value);
+  if (!container) { return null; }
+  return Array.prototype.map.call(container.querySelectorAll(rowSelector), function (row) {
+    if (spec.mode === 'cells') {
+      return Array.prototype.map.call(row.querySelectorAll(spec.cell), function (cell) {
+        return read(cell, null, 'text');
+      });
+    }
+    var item = {};
+    spec.fields.forEach(function (f) { item[f[0]] = read(row, f[1], f[2]); });
+    return item;
+  });
+}
+
+var deadline = Date.now() + timeoutMs;
+(function poll() {
+  var rows = collect();
+  if ((rows && rows.length >= minRows) || Date.now() >= deadline) { done(rows || []); return; }
+  setTimeout(poll, 50);
+})();
+"""
+
+# Waits (in the page) for every field to be usable, then sets all values and fires input/change.
+FILL_FIELDS_JS = FIND_ELEMENT_JS + """
+var fields = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function usable(f) {
+  var el = __capstoneFind(f[0], f[1]);
+  return el && __capstoneDisplayed(el) && !el.disabled && !el.readOnly ? el : null;
+}
+
+function fill() {
+  var skipped = [];
+  fields.forEach(function (f, i) {
+    var el = usable(f);
+    if (!el) { skipped.push(i); return; }
+    // Use the prototype setter so frameworks that track the value property see the change
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+              : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+              : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    el.focus();
+    setter.call(el, f[2]);
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+    el.blur();
+  });
+  return skipped;
+}
+
+var deadline = Date.now() + timeoutMs;
+(function poll() {
+  if (fields.every(usable) || Date.now() >= deadline) { done(fill()); return; }
+  setTimeout(poll, 50);
+})();
+"""
+
+# A page is ready once it is a new document (not the one we navigated away from), its DOM is
+# parsed, every locator resolves to a displayed element and the optional check returns true.
+PAGE_READY_JS = FIND_ELEMENT_JS + """
+var token = arguments[0], locators = arguments[1], check = arguments[2];
+if (window.__capstoneNav === token || document.readyState === 'loading') { return false; }
+for (var i = 0; i < locators.length; i++) {
+  var el = __capstoneFind(locators[i][0], locators[i][1]);
+  if (!el || !__capstoneDisplayed(el)) { return false; }
+}
+return check ? !!(new Function(check))() : true;
+"""
+
+
 class JSUtils:
 
     @staticmethod
@@ -7,3 +125,56 @@ class JSUtils:
     @staticmethod
     def click_element(driver, element):
         driver.execute_script("arguments[0].click();", element)
+
+    @staticmethod
+    def extract_rows(driver, container_locator, row_selector="tr", columns="td", min_rows=0, timeout=10):
+        """Read a whole table/list in one round trip.
+
+        columns: a CSS selector for the cells (each row becomes a list of cell texts), or a dict
+        {name: selector} / {name: (selector, prop)} (each row becomes a dict). prop is 'text',
+        'displayed', 'enabled' or an attribute name; an empty selector means the row itself.
+        With min_rows the page is polled (in the browser) until that many rows exist; fewer after
+        `timeout` seconds raises TimeoutException rather than returning a partial table.
+        """
+        if isinstance(columns, str):
+            spec = {"mode": "cells", "cell": columns}
+        else:
+            fields = []
+            for name, field in columns.items():
+                selector, prop = field if isinstance(field, (tuple, list)) else (field, "text")
+                fields.append([name, selector or "", prop])
+            spec = {"mode": "fields", "fields": fields}
+
+        by, value = container_locator
+        rows = driver.execute_async_script(
+            EXTRACT_ROWS_JS, by, value, row_selector, spec, min_rows, int(timeout * 1000)
+        )
+        if len(rows) < min_rows:
+            raise TimeoutException(
+                f"{len(rows)} of {min_rows} '{row_selector}' rows in {container_locator} after {timeout}s"
+            )
+        return rows
+
+    @staticmethod
+    def fill_fields(driver, fields, timeout=10):
+        """Set many form fields in one round trip; fields is a list of ((by, value), text).
+
+        Returns the indexes of fields that never became visible and enabled (left untouched).
+        """
+        payload = [[by, value, str(text)] for (by, value), text in fields]
+        return driver.execute_async_script(FILL_FIELDS_JS, payload, int(timeout * 1000))
+
+    @staticmethod
+    def mark_navigation(driver):
+        """Tag the current document so page_ready() can tell it apart from the next one."""
+        token = uuid.uuid4().hex
+        try:
+            driver.execute_script("window.__capstoneNav = arguments[0];", token)
+        except WebDriverException:
+            pass  # nothing loaded yet, any document is new
+        return token
+
+    @staticmethod
+    def page_ready(driver, token, locators=(), check=None):
+        """One round trip: has the document changed since `token` and does its contract hold?"""
+        return driver.execute_script(PAGE_READY_JS, token, [list(locator) for locator in locators], check)
@@ -0,0 +1,119 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+# Every anchor's absolute href in one round trip
+COLLECT_LINKS_JS = """
+return Array.prototype.map.call(document.querySelectorAll('a[href]'), function (a) { return a.href; });
+"""
+
+# Servers that refuse HEAD usually answer one of these; retry those with GET
+HEAD_REJECTED = {403, 405, 501}
+
+
+class LinkReport:
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def broken(self):
+        return [r for r in self.results if not r["ok"]]
+
+    @property
+    def cached(self):
+        return [r for r in self.results if r["cached"]]
+
+    def as_dict(self):
+        return {
+            "total": len(self.results),
+            "broken": len(self.broken),
+            "cached": len(self.cached),
+            "elapsed": round(self.elapsed, 3),
+            "results": self.results,
+        }
+
+    def summary(self):
+        return (f"{len(self.results)} links, {len(self.broken)} broken, "
+                f"{len(self.cached)} from cache, {self.elapsed:.2f}s")
+
+
+class LinkChecker:
+    """Checks links concurrently over pooled keep-alive connections, caching results for `ttl` seconds.
+
+    The cache is shared by every checker in the process, so the same link is not re-checked
+    for each test or browser.
+    """
+
+    _cache = {}  # url -> (checked_at, result)
+    _cache_lock = threading.Lock()
+
+    def __init__(self, max_workers=16, timeout=5, ttl=600):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.ttl = ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @staticmethod
+    def collect_links(driver):
+        """Unique http(s) links on the current page, in page order."""
+        hrefs = driver.execute_script(COLLECT_LINKS_JS) or []
+        return list(dict.fromkeys(h for h in hrefs if h.startswith("http")))
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def check_page(self, driver):
+        return self.check_urls(self.collect_links(driver))
+
+    def check_urls(self, urls):
+        start = time.perf_counter()
+        urls = list(dict.fromkeys(urls))
+        results = {}
+        pending = []
+
+        now = time.time()
+        with LinkChecker._cache_lock:
+            for url in urls:
+                entry = LinkChecker._cache.get(url)
+                if entry and now - entry[0] < self.ttl:
+                    results[url] = dict(entry[1], cached=True)
+                else:
+                    pending.append(url)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                for result in executor.map(self._check, pending):
+                    results[result["url"]] = result
+            with LinkChecker._cache_lock:
+                for url in pending:
+                    LinkChecker._cache[url] = (time.time(), results[url])
+
+        return LinkReport([results[url] for url in urls], time.perf_counter() - start)
+
+    def _check(self, url):
+        start = time.perf_counter()
+        result = {"url": url, "status": None, "method": "HEAD", "ok": False, "error": None, "cached": False}
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in HEAD_REJECTED:
+                result["method"] = "GET"
+                # stream=True: we only need the status line, not the body
+                with self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as response:
+                    pass
+            result["status"] = response.status_code
+            result["ok"] = response.status_code < 400
+        except requests.RequestException as e:
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    def close(self):
+        self.session.close()
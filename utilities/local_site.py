@@ -0,0 +1,67 @@
+import base64
+import mimetypes
+import os
+from urllib.parse import unquote, urlparse
+from utilities.data_provider import CsvDataSet
+from utilities.stub_backend import StubApiHandler, StubBackend
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_ROOT = os.path.join(PROJECT_ROOT, "testdata", "local_site")
+
+
+class LocalSiteHandler(StubApiHandler):
+    """Serves a recorded site from disk, plus the stub API on the same origin."""
+
+    root = None  # set per server by LocalSite
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.rstrip("/") == "/entries":
+            return super().do_GET()
+        self._static(path, send_body=True)
+
+    def do_HEAD(self):
+        self._static(urlparse(self.path).path, send_body=False)
+
+    def _static(self, path, send_body):
+        file_path = os.path.normpath(os.path.join(self.root, unquote(path).lstrip("/") or "index.html"))
+        # demoqa style routes: /checkbox -> checkbox.html
+        if not os.path.isfile(file_path) and os.path.isfile(file_path + ".html"):
+            file_path += ".html"
+        if not file_path.startswith(self.root + os.sep) or not os.path.isfile(file_path):
+            self.send_error(404)
+            return
+
+        with open(file_path, "rb") as f:
+            data = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(file_path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+
+class LocalSite(StubBackend):
+    """Local stand-in for demoblaze or demoqa: LocalSite("demoblaze").start().url"""
+
+    handler = LocalSiteHandler
+
+    def __init__(self, site="demoblaze", host="127.0.0.1", port=0, users=None):
+        self.root = os.path.join(SITE_ROOT, site)
+        if users is None:
+            users = LocalSite.default_users()
+        super().__init__(host=host, port=port, users=users)
+
+    def _handler_attrs(self):
+        attrs = super()._handler_attrs()
+        attrs["root"] = self.root
+        return attrs
+
+    @staticmethod
+    def default_users():
+        """Accounts from testdata/login_data.csv, stored the way the site sends passwords (base64)."""
+        users = {}
+        for row in CsvDataSet("login_data.csv").rows():
+            users[row["username"]] = base64.b64encode(row["password"].encode("utf-8")).decode("ascii")
+        return users
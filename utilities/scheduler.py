@@ -0,0 +1,172 @@
+import glob
+import heapq
+import json
+import os
+import statistics
+
+DEFAULT_SECONDS = 1.0
+
+
+class DurationHistory:
+    """Per-test durations from past runs (moving average), used to predict how long a test takes.
+
+    Stored as JSON in TEST_DURATIONS_FILE (default reports/test-durations.json); can be seeded
+    from an Allure results directory when there is no history yet.
+    """
+
+    def __init__(self, path=None, weight=0.3):
+        self.path = path or os.getenv("TEST_DURATIONS_FILE", os.path.join("reports", "test-durations.json"))
+        self.weight = weight  # share of the newest run in the average
+        self.durations = {}   # nodeid -> {"avg": seconds, "runs": n}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.durations = json.load(f)
+        except (OSError, ValueError):
+            self.durations = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.durations, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, nodeid, seconds):
+        entry = self.durations.get(nodeid)
+        if entry is None:
+            self.durations[nodeid] = {"avg": round(seconds, 3), "runs": 1}
+        else:
+            entry["avg"] = round(entry["avg"] * (1 - self.weight) + seconds * self.weight, 3)
+            entry["runs"] += 1
+
+    def import_allure(self, directory):
+        """Seed from Allure result files (`start`/`stop` in ms); returns how many tests were read."""
+        count = 0
+        for path in glob.glob(os.path.join(directory, "*-result.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    result = json.load(f)
+                module, _, _ = result["fullName"].partition("#")
+                nodeid = f"{module.replace('.', '/')}.py::{result['name']}"
+                seconds = (result["stop"] - result["start"]) / 1000
+            except (OSError, ValueError, KeyError):
+                continue
+            self.record(nodeid, seconds)
+            count += 1
+        return count
+
+    def predict(self, nodeid):
+        """Known average; else the average of the same test function's other parameters; else the median."""
+        if nodeid in self.durations:
+            return self.durations[nodeid]["avg"]
+        base = nodeid.split("[", 1)[0]
+        siblings = [e["avg"] for key, e in self.durations.items() if key.split("[", 1)[0] == base]
+        if siblings:
+            return statistics.fmean(siblings)
+        if self.durations:
+            return statistics.median(e["avg"] for e in self.durations.values())
+        return DEFAULT_SECONDS
+
+
+def _matches(item, name):
+    return name in (item.name, getattr(item, "originalname", None)) or item.nodeid.endswith(name)
+
+
+def dependency_groups(items):
+    """Split items into groups that must run together and in order.
+
+    `@pytest.mark.depends_on("test_name", ...)` ties a test to the tests it needs; everything
+    else is a group of one. Within a group the collection order is kept.
+    """
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, item in enumerate(items):
+        for marker in item.iter_markers("depends_on"):
+            for name in marker.args:
+                for j, other in enumerate(items):
+                    if j != i and _matches(other, name):
+                        parent[find(i)] = find(j)
+
+    groups = {}
+    for i, item in enumerate(items):
+        groups.setdefault(find(i), []).append(item)
+    for group in groups.values():
+        group.sort(key=lambda it: _depth(it, items))
+    return list(groups.values())
+
+
+def _depth(item, items, seen=None):
+    # How many declared dependencies come before this item; dependencies first
+    seen = seen or set()
+    if item.nodeid in seen:
+        return 0
+    seen = seen | {item.nodeid}
+    depth = 0
+    for marker in item.iter_markers("depends_on"):
+        for name in marker.args:
+            for other in items:
+                if other is not item and _matches(other, name):
+                    depth = max(depth, 1 + _depth(other, items, seen))
+    return depth
+
+
+def longest_first(groups, predict):
+    """Groups sorted by predicted total duration, longest first (ties by node id, so every xdist worker agrees)."""
+    costed = [(sum(predict(it.nodeid) for it in group), group) for group in groups]
+    costed.sort(key=lambda c: (-c[0], c[1][0].nodeid))
+    return costed
+
+
+def by_scope(costed_groups):
+    """Costed groups reordered so module and class scoped fixtures are set up once per run.
+
+    Modules come longest first by their summed prediction, then the classes within a module,
+    then the groups within a class; each level keeps the incoming order on ties.
+    """
+    modules = {}
+    for cost, group in costed_groups:
+        parts = group[0].nodeid.split("::")
+        modules.setdefault(parts[0], {}).setdefault("::".join(parts[:-1]), []).append((cost, group))
+
+    def total(entries):
+        return sum(cost for cost, _ in entries)
+
+    ordered = []
+    for classes in sorted(modules.values(), key=lambda classes: -sum(total(c) for c in classes.values())):
+        for entries in sorted(classes.values(), key=lambda entries: -total(entries)):
+            ordered.extend(entries)
+    return ordered
+
+
+def partition(costed_groups, shards):
+    """Longest-processing-time-first: each group goes to the shard with the least predicted work."""
+    heap = [(0.0, index) for index in range(shards)]
+    assignment = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for cost, group in costed_groups:
+        load, index = heapq.heappop(heap)
+        assignment[index].append(group)
+        loads[index] = load + cost
+        heapq.heappush(heap, (loads[index], index))
+    return assignment, loads
+
+
+def parse_shard(value):
+    """'2/4' -> (1, 4): zero-based index and shard count."""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard expects i/n, e.g. 1/3, got {value!r}")
+    if not 1 <= index <= total:
+        raise ValueError(f"--shard index must be between 1 and {total}, got {index}")
+    return index - 1, total
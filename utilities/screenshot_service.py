@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import io
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, only needed for downscaling / re-encoding PNGs
+    Image = None
+
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+
+class ScreenshotService:
+    """Screenshots that never make the test wait on encoding or disk I/O.
+
+    capture() only asks the browser for the image (Chromium encodes JPEG/WebP itself through
+    CDP) and queues the base64 payload; a background thread decodes, optionally downscales or
+    re-encodes with Pillow, and writes it atomically. A frame identical to the previous one from
+    the same driver is not written again. Everything lands in one directory (SCREENSHOT_DIR,
+    default reports/screenshots).
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, directory=None, fmt=None, quality=70, max_width=None, max_queue=64):
+        self.directory = directory or os.getenv("SCREENSHOT_DIR", os.path.join(os.getcwd(), "reports", "screenshots"))
+        self.fmt = (fmt or os.getenv("SCREENSHOT_FORMAT", "png")).lower()
+        if self.fmt not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {self.fmt}")
+        self.quality = quality
+        self.max_width = max_width or int(os.getenv("SCREENSHOT_MAX_WIDTH", "0")) or None
+        self.stats = {"captured": 0, "duplicates": 0, "written": 0, "bytes": 0, "errors": 0}
+        self._last = {}  # id(driver) -> (digest, path)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._worker, name="screenshot-writer", daemon=True)
+        self._thread.start()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def default(cls):
+        """One shared service per process."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @classmethod
+    def shutdown_default(cls, timeout=30):
+        with cls._default_lock:
+            service, cls._default = cls._default, None
+        if service is not None:
+            service.close(timeout)
+
+    # --------------------------- Test thread ---------------------------
+    def capture(self, driver, name="screenshot"):
+        """Grab a screenshot and return the path it will be written to (or was, for a repeat frame)."""
+        payload, encoded_as = self._grab(driver)
+        digest = hashlib.sha1(payload.encode("ascii")).hexdigest()
+        self.stats["captured"] += 1
+
+        last = self._last.get(id(driver))
+        if last and last[0] == digest:
+            self.stats["duplicates"] += 1
+            return last[1]
+
+        safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "screenshot"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        # Without Pillow a PNG from a non-Chromium browser stays a PNG
+        extension = EXTENSIONS[self.fmt if Image is not None else encoded_as]
+        path = os.path.join(self.directory, f"{safe_name}_{timestamp}{extension}")
+        self._last[id(driver)] = (digest, path)
+        self._queue.put((payload, encoded_as, path))
+        return path
+
+    def _grab(self, driver):
+        if self.fmt != "png" and hasattr(driver, "execute_cdp_cmd"):
+            # Chromium encodes the smaller format itself, no PNG ever crosses the wire
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": self.fmt, "quality": self.quality})
+            return result["data"], self.fmt
+        return driver.get_screenshot_as_base64(), "png"
+
+    # --------------------------- Writer thread ---------------------------
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[Screenshot] Could not write {job[2]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, payload, encoded_as, path):
+        data = base64.b64decode(payload)
+        if Image is not None and (self.max_width or encoded_as != self.fmt):
+            data = self._transcode(data)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.stats["written"] += 1
+        self.stats["bytes"] += len(data)
+
+    def _transcode(self, data):
+        image = Image.open(io.BytesIO(data))
+        if self.max_width and image.width > self.max_width:
+            image = image.resize((self.max_width, round(image.height * self.max_width / image.width)))
+        out = io.BytesIO()
+        if self.fmt == "png":
+            image.save(out, "PNG", optimize=True)
+        else:
+            image.convert("RGB").save(out, self.fmt.upper(), quality=self.quality)
+        return out.getvalue()
+
+    # --------------------------- Lifecycle ---------------------------
+    def flush(self, timeout=30):
+        """Wait until every queued screenshot is on disk; False if that took longer than timeout."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=30):
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
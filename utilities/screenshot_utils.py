@@ -1,14 +1,8 @@
-import os
-from datetime import datetime
+from utilities.screenshot_service import ScreenshotService
 
 class ScreenshotUtils:
 
     @staticmethod
     def take_screenshot(driver, name="screenshot"):
-        screenshots_dir = os.path.join(os.getcwd(), "screenshots")
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = os.path.join(screenshots_dir, f"{name}_{timestamp}.png")
-        driver.save_screenshot(path)
-        return path
+        """Queue a screenshot on the shared ScreenshotService; returns the path it is written to."""
+        return ScreenshotService.default().capture(driver, name)
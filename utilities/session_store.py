@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+CAPTURE_STORAGE_JS = """
+function dump(storage) {
+  var data = {};
+  for (var i = 0; i < storage.length; i++) { data[storage.key(i)] = storage.getItem(storage.key(i)); }
+  return data;
+}
+return { local: dump(window.localStorage), session: dump(window.sessionStorage) };
+"""
+
+RESTORE_STORAGE_JS = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+"""
+
+
+@contextmanager
+def file_lock(path, timeout=120, waiting_for="another worker"):
+    """Cross-process lock: whoever creates `path` first holds it; a lock older than `timeout` is a crashed holder's."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # A worker that crashed while holding it leaves the lock behind
+            try:
+                if time.time() - os.path.getmtime(path) > timeout:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for {waiting_for}")
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+
+class SessionStore:
+    """File-backed cache of a logged-in browser state (cookies + local/session storage) per user.
+
+    The files live in SESSION_STORE_DIR (default ~/.cache/capstone-sessions) and are written
+    atomically, and logging in is guarded by a lock file, so parallel xdist workers share one
+    login per user. They hold live auth cookies: the directory is created 0700, the files 0600.
+    """
+
+    def __init__(self, directory=None, max_age=3600):
+        self.directory = directory or os.getenv(
+            "SESSION_STORE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "capstone-sessions")
+        )
+        self.max_age = max_age
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def _path(self, base_url, username, suffix=".json"):
+        key = hashlib.sha1(f"{base_url}|{username}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + suffix)
+
+    def load(self, base_url, username):
+        """Stored state, or None if there is none or it has expired."""
+        try:
+            with open(self._path(base_url, username), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        now = time.time()
+        if now - state["captured_at"] > self.max_age:
+            return None
+        if any(c.get("expiry") and c["expiry"] < now for c in state["cookies"]):
+            return None
+        return state
+
+    def capture(self, driver, base_url, username):
+        storage = driver.execute_script(CAPTURE_STORAGE_JS)
+        state = {
+            "captured_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local": storage["local"],
+            "session": storage["session"],
+        }
+        path = self._path(base_url, username)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        print(f"[Session] Captured state for {username} ({len(state['cookies'])} cookies)")
+        return state
+
+    def discard(self, base_url, username):
+        try:
+            os.remove(self._path(base_url, username))
+        except OSError:
+            pass
+
+    @staticmethod
+    def restore(driver, base_url, state):
+        """Put a captured state into any driver and reload so the app picks it up."""
+        driver.get(base_url)
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chromium: all cookies in a single call
+            cookies = []
+            for c in state["cookies"]:
+                cookie = {k: v for k, v in c.items() if k != "expiry"}
+                if c.get("expiry"):
+                    cookie["expires"] = c["expiry"]
+                cookies.append(cookie)
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        else:
+            for c in state["cookies"]:
+                driver.add_cookie(c)
+        driver.execute_script(RESTORE_STORAGE_JS, state["local"], state["session"])
+        driver.refresh()
+
+    @contextmanager
+    def _lock(self, base_url, username, timeout=120):
+        with file_lock(self._path(base_url, username, suffix=".lock"), timeout, f"another worker to log in {username}"):
+            yield
+
+    def ensure_logged_in(self, driver, base_url, username, login, is_valid):
+        """Restore a stored session, or run `login(driver)` once and store the result.
+
+        `is_valid(driver)` tells whether the restored state is still accepted by the server;
+        if not, the state is thrown away and we log in again.
+        """
+        state = self.load(base_url, username)
+        if state:
+            self.restore(driver, base_url, state)
+            if is_valid(driver):
+                print(f"[Session] Restored stored session for {username}")
+                return
+            print(f"[Session] Stored session for {username} has expired")
+            self.discard(base_url, username)
+
+        with self._lock(base_url, username):
+            # Another worker may have logged in while we waited for the lock
+            state = self.load(base_url, username)
+            if state:
+                self.restore(driver, base_url, state)
+                if is_valid(driver):
+                    print(f"[Session] Restored session stored by another worker for {username}")
+                    return
+
+            driver.get(base_url)
+            login(driver)
+            if not is_valid(driver):
+                print(f"[Session] Could not confirm login for {username}, not storing the session")
+                return
+            self.capture(driver, base_url, username)
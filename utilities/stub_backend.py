@@ -0,0 +1,161 @@
+import base64
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRODUCTS = [
+    {"id": 1, "cat": "phone", "title": "Samsung galaxy s6", "price": 360.0, "img": "imgs/galaxy_s6.jpg",
+     "desc": "The Samsung Galaxy S6 is powered by 1.5GHz octa-core Samsung Exynos 7420 processor."},
+    {"id": 2, "cat": "phone", "title": "Nokia lumia 1520", "price": 820.0, "img": "imgs/Lumia_1520.jpg",
+     "desc": "The Nokia Lumia 1520 is powered by 2.2GHz quad-core Qualcomm Snapdragon 800 processor."},
+    {"id": 3, "cat": "phone", "title": "Nexus 6", "price": 650.0, "img": "imgs/Nexus_6.jpg",
+     "desc": "The Motorola Google Nexus 6 is powered by 2.7GHz quad-core Qualcomm Snapdragon 805 processor."},
+    {"id": 8, "cat": "notebook", "title": "Sony vaio i5", "price": 790.0, "img": "imgs/sony_vaio_5.jpg",
+     "desc": "Sony is so confident that the VAIO S is a superior ultraportable laptop."},
+    {"id": 10, "cat": "monitor", "title": "Apple monitor 24", "price": 400.0, "img": "imgs/apple_cinema.jpg",
+     "desc": "LED Cinema Display features a 27-inch glossy LED-backlit TFT active-matrix LCD display."},
+]
+
+
+class StubState:
+    def __init__(self, users=None):
+        self.lock = threading.Lock()
+        self.users = dict(users or {})   # username -> base64 password
+        self.tokens = {}                 # token -> username
+        self.cart = []                   # {"id", "cookie", "prod_id"}
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    """demoblaze's API endpoints (api.demoblaze.com), backed by StubState in memory."""
+
+    state = None  # set per server by StubBackend
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/entries":
+            return self._json({"Items": PRODUCTS, "LastEvaluatedKey": {"id": str(PRODUCTS[-1]["id"])}})
+        self._json({"errorMessage": "Not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+
+        route = getattr(self, "api_" + self.path.strip("/").replace("/", "_"), None)
+        if route is None:
+            return self._json({"errorMessage": "Not found"}, status=404)
+        with self.state.lock:
+            self._json(route(body))
+
+    # --------------------------- Endpoints ---------------------------
+    def api_signup(self, body):
+        if body.get("username") in self.state.users:
+            return {"errorMessage": "This user already exist."}
+        self.state.users[body["username"]] = body.get("password", "")
+        return ""
+
+    def api_login(self, body):
+        if self.state.users.get(body.get("username")) != body.get("password"):
+            return {"errorMessage": "Wrong password."}
+        token = base64.b64encode(f"{body['username']}|{uuid.uuid4().hex}".encode()).decode()
+        self.state.tokens[token] = body["username"]
+        return f"Auth_token: {token}"
+
+    def api_check(self, body):
+        username = self.state.tokens.get(body.get("token"))
+        if username is None:
+            return {"errorMessage": "Token has expired."}
+        return {"Item": {"token": body["token"], "username": username}}
+
+    def api_view(self, body):
+        for product in PRODUCTS:
+            if str(product["id"]) == str(body.get("id")):
+                return product
+        return {"errorMessage": "Not found"}
+
+    def api_bycat(self, body):
+        return {"Items": [p for p in PRODUCTS if p["cat"] == body.get("cat")]}
+
+    def api_addtocart(self, body):
+        self.state.cart.append({"id": body.get("id") or str(uuid.uuid4()),
+                                "cookie": self._cart_owner(body),
+                                "prod_id": int(body.get("prod_id", 0))})
+        return ""
+
+    def api_viewcart(self, body):
+        owner = self._cart_owner(body)
+        return {"Items": [item for item in self.state.cart if item["cookie"] == owner]}
+
+    def api_deleteitem(self, body):
+        self.state.cart = [item for item in self.state.cart if item["id"] != body.get("id")]
+        return ""
+
+    def api_deletecart(self, body):
+        owner = self._cart_owner(body)
+        self.state.cart = [item for item in self.state.cart if item["cookie"] != owner]
+        return ""
+
+    def _cart_owner(self, body):
+        # flag=true: cookie is an auth token (logged in); otherwise a guest id
+        if body.get("flag"):
+            return self.state.tokens.get(body.get("cookie"), body.get("cookie"))
+        return body.get("cookie")
+
+    # --------------------------- Plumbing ---------------------------
+    def _cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+
+    def _json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubBackend:
+    """Local stand-in for api.demoblaze.com so seeding can be exercised without network."""
+
+    handler = StubApiHandler
+
+    def __init__(self, host="127.0.0.1", port=0, users=None):
+        self.state = StubState(users)
+        handler = type("BoundHandler", (self.handler,), self._handler_attrs())
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _handler_attrs(self):
+        return {"state": self.state}
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
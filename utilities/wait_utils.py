@@ -1,12 +1,260 @@
+import time
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, StaleElementReferenceException,
+    TimeoutException, UnexpectedAlertPresentException,
+)
+from utilities.command_timer import CommandTimer
+from utilities.js_utils import FIND_ELEMENT_JS
+
+# Counts in-flight fetch/XHR calls in the page; installed once per document.
+NETWORK_TRACKER_JS = """
+(function () {
+  if (window.__capstoneNet) { return; }
+  var net = window.__capstoneNet = { pending: 0, last: Date.now(), leaving: 0 };
+  function start() { net.pending++; net.last = Date.now(); }
+  function done() { net.pending = Math.max(0, net.pending - 1); net.last = Date.now(); }
+
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+      start();
+      return originalFetch.apply(this, arguments).then(
+        function (response) { done(); return response; },
+        function (error) { done(); throw error; });
+    };
+  }
+
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    start();
+    this.addEventListener('loadend', done);
+    try { return originalSend.apply(this, arguments); } catch (e) { done(); throw e; }
+  };
+
+  // A script-triggered navigation (e.g. after login) keeps the old document "complete" for a while.
+  // Back in this document from the back/forward cache means the navigation is over.
+  window.addEventListener('beforeunload', function () { net.leaving = Date.now(); });
+  window.addEventListener('pageshow', function () { net.leaving = 0; });
+})();
+"""
+
+# True once no request, jQuery call or finite animation has been active for `quiet_ms`. A
+# beforeunload whose document is still here after `leave_ms` was a cancelled navigation.
+NETWORK_IDLE_JS = NETWORK_TRACKER_JS + """
+var quietMs = arguments[0], leaveMs = arguments[1];
+var net = window.__capstoneNet;
+var now = Date.now();
+if (net.leaving && now - net.leaving >= leaveMs) { net.leaving = 0; }
+var busy = net.pending > 0 || net.leaving > 0 || document.readyState !== 'complete';
+if (window.jQuery && window.jQuery.active > 0) { busy = true; }
+if (document.getAnimations) {
+  var running = document.getAnimations().filter(function (a) {
+    return a.playState === 'running' && a.effect && a.effect.getTiming().iterations !== Infinity;
+  });
+  if (running.length > 0) { busy = true; }
+}
+if (busy) { net.last = now; return false; }
+return now - net.last >= quietMs;
+"""
+
+# Resolves (in the page) as soon as the condition holds: checked once, then again on every DOM
+# mutation, plus every 100 ms for changes no mutation reports (stylesheets, transitions, layout).
+# Calls back {value: element | [elements]} or null on timeout.
+OBSERVE_JS = FIND_ELEMENT_JS + """
+var by = arguments[0], value = arguments[1], condition = arguments[2], expected = arguments[3];
+var timeoutMs = arguments[4];
+var done = arguments[arguments.length - 1];
+
+function findAll() {
+  switch (by) {
+    case 'css selector':
+    case 'tag name': return Array.prototype.slice.call(document.querySelectorAll(value));
+    case 'class name': return Array.prototype.slice.call(document.querySelectorAll('.' + CSS.escape(value)));
+    case 'name': return Array.prototype.slice.call(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+    case 'id': return Array.prototype.slice.call(document.querySelectorAll('#' + CSS.escape(value)));
+    case 'xpath':
+      var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var nodes = [];
+      for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+      return nodes;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+
+// Like WebDriver's isDisplayed: laid out, not hidden, and not faded out (e.g. a modal mid-transition)
+function visible(el) {
+  if (!__capstoneDisplayed(el)) { return false; }
+  for (var node = el; node && node.nodeType === 1; node = node.parentNode) {
+    if (window.getComputedStyle(node).opacity === '0') { return false; }
+  }
+  return true;
+}
+
+function check() {
+  if (condition === 'count') {
+    var all = findAll();
+    return all.length >= expected ? all : null;
+  }
+  var el = __capstoneFind(by, value);
+  if (!el) { return null; }
+  switch (condition) {
+    case 'present': return el;
+    case 'visible': return visible(el) ? el : null;
+    case 'clickable': return visible(el) && !el.disabled ? el : null;
+    case 'text': return (el.innerText || el.textContent || '').indexOf(expected) !== -1 ? el : null;
+    case 'class': return el.classList.contains(expected[0]) === expected[1] ? el : null;
+  }
+  throw new Error('Unsupported wait condition: ' + condition);
+}
+
+var first = check();
+if (first !== null) { done({ value: first }); return; }
+
+var finished = false;
+function finish(result) {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearInterval(safety);
+  clearTimeout(timer);
+  done(result);
+}
+function recheck() {
+  var result = check();
+  if (result !== null) { finish({ value: result }); }
+}
+var observer = new MutationObserver(recheck);
+observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+var safety = setInterval(recheck, 100);
+var timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+
+def _polling_condition(locator, condition, expected):
+    """The same conditions for WebDriverWait, used where the page cannot run the observer."""
+    if condition == "visible":
+        return EC.visibility_of_element_located(locator)
+    if condition == "clickable":
+        return EC.element_to_be_clickable(locator)
+
+    def holds(driver):
+        if condition == "count":
+            elements = driver.find_elements(*locator)
+            return elements if len(elements) >= expected else False
+        element = driver.find_element(*locator)
+        if condition == "text":
+            return element if expected in element.text else False
+        if condition == "class":
+            return element if (expected[0] in (element.get_attribute("class") or "").split()) == expected[1] else False
+        return element  # present
+
+    return holds
+
 
 class WaitUtils:
 
     @staticmethod
+    def observe(driver, locator, condition, expected=None, timeout=15):
+        """Wait for `condition` on `locator` inside the page: one round trip, resolved on the DOM change.
+
+        condition: "present", "visible", "clickable" (element), "text" (expected: substring),
+        "class" (expected: (class name, present)) or "count" (expected: n; returns the elements).
+        A navigation during the wait re-arms it on the new document. Falls back to polling
+        when the page cannot run the observer (unsupported locator, no async scripts).
+        """
+        if condition == "count" and expected <= 0:
+            return driver.find_elements(*locator)
+        by, value = locator
+        deadline = time.time() + timeout
+        detail = f" {expected!r}" if expected is not None else ""
+        message = f"{condition}{detail} not met for {locator} within {timeout}s"
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            try:
+                result = driver.execute_async_script(OBSERVE_JS, by, value, condition, expected, int(remaining * 1000))
+            except TimeoutException:
+                continue  # "script timeout": the session's limit is shorter than this wait; arm it again
+            except JavascriptException as e:
+                if "unload" in (e.msg or "").lower():
+                    continue  # navigated away mid-wait; watch the new document
+                return WaitUtils._poll(driver, locator, condition, expected, remaining)
+            except AttributeError:
+                return WaitUtils._poll(driver, locator, condition, expected, remaining)
+            if result is None:
+                raise TimeoutException(message)  # the page waited out the remaining time
+            return result["value"]
+
+    @staticmethod
+    def _poll(driver, locator, condition, expected, timeout):
+        wait = WebDriverWait(driver, timeout, poll_frequency=0.1,
+                             ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+        return wait.until(_polling_condition(locator, condition, expected))
+
+    @staticmethod
+    @CommandTimer.timed_wait
     def wait_for_element_clickable(driver, locator, timeout=15):
-        return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+        return WaitUtils.observe(driver, locator, "clickable", timeout=timeout)
 
     @staticmethod
+    @CommandTimer.timed_wait
     def wait_for_element_visible(driver, locator, timeout=15):
-        return WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(locator))
+        return WaitUtils.observe(driver, locator, "visible", timeout=timeout)
+
+    @staticmethod
+    @CommandTimer.timed_wait
+    def wait_for_element_present(driver, locator, timeout=15):
+        return WaitUtils.observe(driver, locator, "present", timeout=timeout)
+
+    @staticmethod
+    @CommandTimer.timed_wait
+    def wait_for_text(driver, locator, text, timeout=15):
+        """The element once its text contains `text`."""
+        return WaitUtils.observe(driver, locator, "text", text, timeout=timeout)
+
+    @staticmethod
+    @CommandTimer.timed_wait
+    def wait_for_count(driver, locator, count, timeout=15):
+        """All elements matching `locator` once there are at least `count` of them."""
+        return WaitUtils.observe(driver, locator, "count", count, timeout=timeout)
+
+    @staticmethod
+    @CommandTimer.timed_wait
+    def wait_for_class(driver, locator, class_name, present=True, timeout=15):
+        """The element once it has (or, with present=False, no longer has) `class_name`."""
+        return WaitUtils.observe(driver, locator, "class", [class_name, present], timeout=timeout)
+
+    @staticmethod
+    def install_network_tracker(driver):
+        """Track requests from the very start of every document (Chromium) and in the current one.
+
+        Elsewhere, calling this before an action is what makes wait_for_network_idle see the
+        requests the action starts.
+        """
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
+        driver.execute_script(NETWORK_TRACKER_JS)
+
+    @staticmethod
+    @CommandTimer.timed_wait
+    def wait_for_network_idle(driver, quiet_ms=300, timeout=15, leave_ms=2000):
+        """Return once the page has had no pending fetch/XHR or animation for `quiet_ms`.
+
+        An open alert counts as settled: the app is waiting for the test, not the network. It is
+        noticed when the idle check is refused, so each poll is a single command.
+        Chromium drivers carry the request tracker in every document from the first byte. On
+        Firefox it is installed by the first wait in a document, so a request that action started
+        before that wait is not seen (readyState and animations still are) unless
+        install_network_tracker() ran before the action. `leave_ms`: how long a started
+        navigation (beforeunload) counts as busy when the document never goes away.
+        """
+        def settled(d):
+            try:
+                return d.execute_script(NETWORK_IDLE_JS, quiet_ms, leave_ms)
+            except UnexpectedAlertPresentException:
+                return True
+
+        return WebDriverWait(driver, timeout, poll_frequency=0.05).until(settled)